@@ -0,0 +1,243 @@
+# src/autograder/dataflow.py
+"""
+코드 셀 의존성 분석 (재실행 시 채점 라벨에 필요한 셀만 실행)
+
+- 셀마다 정의(defs)/사용(uses) 변수 이름을 ast로 정적 분석
+- 채점 라벨 셀에서 거꾸로 올라가며, 필요한 이름을 정의하는 셀만 남긴다 (노트북 순서 유지)
+- 보수적으로 판단 (애매하면 실행):
+  · 정의: 대입/for/with/import/def/class 대상 + 속성·인덱스 대입의 기준 변수(df["x"] = …)
+          + 문장 단위 메서드 호출의 대상(lst.append(…)) + 호출 인자로 넘긴 변수(random.shuffle(x))
+  · 사용: 셀 안에서 읽는 모든 이름 (함수 본문 포함)
+  · star import 셀은 항상 실행
+  · 그리기 호출(plt.hist, ax.set_title, df.plot …)은 현재 그림 상태(PLOT_STATE)를 바꾸는 것으로 본다
+  · 노트북에서 정의한 함수가 바꾸는 전역(global 선언, df["x"] = … 같은 전역 기준 대입, 전역 메서드 호출)은
+    그 함수를 정의한 셀이 아니라 호출(참조)하는 셀의 정의로 본다 (함수 안에서 부르는 다른 함수까지 따라감)
+  · 매직(%, !)/파싱 실패/exec·eval·globals 호출 셀은 분석 불가 → 그 셀과 앞의 모든 셀 실행
+- 파일 입출력처럼 이름으로 드러나지 않는 의존성은 잡지 못한다.
+"""
+from __future__ import annotations
+import ast
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Set, Tuple
+
+# 문장 단위로 호출해도 대상 객체를 바꾸지 않는 메서드 (탐색용 셀을 건너뛰기 위해)
+PURE_METHODS = frozenset({
+    "head", "tail", "describe", "info", "sample", "copy", "keys", "values", "items", "get",
+    "mean", "median", "sum", "min", "max", "std", "var", "count", "nunique", "unique",
+    "value_counts", "corr", "cov", "isna", "isnull", "notna", "notnull", "round",
+    "groupby", "agg", "sort_values", "sort_index", "format",
+    "to_string", "summary", "__repr__",
+})
+# 그리기 호출 (plt/axes/figure/DataFrame.plot/seaborn): 모듈 수준의 현재 그림 상태를 읽고 바꾼다
+# → 이런 셀끼리는 가상 이름 PLOT_STATE 를 정의·사용하는 것으로 보고, 그림을 그리는 라벨 셀 앞의 그리기 셀을 모두 남긴다
+PLOT_METHODS = frozenset({
+    "plot", "hist", "scatter", "bar", "barh", "boxplot", "box", "pie", "area", "kde", "density",
+    "imshow", "heatmap", "histplot", "countplot", "barplot", "lineplot", "scatterplot",
+    "kdeplot", "pairplot", "regplot", "lmplot", "displot", "catplot", "violinplot",
+    "figure", "subplot", "subplots", "title", "suptitle", "xlabel", "ylabel", "set_title",
+    "set_xlabel", "set_ylabel", "xlim", "ylim", "xticks", "yticks", "legend", "grid",
+    "tight_layout", "axhline", "axvline", "text", "annotate", "savefig", "show", "close",
+})
+PLOT_STATE = "<plot>"
+# 인자를 바꾸지 않는 함수 (인자로 넘긴 변수를 정의로 보지 않음)
+PURE_FUNCS = frozenset({"print", "display", "len", "type", "repr", "str", "isinstance", "id", "help", "dir"})
+# 네임스페이스 전체를 읽거나 바꿀 수 있는 호출 → 분석 불가
+OPAQUE_CALLS = frozenset({"exec", "eval", "globals", "locals", "vars", "__import__", "get_ipython"})
+
+
+@dataclass
+class CellFlow:
+    defs: Set[str] = field(default_factory=set)
+    uses: Set[str] = field(default_factory=set)
+    always: bool = False     # 부수효과 가능(매직/star import) → 항상 실행
+    opaque: bool = False     # 분석 불가 → 이 셀과 앞의 모든 셀 실행
+    # 이 셀에서 정의한 함수 → (호출 시 바꿀 수 있는 전역 이름, 본문에서 참조하는 이름)
+    effects: Dict[str, Tuple[Set[str], Set[str]]] = field(default_factory=dict)
+    refs: Set[str] = field(default_factory=set)   # 최상위 스코프에서 참조한 이름 (함수 호출/인자로 넘김)
+
+
+def _root_name(node):
+    """df["a"].b → "df" """
+    while isinstance(node, (ast.Attribute, ast.Subscript, ast.Starred)):
+        node = node.value
+    return node.id if isinstance(node, ast.Name) else None
+
+
+def _target_names(t, out: Set[str]) -> None:
+    if isinstance(t, ast.Name):
+        out.add(t.id)
+    elif isinstance(t, (ast.Tuple, ast.List)):
+        for e in t.elts:
+            _target_names(e, out)
+    else:
+        r = _root_name(t)   # 속성/인덱스 대입은 기준 변수를 바꾼 것으로 본다
+        if r:
+            out.add(r)
+
+
+def analyze_cell(src: str) -> CellFlow:
+    src = src or ""
+    if any(ln.lstrip().startswith(("%", "!")) for ln in src.splitlines()):
+        return CellFlow(always=True, opaque=True)   # %time x = 1 처럼 매직 안의 정의는 알 수 없음
+    try:
+        tree = ast.parse(src)
+    except (SyntaxError, ValueError):
+        return CellFlow(always=True, opaque=True)   # x? 같은 IPython 문법일 수 있음
+
+    flow = CellFlow()
+    defs, uses = flow.defs, flow.uses
+
+    # 모듈 최상위 정의
+    for stmt in tree.body:
+        for node in _top_level_nodes(stmt):
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                defs.add(node.name)
+                flow.effects[node.name] = _function_effects(node)
+            elif isinstance(node, ast.ClassDef):
+                defs.add(node.name)
+            elif isinstance(node, ast.Name) and isinstance(node.ctx, ast.Load):
+                flow.refs.add(node.id)
+            elif isinstance(node, ast.Assign):
+                for t in node.targets:
+                    _target_names(t, defs)
+            elif isinstance(node, (ast.AugAssign, ast.AnnAssign)):
+                _target_names(node.target, defs)
+            elif isinstance(node, ast.Delete):
+                for t in node.targets:
+                    _target_names(t, defs)
+            elif isinstance(node, (ast.For, ast.AsyncFor, ast.comprehension)):
+                _target_names(node.target, defs)
+            elif isinstance(node, ast.withitem) and node.optional_vars is not None:
+                _target_names(node.optional_vars, defs)
+            elif isinstance(node, ast.ExceptHandler) and node.name:
+                defs.add(node.name)
+            elif isinstance(node, (ast.Import, ast.ImportFrom)):
+                for a in node.names:
+                    if a.name == "*":
+                        flow.always = True
+                    else:
+                        defs.add((a.asname or a.name).split(".")[0])
+            elif isinstance(node, ast.Expr) and isinstance(node.value, ast.Call):
+                _call_mutations(node.value, defs)
+
+    # 셀 전체(함수 본문 포함)에서 읽는 이름 / global 선언 / walrus / 분석 불가 호출
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name) and isinstance(node.ctx, ast.Load):
+            uses.add(node.id)
+            if node.id in OPAQUE_CALLS:
+                flow.opaque = flow.always = True
+        elif isinstance(node, ast.Global):
+            defs.update(node.names)
+        elif isinstance(node, ast.NamedExpr):
+            _target_names(node.target, defs)
+        elif (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute)
+              and node.func.attr in PLOT_METHODS):
+            defs.add(PLOT_STATE)
+            uses.add(PLOT_STATE)
+    return flow
+
+
+def _top_level_nodes(stmt):
+    """함수/클래스/람다 본문 안으로는 들어가지 않고 최상위 스코프의 노드만 순회."""
+    stack = [stmt]
+    while stack:
+        node = stack.pop()
+        yield node
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef, ast.Lambda)):
+            continue
+        stack.extend(ast.iter_child_nodes(node))
+
+
+def _function_effects(fn) -> Tuple[Set[str], Set[str]]:
+    """함수 본문 → (호출 시 바꿀 수 있는 전역 이름, 본문에서 참조하는 이름). 지역 변수/인자는 제외."""
+    a = fn.args
+    local = {x.arg for x in (*a.posonlyargs, *a.args, *a.kwonlyargs, a.vararg, a.kwarg) if x is not None}
+    declared, refs = set(), set()
+    for node in ast.walk(fn):
+        if isinstance(node, (ast.Global, ast.Nonlocal)):
+            declared.update(node.names)
+        elif isinstance(node, ast.Name):
+            if isinstance(node.ctx, ast.Load):
+                refs.add(node.id)
+            else:
+                local.add(node.id)
+    local -= declared
+
+    touched = set(declared)
+    for node in ast.walk(fn):
+        if isinstance(node, ast.Assign):
+            for t in node.targets:
+                _target_names(t, touched)
+        elif isinstance(node, (ast.AugAssign, ast.AnnAssign)):
+            _target_names(node.target, touched)
+        elif isinstance(node, ast.Delete):
+            for t in node.targets:
+                _target_names(t, touched)
+        elif isinstance(node, ast.Expr) and isinstance(node.value, ast.Call):
+            _call_mutations(node.value, touched)
+        elif (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute)
+              and node.func.attr in PLOT_METHODS):
+            touched.add(PLOT_STATE)
+    return touched - local, refs - local
+
+
+def _call_effects(refs: Set[str], effects: Dict[str, Tuple[Set[str], Set[str]]]) -> Set[str]:
+    """참조한 함수들(과 그 함수가 참조하는 함수들)이 바꿀 수 있는 전역 이름."""
+    out: Set[str] = set()
+    seen: Set[str] = set()
+    stack = [r for r in refs if r in effects]
+    while stack:
+        name = stack.pop()
+        if name in seen:
+            continue
+        seen.add(name)
+        touched, inner = effects[name]
+        out |= touched
+        stack.extend(r for r in inner if r in effects)
+    return out
+
+
+def _call_mutations(call: ast.Call, defs: Set[str]) -> None:
+    """문장 단위 호출이 바꿀 수 있는 변수: 메서드 대상 + 인자로 넘긴 변수."""
+    f = call.func
+    inplace = any(k.arg == "inplace" for k in call.keywords)
+    if isinstance(f, ast.Attribute) and (inplace or f.attr not in PURE_METHODS):
+        r = _root_name(f.value)
+        if r:
+            defs.add(r)
+    if isinstance(f, ast.Name) and f.id in PURE_FUNCS:
+        return
+    for a in (*call.args, *(k.value for k in call.keywords)):
+        r = _root_name(a)
+        if r:
+            defs.add(r)
+
+
+def slice_cells(sources: List[str], targets: Iterable[int]) -> List[int]:
+    """
+    sources: 코드 셀 소스 목록, targets: 반드시 실행할 셀(채점 라벨 셀) 위치
+    Returns: 실행할 셀 위치 (오름차순). 마지막 target 이후 셀은 실행하지 않는다.
+    """
+    targets = set(targets)
+    if not targets:
+        return []
+    flows = [analyze_cell(s) for s in sources]
+    last = max(targets)
+
+    # 노트북 함수 호출 → 그 함수가 바꾸는 전역을 호출한 셀의 정의로 (앞에서 정의된 함수만)
+    effects: Dict[str, Tuple[Set[str], Set[str]]] = {}
+    for f in flows:
+        effects.update(f.effects)
+        f.defs |= _call_effects(f.refs, effects)
+
+    # 분석 불가 셀이 있으면 그 셀까지는 전부 실행
+    opaque_upto = max((i for i in range(last + 1) if flows[i].opaque), default=-1)
+
+    keep: Set[int] = set()
+    needed: Set[str] = set()
+    for i in range(last, -1, -1):
+        f = flows[i]
+        if i in targets or i <= opaque_upto or f.always or (f.defs & needed):
+            keep.add(i)
+            needed |= f.uses
+    return sorted(keep)
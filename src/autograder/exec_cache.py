@@ -0,0 +1,134 @@
+# src/autograder/exec_cache.py
+"""
+셀 실행 결과 캐시 (재실행 시 같은 셀 체인은 다시 실행하지 않음)
+
+- 키: 실행 설정(seed) + 앞선 셀 체인 해시 + 정리된 셀 소스 → 셀 k의 키는 1..k 셀 전체에 의존
+  (같은 코드라도 앞 셀이 다르면 다른 키)
+- 값: 셀 출력(nbformat v4 dict 목록) + execution_count
+- 제출물의 앞쪽 셀들이 캐시된 체인과 같으면 그 출력은 재사용하고, 처음 달라지는 셀부터 실행
+- 저장: sqlite (OUT_DIR/exec_cache.sqlite), 전체 크기가 max_bytes 를 넘으면 오래 안 쓴 항목부터 삭제(LRU)
+- seed(execution._cache_seed)에 패키지 버전과 작업 폴더 파일의 크기/수정 시각이 들어간다
+  → 작업 폴더 밖의 파일이나 네트워크에서 읽는 데이터가 바뀌면 캐시 파일을 지울 것
+"""
+from __future__ import annotations
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+CellResult = Tuple[list, Optional[int]]   # (outputs, execution_count)
+
+# 셀 타임아웃/인터럽트 출력이 있는 노트북은 저장하지 않는다 (실행 환경에 따라 달라지는 결과)
+UNSTABLE_ENAMES = frozenset({"CellTimeoutError", "KeyboardInterrupt"})
+
+
+def cell_cache_text(src: str) -> str:
+    """
+    캐시 키용 셀 소스 정리: 빈 줄/주석 줄 제거, 줄 끝 공백 제거.
+    (_normalize_code 처럼 공백을 합치면 들여쓰기/문자열 내용이 달라도 같은 키가 되므로 쓰지 않음)
+    """
+    lines = [ln.rstrip() for ln in (src or "").splitlines()]
+    return "\n".join(ln for ln in lines if ln and not ln.lstrip().startswith("#"))
+
+
+def chain_keys(seed: str, sources: List[str]) -> List[str]:
+    h = hashlib.sha256(seed.encode("utf-8")).hexdigest()
+    keys = []
+    for src in sources:
+        h = hashlib.sha256((h + "\0" + cell_cache_text(src)).encode("utf-8")).hexdigest()
+        keys.append(h)
+    return keys
+
+
+def is_stable(cells: List[CellResult]) -> bool:
+    return not any(o.get("ename") in UNSTABLE_ENAMES for outs, _ec in cells for o in outs)
+
+
+class ExecCache:
+    """
+    sqlite 기반 셀 출력 캐시. 프로세스(커널 워커/fork 자식)마다 연결을 따로 연다.
+    """
+
+    def __init__(self, path: Path, max_bytes: int = 512 * 1024 * 1024):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self._conn = None
+        self._pid = None
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None or self._pid != os.getpid():   # fork 후에는 새 연결
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS cells ("
+                         "key TEXT PRIMARY KEY, outputs TEXT NOT NULL, ec INTEGER, "
+                         "size INTEGER NOT NULL, atime REAL NOT NULL)")
+            conn.execute("CREATE INDEX IF NOT EXISTS cells_atime ON cells(atime)")
+            self._conn, self._pid = conn, os.getpid()
+        return self._conn
+
+    def lookup(self, keys: List[str]) -> List[CellResult]:
+        """체인 앞에서부터 연속으로 캐시된 셀 결과 (처음 없는 셀에서 멈춤)."""
+        if not keys:
+            return []
+        try:
+            db = self._db()
+            found = {}
+            for i in range(0, len(keys), 500):
+                chunk = keys[i:i + 500]
+                q = "SELECT key, outputs, ec FROM cells WHERE key IN (%s)" % ",".join("?" * len(chunk))
+                for k, outs, ec in db.execute(q, chunk):
+                    found[k] = (json.loads(outs), ec)
+            hits: List[CellResult] = []
+            for k in keys:
+                if k not in found:
+                    break
+                hits.append(found[k])
+            if hits:
+                now = time.time()
+                db.executemany("UPDATE cells SET atime=? WHERE key=?", [(now, k) for k in keys[:len(hits)]])
+            return hits
+        except (sqlite3.Error, ValueError):
+            return []
+
+    def store(self, keys: List[str], cells: List[CellResult]) -> None:
+        try:
+            db = self._db()
+            now = time.time()
+            rows = []
+            for k, (outs, ec) in zip(keys, cells):
+                data = json.dumps(outs, ensure_ascii=False)
+                rows.append((k, data, ec, len(data.encode("utf-8")), now))
+            db.execute("BEGIN")
+            db.executemany("INSERT OR REPLACE INTO cells(key, outputs, ec, size, atime) VALUES (?,?,?,?,?)", rows)
+            db.execute("COMMIT")
+        except sqlite3.Error:
+            pass
+
+    def evict(self) -> int:
+        """전체 크기가 max_bytes 이하가 될 때까지 오래 안 쓴 항목 삭제. Returns: 삭제한 항목 수"""
+        try:
+            db = self._db()
+            total = db.execute("SELECT COALESCE(SUM(size), 0) FROM cells").fetchone()[0]
+            if total <= self.max_bytes:
+                return 0
+            drop, removed = [], 0
+            for key, size in db.execute("SELECT key, size FROM cells ORDER BY atime"):
+                drop.append((key,))
+                removed += size
+                if total - removed <= self.max_bytes:
+                    break
+            db.execute("BEGIN")
+            db.executemany("DELETE FROM cells WHERE key=?", drop)
+            db.execute("COMMIT")
+            return len(drop)
+        except sqlite3.Error:
+            return 0
+
+    def close(self) -> None:
+        if self._conn is not None and self._pid == os.getpid():
+            self._conn.close()
+        self._conn = None
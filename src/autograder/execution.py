@@ -0,0 +1,482 @@
+# src/autograder/execution.py
+"""
+제출물 재실행 엔진 (nbclient + 미리 띄워 둔 로컬 커널 풀)
+
+- 워커 프로세스 1개 = 커널 1개. 워커가 시작될 때 커널을 띄워 두고(pre-warm) 여러 노트북에 재사용
+  · reuse_kernels=True : 노트북 사이에 `%reset -f` 로 네임스페이스만 비움 (import된 모듈은 유지 → 빠름)
+  · reuse_kernels=False: 노트북마다 커널 재시작 (완전 격리, 대신 느림)
+- 셀 타임아웃    : 초과하면 커널을 interrupt 하고 에러 출력으로 기록한 뒤 다음 셀 진행
+- 노트북 타임아웃: 남은 셀은 실행하지 않음 (출력 없음 → 채점 시 미실행으로 처리)
+- 실행본은 EXEC_DIR 에 원본 파일명으로 저장하고, grading 은 그 출력으로 라벨 비교를 한다.
+- engine="fork" 이면 템플릿 준비 셀을 한 번만 실행한 스냅샷에서 fork (fork_exec.py, Linux 전용)
+  준비 셀이 템플릿과 다른 제출물만 커널 풀에서 실행한다.
+- dependency_slice=True 이면 채점 라벨 셀과 그 셀이 의존하는 셀만 실행 (dataflow.py),
+  건너뛴 셀 번호는 실행 리포트 skipped_cells 열에 남긴다.
+- cell_cache_path 를 주면 셀 실행 결과 캐시(exec_cache.py) 사용: 앞쪽 셀 체인이 캐시와 같으면
+  출력은 재사용하고 처음 달라지는 셀부터 실행 (재사용한 셀 수는 cached_cells 열)
+  커널 상태는 저장하지 않으므로, 캐시된 셀 중 뒤 셀이 의존하는 셀(dataflow.slice_cells)만 다시 실행한다.
+  → 실제로 아끼는 커널 시간은 뒤 셀과 무관한 캐시 셀(탐색용 출력, 그림 등)만큼이다.
+  캐시 키에는 패키지 버전(environment_fingerprint)과 작업 폴더 파일 목록(cwd_digest)이 들어간다.
+"""
+from __future__ import annotations
+import atexit
+import hashlib
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+EXEC_COLS: List[str] = ["file", "status", "seconds", "executed_file", "error", "engine", "skipped_cells", "cached_cells"]
+
+
+@dataclass(frozen=True)
+class ExecConfig:
+    pool_size: int = 0               # 커널(워커) 수, 0 이하 → CPU 코어 수
+    cell_timeout: int = 60           # 셀 1개 최대 실행 시간(초)
+    notebook_timeout: int = 600      # 노트북 1개 최대 실행 시간(초)
+    reuse_kernels: bool = True       # False면 노트북마다 커널 재시작
+    kernel_name: str = "python3"
+    startup_timeout: int = 60
+    cwd: Optional[str] = None        # 커널 작업 폴더 (None → 제출물마다 그 제출 파일이 있는 폴더)
+    engine: str = "kernel"           # kernel: 커널 풀 / fork: 템플릿 준비 셀 스냅샷 fork
+    dependency_slice: bool = False   # True면 채점 라벨에 필요한 셀만 실행
+    slice_labels: Tuple[str, ...] = ()   # 채점 라벨 (execute_submissions 가 채움)
+    cell_cache_path: Optional[str] = None  # 셀 실행 결과 캐시(sqlite) 경로, None → 사용 안 함
+    cell_cache_max_mb: int = 512     # 셀 캐시 최대 크기 (넘으면 LRU 삭제)
+
+    def for_submission(self, path: Path) -> "ExecConfig":
+        """제출물 1개에 쓸 설정 (cwd=None 이면 그 제출물의 폴더로 채움 → 셀 캐시 키에도 반영)."""
+        return self if self.cwd else replace(self, cwd=str(Path(path).parent))
+
+    def cache_tag(self, folders: Iterable[Path] = ()) -> str:
+        """
+        채점 결과 캐시 버전에 넣을 문자열 (출력에 영향을 주는 설정 + 실행 환경).
+        folders: cwd=None 일 때 실행 폴더가 될 제출물 폴더들 → 폴더마다 파일 목록(cwd_digest)을 반영
+        패키지 버전(environment_fingerprint)이나 작업 폴더의 데이터 파일이 바뀌면 태그도 바뀐다.
+        """
+        cwds = [self.cwd] if self.cwd else sorted({str(Path(f)) for f in folders})
+        files = ",".join(_compute_cwd_digest(c, self.cell_cache_path) for c in cwds)
+        return (f"exec:{self.engine}:{self.kernel_name}:{self.cell_timeout}:{self.notebook_timeout}:{self.cwd}"
+                f":slice={self.dependency_slice}:env={environment_fingerprint(self.kernel_name)}"
+                f":files={hashlib.sha256(files.encode('utf-8')).hexdigest()}")
+
+
+@dataclass
+class ExecResult:
+    file: str
+    status: str                      # OK / TIMEOUT / ERROR
+    seconds: float
+    executed_file: str = ""          # EXEC_DIR 내 실행본 경로 (실패 시 "")
+    error: str = ""
+    engine: str = "kernel"           # 실제로 실행한 엔진 (kernel / fork)
+    skipped_cells: str = ""          # dependency_slice 로 건너뛴 셀 번호 (공백 구분)
+    cached_cells: int = 0            # 셀 캐시에서 출력을 재사용하고 실행하지 않은 셀 수
+
+
+class NotebookTimeout(Exception):
+    pass
+
+
+class _KernelSlot:
+    """워커 프로세스 1개가 소유하는 커널 (km/kc를 노트북 사이에 재사용)."""
+
+    def __init__(self, cfg: ExecConfig):
+        import nbformat
+        from nbclient import NotebookClient
+
+        self.cfg = cfg
+        boot = NotebookClient(nbformat.v4.new_notebook(), kernel_name=cfg.kernel_name,
+                              startup_timeout=cfg.startup_timeout)
+        boot.km = boot.create_kernel_manager()
+        boot.start_new_kernel(**({"cwd": cfg.cwd} if cfg.cwd else {}))
+        boot.start_new_kernel_client()
+        self.km, self.kc = boot.km, boot.kc
+        self.used = False
+
+    def _reset(self) -> None:
+        from jupyter_core.utils import run_sync
+        if self.cfg.reuse_kernels:
+            run_sync(self.kc.execute_interactive)("%reset -f", store_history=False,
+                                                  timeout=self.cfg.cell_timeout)
+        else:
+            self._restart()
+
+    def _restart(self) -> None:
+        from jupyter_core.utils import run_sync
+        run_sync(self.km.restart_kernel)(now=True)
+        run_sync(self.kc.wait_for_ready)(timeout=self.cfg.startup_timeout)
+
+    def _chdir(self, cwd: str) -> None:
+        from jupyter_core.utils import run_sync
+        run_sync(self.kc.execute_interactive)(f"__import__('os').chdir({cwd!r})", silent=True,
+                                              store_history=False, timeout=self.cfg.cell_timeout)
+
+    def run(self, sources: List[str], cwd: Optional[str] = None) -> Tuple[List[Tuple[list, Optional[int]]], str, str]:
+        """
+        코드 셀 소스 목록을 순서대로 실행.
+        cwd: 실행 전에 커널 작업 폴더를 옮김 (커널 하나를 여러 폴더의 제출물에 재사용)
+        Returns: ([(outputs, execution_count), ...], status, error)
+          - 실행하지 못한 셀은 ([], None)
+        """
+        import nbformat
+        from nbclient import NotebookClient
+        from nbclient.exceptions import DeadKernelError
+
+        if self.used:
+            self._reset()
+        self.used = True
+        if cwd:
+            self._chdir(cwd)
+
+        cfg = self.cfg
+        nb = nbformat.v4.new_notebook(cells=[nbformat.v4.new_code_cell(s) for s in sources])
+        deadline = time.monotonic() + cfg.notebook_timeout
+
+        def _before_cell(cell, cell_index):
+            if time.monotonic() >= deadline:
+                raise NotebookTimeout(f"notebook timeout ({cfg.notebook_timeout}s)")
+
+        def _cell_timeout(cell):
+            return max(1, int(min(cfg.cell_timeout, deadline - time.monotonic())))
+
+        client = NotebookClient(
+            nb, km=self.km,
+            kernel_name=cfg.kernel_name,
+            timeout=cfg.cell_timeout,
+            timeout_func=_cell_timeout,
+            allow_errors=True,
+            interrupt_on_timeout=True,
+            error_on_timeout={"ename": "CellTimeoutError",
+                              "evalue": f"cell timeout ({cfg.cell_timeout}s)",
+                              "traceback": [f"CellTimeoutError: cell timeout ({cfg.cell_timeout}s)"]},
+            on_cell_execute=_before_cell,
+        )
+        client.kc = self.kc
+
+        status, error = "OK", ""
+        try:
+            client.execute(cleanup_kc=False)
+        except NotebookTimeout as e:
+            status, error = "TIMEOUT", str(e)
+        except DeadKernelError as e:
+            status, error = "ERROR", f"kernel died: {e}"
+            self._restart()
+        except Exception as e:
+            status, error = "ERROR", f"{type(e).__name__}: {e}"
+        finally:
+            atexit.unregister(client._cleanup_kernel)
+
+        cells = [(list(c.get("outputs", [])), c.get("execution_count")) for c in nb.cells]
+        return cells, status, error
+
+    def shutdown(self) -> None:
+        try:
+            from jupyter_core.utils import run_sync
+            self.kc.stop_channels()
+            run_sync(self.km.shutdown_kernel)(now=True)
+        except Exception:
+            pass
+
+
+# ---- 워커 프로세스 (커널 풀)
+_SLOT: Optional[_KernelSlot] = None
+
+def _init_exec_worker(cfg: ExecConfig) -> None:
+    global _SLOT
+    from multiprocessing import util
+    _SLOT = _KernelSlot(cfg)
+    # 풀 워커는 atexit을 실행하지 않으므로 multiprocessing Finalize로 커널 종료
+    util.Finalize(_SLOT, _SLOT.shutdown, exitpriority=10)
+
+
+def plan_cells(nb, cfg: ExecConfig, keep_first: int = 0) -> Tuple[List[int], List[int]]:
+    """
+    Returns: (코드 셀 번호 전체, 실행할 코드 셀 번호)
+    keep_first: 앞쪽 코드 셀 n개는 항상 실행 (fork 엔진의 준비 셀)
+    """
+    code_idx = [i for i, c in enumerate(nb.cells) if c.cell_type == "code"]
+    if not (cfg.dependency_slice and cfg.slice_labels):
+        return code_idx, code_idx
+
+    from .dataflow import slice_cells
+    from .nb_utils import _extract_label
+    labels = set(cfg.slice_labels)
+    sources = [nb.cells[i].source or "" for i in code_idx]
+    targets = [k for k, s in enumerate(sources) if _extract_label(s) in labels]
+    keep = set(slice_cells(sources, targets)) | set(range(min(keep_first, len(code_idx))))
+    return code_idx, [code_idx[k] for k in sorted(keep)]
+
+
+def fill_outputs(nb, code_idx: List[int], ran: Dict[int, Tuple[list, Optional[int]]]) -> None:
+    """실행 결과를 노트북에 기록. 실행하지 않은 코드 셀은 출력/실행 번호를 비운다."""
+    import nbformat
+    for i in code_idx:
+        outs, ec = ran.get(i, ([], None))
+        nb.cells[i].outputs = [nbformat.from_dict(o) for o in outs]
+        nb.cells[i].execution_count = ec
+
+
+def _skipped_str(code_idx: List[int], run_idx: List[int]) -> str:
+    run = set(run_idx)
+    return " ".join(str(i) for i in code_idx if i not in run)
+
+
+# ---- 셀 실행 결과 캐시 (프로세스마다 1개)
+_CELL_CACHES: Dict[str, "ExecCache"] = {}
+
+def _cell_cache(cfg: ExecConfig):
+    if not cfg.cell_cache_path:
+        return None
+    from .exec_cache import ExecCache
+    cache = _CELL_CACHES.get(cfg.cell_cache_path)
+    if cache is None:
+        cache = _CELL_CACHES[cfg.cell_cache_path] = ExecCache(
+            Path(cfg.cell_cache_path), cfg.cell_cache_max_mb * 1024 * 1024)
+    return cache
+
+
+# 셀 캐시 키에 넣는 작업 폴더 파일 수 상한 (넘으면 앞쪽 목록 + 전체 개수만 반영)
+CWD_DIGEST_MAX_FILES = 5000
+_CWD_DIGESTS: Dict[Tuple[str, str], str] = {}
+
+def cwd_digest(cwd: Optional[str], ignore: Optional[str] = None) -> str:
+    """
+    작업 폴더 안 파일의 (상대 경로, 크기, 수정 시각) 해시 — 셀이 읽는 데이터 파일이 바뀌면 캐시 키도 바뀜.
+    노트북(*.ipynb)과 숨김 파일/폴더, __pycache__ 는 제외 (제출물이 추가돼도 키가 흔들리지 않도록).
+    ignore: 함께 제외할 파일 (셀 캐시 sqlite 자신과 -wal/-shm)
+    실행 워커 안에서는 폴더별로 한 번만 계산한다 (채점 런마다 새로 계산하려면 _compute_cwd_digest).
+    """
+    if not cwd:
+        return ""
+    key = (cwd, ignore or "")
+    d = _CWD_DIGESTS.get(key)
+    if d is None:
+        d = _CWD_DIGESTS[key] = _compute_cwd_digest(cwd, ignore)
+    return d
+
+
+def _compute_cwd_digest(cwd: Optional[str], ignore: Optional[str] = None) -> str:
+    if not cwd:
+        return ""
+    skip = Path(ignore).resolve() if ignore else None
+    entries, total = [], 0
+    root = Path(cwd)
+    for base, dirs, files in os.walk(root):
+        dirs[:] = sorted(x for x in dirs if not x.startswith(".") and x != "__pycache__")
+        for name in sorted(files):
+            if name.startswith(".") or name.endswith(".ipynb"):
+                continue
+            p = Path(base) / name
+            if skip is not None and p.resolve().parent == skip.parent and name.startswith(skip.name):
+                continue
+            total += 1
+            if len(entries) >= CWD_DIGEST_MAX_FILES:
+                continue
+            try:
+                st = p.stat()
+            except OSError:
+                continue
+            entries.append(f"{p.relative_to(root).as_posix()}|{st.st_size}|{st.st_mtime_ns}")
+    h = hashlib.sha256(f"{total}".encode("utf-8"))
+    for e in entries:
+        h.update(b"\0" + e.encode("utf-8"))
+    return h.hexdigest()
+
+
+def _cache_seed(cfg: ExecConfig) -> str:
+    """셀 캐시 체인의 시작 키: 커널 + 작업 폴더(와 그 안 파일) + 타임아웃 + 설치된 패키지 버전."""
+    return "|".join([cfg.kernel_name, str(cfg.cwd), str(cfg.cell_timeout),
+                     environment_fingerprint(cfg.kernel_name), cwd_digest(cfg.cwd, cfg.cell_cache_path)])
+
+
+def run_cells(nb, cfg: ExecConfig, run_idx: List[int], runner, done: Optional[Dict[int, tuple]] = None):
+    """
+    run_idx 셀을 순서대로 실행 (셀 캐시가 있으면 앞쪽 캐시 체인은 재사용).
+    캐시 적중 셀은 출력만 재사용하고, 그중 캐시 밖 셀이 의존하는 셀만 상태 복원을 위해 다시 실행한다.
+    (파일 입출력처럼 이름으로 드러나지 않는 의존성은 dataflow 가 잡지 못함)
+    runner(idx 목록) -> ({셀 번호: (outputs, ec)}, status, error)
+    done: 이미 실행된 셀 결과 (fork 엔진의 준비 셀)
+    Returns: ({셀 번호: (outputs, ec)}, status, error, 재사용한 셀 수)
+    """
+    ran = dict(done or {})
+    cache = _cell_cache(cfg)
+    if cache is None:
+        new, status, error = runner([i for i in run_idx if i not in ran])
+        ran.update(new)
+        return ran, status, error, 0
+
+    from .exec_cache import chain_keys, is_stable
+    sources = [nb.cells[i].source or "" for i in run_idx]
+    keys = chain_keys(_cache_seed(cfg), sources)
+    hits = cache.lookup(keys)
+    m = len(hits)
+    for i, r in zip(run_idx[:m], hits):
+        ran.setdefault(i, r)
+    if m == len(run_idx):
+        return ran, "OK", "", sum(1 for i in run_idx if i not in (done or {}))
+
+    # 처음 달라지는 셀부터 실행하려면 커널 상태가 필요 → 뒤 셀이 의존하는 캐시 셀만 다시 실행해서 상태 복원
+    from .dataflow import slice_cells
+    keep = set(slice_cells(sources, range(m, len(run_idx))))
+    replay = [run_idx[p] for p in range(m) if p in keep]
+    to_run = [i for i in (*replay, *run_idx[m:]) if i not in (done or {})]
+    new, status, error = runner(to_run)
+    ran.update(new)
+
+    cells = [ran.get(i, ([], None)) for i in run_idx]
+    if status == "OK" and is_stable(cells):
+        cache.store(keys[m:], cells[m:])
+    reused = len([i for i in run_idx[:m] if i not in set(to_run) and i not in (done or {})])
+    return ran, status, error, reused
+
+
+def _execute_one(slot: _KernelSlot, src: Path, dst: Path) -> ExecResult:
+    import nbformat
+
+    t0 = time.monotonic()
+    try:
+        nb = nbformat.read(src, as_version=4)
+    except Exception as e:
+        return ExecResult(src.name, "ERROR", 0.0, "", f"노트북 파싱 실패: {e}")
+
+    cfg = slot.cfg.for_submission(src)
+
+    def _runner(idx: List[int]):
+        cells, status, error = slot.run([nb.cells[i].source for i in idx], cwd=cfg.cwd)
+        return dict(zip(idx, cells)), status, error
+
+    code_idx, run_idx = plan_cells(nb, cfg)
+    ran, status, error, reused = run_cells(nb, cfg, run_idx, _runner)
+    fill_outputs(nb, code_idx, ran)
+    skipped = _skipped_str(code_idx, run_idx)
+
+    try:
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        nbformat.write(nb, dst)
+    except Exception as e:
+        return ExecResult(src.name, "ERROR", round(time.monotonic() - t0, 2), "", f"실행본 저장 실패: {e}",
+                          skipped_cells=skipped, cached_cells=reused)
+    return ExecResult(src.name, status, round(time.monotonic() - t0, 2), str(dst), error,
+                      skipped_cells=skipped, cached_cells=reused)
+
+
+def _exec_task(task: Tuple[Path, Path]) -> ExecResult:
+    src, dst = task
+    return _execute_one(_SLOT, src, dst)
+
+
+def _dest_paths(paths: List[Path], exec_dir: Path) -> List[Path]:
+    """EXEC_DIR 내 실행본 경로 (하위 폴더의 같은 파일명은 _2, _3 … 로 구분)."""
+    used: Dict[str, int] = {}
+    out = []
+    for p in paths:
+        n = used.get(p.name, 0) + 1
+        used[p.name] = n
+        name = p.name if n == 1 else f"{p.stem}_{n}{p.suffix}"
+        out.append(Path(exec_dir) / name)
+    return out
+
+
+def execute_submissions(
+    paths: Iterable[Path],
+    exec_dir: Path,
+    config: ExecConfig = ExecConfig(),
+    template_path: Optional[Path] = None,
+    labels: Optional[Iterable[str]] = None,
+) -> List[ExecResult]:
+    """
+    제출물을 재실행하고 실행본을 exec_dir 에 저장. 결과는 입력 순서 그대로.
+    template_path: engine="fork" 일 때 공통 준비 셀을 찾을 템플릿
+    labels: dependency_slice 일 때 출력이 필요한 채점 라벨
+    """
+    paths = [Path(p) for p in paths]
+    if not paths:
+        return []
+    if labels is not None:
+        config = replace(config, slice_labels=tuple(labels))
+
+    dests = _dest_paths(paths, exec_dir)
+    results: List[Optional[ExecResult]] = [None] * len(paths)
+    if config.engine == "fork" and template_path is not None:
+        from .fork_exec import execute_forked
+        results = execute_forked(paths, dests, config, Path(template_path))
+
+    rest = [i for i, r in enumerate(results) if r is None]
+    if rest:
+        tasks = [(paths[i], dests[i]) for i in rest]
+        n = (os.cpu_count() or 1) if config.pool_size <= 0 else config.pool_size
+        n = min(n, len(tasks))
+        with ProcessPoolExecutor(max_workers=n, initializer=_init_exec_worker, initargs=(config,)) as ex:
+            for i, r in zip(rest, ex.map(_exec_task, tasks)):
+                results[i] = r
+
+    cache = _cell_cache(config)
+    if cache is not None:
+        cache.evict()
+        cache.close()
+    return results
+
+
+# ---- 정답 노트북 재실행 (환경별 1회, 결과 캐시)
+@lru_cache(maxsize=None)
+def environment_fingerprint(kernel_name: str = "python3") -> str:
+    """파이썬 버전 + 설치된 패키지 버전 목록 해시 (커널이 같은 환경을 쓴다고 가정)."""
+    import hashlib
+    import sys
+    from importlib import metadata
+
+    pkgs = set()
+    for d in metadata.distributions():
+        name = d.metadata.get("Name")
+        if name:
+            pkgs.add(f"{name.lower()}=={d.version}")
+    h = hashlib.sha256(f"{sys.version}|{kernel_name}".encode("utf-8"))
+    for line in sorted(pkgs):
+        h.update(b"\0" + line.encode("utf-8"))
+    return h.hexdigest()
+
+
+def execute_answer(answer_path: Path, cache_dir: Path, config: ExecConfig = ExecConfig()) -> Tuple[Path, bool]:
+    """
+    정답 노트북을 현재 환경에서 재실행한 실행본 경로.
+    - 키: 정답 파일 해시 + environment_fingerprint + 작업 폴더
+      → cache_dir/answer_<키>.ipynb 가 있으면 재실행 없이 사용
+    - 실행 실패(TIMEOUT/ERROR) 시 경고 후 원본 정답을 그대로 사용 (캐시 저장 안 함)
+    Returns: (정답으로 쓸 노트북 경로, 이번에 새로 실행했는지)
+    """
+    import hashlib
+    import shutil
+    import tempfile
+
+    answer_path = Path(answer_path)
+    cache_dir = Path(cache_dir)
+    key = hashlib.sha256("|".join([
+        hashlib.sha256(answer_path.read_bytes()).hexdigest(),
+        environment_fingerprint(config.kernel_name),
+        str(config.for_submission(answer_path).cwd),
+    ]).encode("utf-8")).hexdigest()[:20]
+    cached = cache_dir / f"answer_{key}.ipynb"
+    if cached.exists():
+        return cached, False
+
+    # 정답은 전체 셀을 그대로 실행 (fork/의존성 슬라이스/셀 캐시 사용 안 함)
+    cfg = replace(config, pool_size=1, engine="kernel", dependency_slice=False, cell_cache_path=None)
+    with tempfile.TemporaryDirectory() as tmp:
+        (res,) = execute_submissions([answer_path], Path(tmp), cfg)
+        if res.status != "OK" or not res.executed_file:
+            print(f"⚠️ 정답 재실행 실패({res.status}): {res.error} → 저장된 정답 출력 사용")
+            return answer_path, False
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        shutil.move(res.executed_file, cached)
+    return cached, True
+
+
+def build_exec_report_df(results: Iterable[ExecResult]) -> pd.DataFrame:
+    rows = [[r.file, r.status, r.seconds, r.executed_file, r.error, r.engine, r.skipped_cells, r.cached_cells]
+            for r in results]
+    return pd.DataFrame(rows, columns=EXEC_COLS)
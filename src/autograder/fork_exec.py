@@ -0,0 +1,307 @@
+# src/autograder/fork_exec.py
+"""
+fork 스냅샷 재실행 엔진 (Linux 전용, ExecConfig(engine="fork"))
+
+- 템플릿 앞부분의 공통 준비 셀(첫 라벨 셀 이전의 코드 셀: import/데이터 로드 등)을
+  서버 프로세스의 IPython 셸에서 한 번만 실행해 둔다.
+- 학생마다 그 상태를 os.fork() 해서 나머지 셀만 실행 → 무거운 준비 셀 반복 비용 제거
+  · 학생 간 격리: 자식 프로세스 단위 (네임스페이스/모듈 상태가 서로 섞이지 않음)
+  · 셀 타임아웃: 자식 안에서 SIGALRM → CellTimeoutError 출력으로 기록 후 다음 셀 진행
+  · 노트북 타임아웃: 남은 셀은 실행하지 않음, 응답이 없으면 서버가 자식을 SIGKILL
+- 준비 셀이 템플릿과 다른 제출물(exec_cache.cell_cache_text 기준: 주석/빈 줄/줄 끝 공백만 무시)은
+  None 을 반환 → 커널 풀 엔진으로 실행
+- 서버 프로세스는 spawn 으로 띄운다 (채점 노트북 커널의 zmq 소켓/스레드를 물려받지 않도록)
+- 준비 셀은 작업 폴더에서 데이터를 읽을 수 있으므로 작업 폴더(cwd=None 이면 제출 폴더)마다 서버를 따로 띄운다
+"""
+from __future__ import annotations
+import io
+import json
+import multiprocessing as mp
+import os
+import signal
+import sys
+import time
+from dataclasses import asdict, replace
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from .execution import ExecConfig, ExecResult, plan_cells, fill_outputs, run_cells, _skipped_str
+from .exec_cache import cell_cache_text
+from .nb_utils import load_notebook_fast, _extract_label
+
+# 자식이 응답 없이 멈췄을 때 노트북 타임아웃 이후 추가로 기다리는 시간(초)
+KILL_GRACE = 10
+# 자식 → 서버 결과 메시지 중 에러 문자열 최대 길이 (파이프 버퍼 초과 방지)
+MAX_ERROR_LEN = 1000
+
+
+class CellTimeoutError(Exception):
+    pass
+
+
+def fork_supported() -> bool:
+    return hasattr(os, "fork") and sys.platform.startswith("linux")
+
+
+def _code_sources(nb) -> List[str]:
+    return [c.source or "" for c in nb.cells if c.cell_type == "code"]
+
+
+def template_prefix(template_path: Path) -> List[str]:
+    """템플릿의 공통 준비 셀 = 첫 라벨 코드 셀 이전의 코드 셀들."""
+    prefix = []
+    for src in _code_sources(load_notebook_fast(template_path)):
+        if _extract_label(src):
+            break
+        prefix.append(src)
+    return prefix
+
+
+def _matches_prefix(path: Path, prefix_text: List[str]) -> bool:
+    """제출물의 앞쪽 코드 셀이 템플릿 준비 셀과 같은지 (셀 캐시 키와 같은 기준)."""
+    try:
+        sources = _code_sources(load_notebook_fast(path))
+    except Exception:
+        return False
+    return [cell_cache_text(s) for s in sources[:len(prefix_text)]] == prefix_text
+
+
+# ---- 서버/자식 프로세스 쪽 (IPython 셸 + 출력 기록)
+class _Recorder:
+    """현재 실행 중인 셀의 출력(nbformat v4 dict)을 모은다."""
+
+    def __init__(self):
+        self.outputs: list = []
+
+    def stream(self, name: str, text: str) -> None:
+        if not text:
+            return
+        last = self.outputs[-1] if self.outputs else None
+        if last is not None and last["output_type"] == "stream" and last["name"] == name:
+            last["text"] += text
+        else:
+            self.outputs.append({"output_type": "stream", "name": name, "text": text})
+
+    def add(self, output: dict) -> None:
+        self.outputs.append(output)
+
+
+class _StreamProxy(io.TextIOBase):
+    def __init__(self, rec: _Recorder, name: str):
+        self._rec, self._name = rec, name
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, s: str) -> int:
+        self._rec.stream(self._name, s)
+        return len(s)
+
+
+_REC = _Recorder()
+
+
+def _make_shell():
+    from IPython.core.interactiveshell import InteractiveShell
+    from IPython.core.displayhook import DisplayHook
+    from IPython.core.displaypub import DisplayPublisher
+    from traitlets.config import Config
+
+    class _Hook(DisplayHook):
+        def write_output_prompt(self):
+            pass
+
+        def write_format_data(self, format_dict, md_dict=None):
+            _REC.add({"output_type": "execute_result", "data": format_dict,
+                      "metadata": md_dict or {}, "execution_count": self.prompt_count})
+
+        def finish_displayhook(self):
+            pass
+
+    class _Pub(DisplayPublisher):
+        def publish(self, data, metadata=None, source=None, *, transient=None, update=False, **kwargs):
+            _REC.add({"output_type": "display_data", "data": data, "metadata": metadata or {}})
+
+        def clear_output(self, wait=False):
+            _REC.outputs.clear()
+
+    class _Shell(InteractiveShell):
+        displayhook_class = _Hook
+        display_pub_class = _Pub
+
+        def _showtraceback(self, etype, evalue, stb):
+            _REC.add({"output_type": "error", "ename": getattr(etype, "__name__", str(etype)),
+                      "evalue": str(evalue), "traceback": list(stb)})
+
+    # 히스토리 저장 스레드(sqlite)가 락을 쥔 채로 fork되면 자식이 멈추므로 히스토리 DB는 끈다
+    cfg = Config()
+    cfg.HistoryManager.enabled = False
+    shell = _Shell.instance(config=cfg, colors="NoColor")
+    try:
+        shell.enable_matplotlib("inline")   # 커널과 같은 inline 그림 출력 (matplotlib 없으면 생략)
+    except Exception:
+        pass
+    return shell
+
+
+def _run_cell(shell, src: str, timeout: Optional[float]) -> Tuple[list, Optional[int]]:
+    _REC.outputs = []
+    ec = shell.execution_count
+    old = sys.stdout, sys.stderr
+    sys.stdout, sys.stderr = _StreamProxy(_REC, "stdout"), _StreamProxy(_REC, "stderr")
+    if timeout:
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        shell.run_cell(src, store_history=True)
+    finally:
+        if timeout:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+        sys.stdout, sys.stderr = old
+    return _REC.outputs, ec
+
+
+def _child(shell, prefix_cells, src: Path, dst: Path, cfg: ExecConfig, wfd: int) -> None:
+    """fork된 자식: 준비 셀 이후를 실행하고 실행본 저장, 결과 JSON을 파이프로 보낸 뒤 종료."""
+    import nbformat
+
+    t0 = time.monotonic()
+    try:
+        def _on_alarm(signum, frame):
+            raise CellTimeoutError(f"cell timeout ({cfg.cell_timeout}s)")
+        signal.signal(signal.SIGALRM, _on_alarm)
+
+        nb = nbformat.read(src, as_version=4)
+        k = len(prefix_cells)
+        code_idx, run_idx = plan_cells(nb, cfg, keep_first=k)
+        deadline = t0 + cfg.notebook_timeout
+
+        def _runner(idx: List[int]):
+            out, status, error = {}, "OK", ""
+            for i in idx:
+                left = deadline - time.monotonic()
+                if left <= 0:
+                    status, error = "TIMEOUT", f"notebook timeout ({cfg.notebook_timeout}s)"
+                    break
+                out[i] = _run_cell(shell, nb.cells[i].source, max(1, min(cfg.cell_timeout, left)))
+            return out, status, error
+
+        # 준비 셀 출력은 서버에서 실행한 결과를 그대로 사용
+        ran, status, error, reused = run_cells(nb, cfg, run_idx, _runner,
+                                               done=dict(zip(code_idx[:k], prefix_cells)))
+        fill_outputs(nb, code_idx, ran)
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        nbformat.write(nb, dst)
+        res = ExecResult(src.name, status, round(time.monotonic() - t0, 2), str(dst), error, "fork",
+                         _skipped_str(code_idx, run_idx), reused)
+    except BaseException as e:
+        res = ExecResult(src.name, "ERROR", round(time.monotonic() - t0, 2), "",
+                         f"{type(e).__name__}: {e}"[:MAX_ERROR_LEN], "fork")
+    try:
+        os.write(wfd, json.dumps(asdict(res)).encode("utf-8"))
+    finally:
+        os._exit(0)
+
+
+def _serve(conn, cfg: ExecConfig, prefix: List[str], tasks: List[Tuple[Path, Path]]) -> None:
+    """spawn된 서버: 준비 셀 1회 실행 → 학생마다 fork (동시에 최대 pool_size개)."""
+    if cfg.cwd:
+        os.chdir(cfg.cwd)
+    import nbformat
+    nbformat.validate(nbformat.v4.new_notebook())   # 스키마 로드까지 미리 → 자식마다 반복하지 않음
+    shell = _make_shell()
+    prefix_cells = [_run_cell(shell, src, None) for src in prefix]
+    sys.stdout.flush(); sys.stderr.flush()
+
+    n = (os.cpu_count() or 1) if cfg.pool_size <= 0 else cfg.pool_size
+    hard_limit = cfg.notebook_timeout + KILL_GRACE
+    results: List[Optional[dict]] = [None] * len(tasks)
+    pending = list(range(len(tasks)))
+    running = {}   # pid -> (task idx, read fd, 시작 시각)
+
+    def _collect(pid: int, status: Optional[str] = None) -> None:
+        i, rfd, t0 = running.pop(pid)
+        chunks = []
+        while True:
+            b = os.read(rfd, 65536)
+            if not b:
+                break
+            chunks.append(b)
+        os.close(rfd)
+        src = tasks[i][0]
+        try:
+            results[i] = json.loads(b"".join(chunks).decode("utf-8"))
+        except Exception:
+            results[i] = asdict(ExecResult(src.name, "ERROR", round(time.monotonic() - t0, 2), "",
+                                           "자식 프로세스가 결과 없이 종료", "fork"))
+        if status == "TIMEOUT":
+            results[i] = asdict(ExecResult(src.name, "TIMEOUT", round(time.monotonic() - t0, 2), "",
+                                           f"notebook timeout ({cfg.notebook_timeout}s), killed", "fork"))
+
+    while pending or running:
+        while pending and len(running) < n:
+            i = pending.pop(0)
+            rfd, wfd = os.pipe()
+            pid = os.fork()
+            if pid == 0:
+                os.close(rfd)
+                _child(shell, prefix_cells, Path(tasks[i][0]), Path(tasks[i][1]), cfg, wfd)
+            os.close(wfd)
+            running[pid] = (i, rfd, time.monotonic())
+
+        pid, _ = os.waitpid(-1, os.WNOHANG)
+        if pid:
+            _collect(pid)
+            continue
+        now = time.monotonic()
+        for pid, (_i, _rfd, t0) in list(running.items()):
+            if now - t0 > hard_limit:
+                os.kill(pid, signal.SIGKILL)
+                os.waitpid(pid, 0)
+                _collect(pid, "TIMEOUT")
+        time.sleep(0.01)
+
+    conn.send(results)
+    conn.close()
+
+
+def execute_forked(
+    paths: List[Path],
+    dests: List[Path],
+    config: ExecConfig,
+    template_path: Path,
+) -> List[Optional[ExecResult]]:
+    """
+    템플릿 준비 셀과 앞부분이 같은 제출물을 fork 스냅샷에서 재실행.
+    Returns: 입력 순서의 ExecResult, fork로 처리하지 않은 제출물은 None (→ 커널 풀에서 실행)
+    """
+    out: List[Optional[ExecResult]] = [None] * len(paths)
+    if not fork_supported():
+        return out
+    prefix = template_prefix(template_path)
+    prefix_text = [cell_cache_text(s) for s in prefix]
+    if not any(prefix_text):
+        return out  # 공통 준비 셀이 없으면 이득이 없음
+
+    groups = {}   # 작업 폴더 → 제출물 위치
+    for i, p in enumerate(paths):
+        if _matches_prefix(p, prefix_text):
+            groups.setdefault(config.for_submission(p).cwd, []).append(i)
+
+    ctx = mp.get_context("spawn")
+    for cwd, idx in groups.items():
+        parent_conn, child_conn = ctx.Pipe(duplex=False)
+        tasks = [(str(paths[i]), str(dests[i])) for i in idx]
+        proc = ctx.Process(target=_serve, args=(child_conn, replace(config, cwd=cwd), prefix, tasks), daemon=True)
+        proc.start()
+        child_conn.close()
+        try:
+            results = parent_conn.recv()
+        except EOFError:
+            results = None  # 서버가 죽음 → 이 폴더의 제출물은 전부 커널 풀로
+        finally:
+            proc.join()
+
+        if results:
+            for i, r in zip(idx, results):
+                out[i] = ExecResult(**r)
+    return out
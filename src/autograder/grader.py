@@ -1,129 +1,122 @@
 """
 CLI 러너 (선택). 노트북 없이도 실행 가능:
 $ python -m autograder.grader --session 9 --env DEV
+$ python -m autograder.grader --session 9 --env DEV --jobs 8   # 프로세스 8개로 병렬 채점
+$ python -m autograder.grader --session 9 --env DEV --execute --exec-pool 8   # 커널 8개로 재실행 후 채점
+$ python -m autograder.grader --session 9 --env PROD --cross-cohort   # 이전 기수 제출물과 교차 비교
+$ python -m autograder.grader --session 9 --env PROD --index-cohort "/.../2024 마케팅조사론/9차시" --cross-cohort
+  (보관된 기수 제출 폴더를 먼저 인덱스에 추가, 기수 이름 = 그 폴더의 상위 폴더 이름)
 """
 import argparse
 from pathlib import Path
-import nbformat, pandas as pd
-from autograder.io_utils import now_kst, extract_id_and_name, _mtime_kst_str, _filesize_bytes, load_config
-from autograder.nb_utils import (
-    _label_map, _nb_fingerprint, _cell_output_text, _indexes_with_labels,
-    _label_key_robust
-)
-from autograder.policy import (
-    ScorePolicy, should_grade_label, student_executed_for_grading,
-    outputs_equal_loose_text, decide_output_match, __version__ as policy_version
-)
+from autograder.io_utils import now_kst, load_config
+from autograder.nb_utils import _label_key_robust, OUTPUT_MAX_CHARS
+from autograder.paths import build_output_layout
+from autograder.policy import DEFAULT_TEMPLATE_SIM_THRESHOLD, parse_tolerances, __version__ as policy_version
+from autograder.grading_plan import load_grading_plan
+from autograder.grading import grade_submissions
+from autograder.normalizers import parse_normalizers
+from autograder.output_memo import ComparisonMemo
+from autograder.execution import ExecConfig
+from autograder.sim_index import cross_cohort_check, index_submit_dir, require_index_path
 from autograder.report import build_stats_block, build_excluded_summary_line
 
-def main(session: int, env: str, toml_path: str):
+DEFAULT_CONFIG = "autograder/configs/sessions.toml"
+
+def main(session: int = None, env: str = None, toml_path: str = DEFAULT_CONFIG, jobs: int = 1,
+         execute: ExecConfig = None, cross_cohort: bool = False, index_cohorts=(), compact: bool = None):
+    args = None
+    if session is None:
+        # console script(`autograder`)로 실행된 경우
+        args = _parse_args()
+        session, env, toml_path, jobs = args.session, args.env, args.config, args.jobs
+        cross_cohort = args.cross_cohort
+        index_cohorts = args.index_cohort or ()
+        compact = True if args.compact else None
+
     cfg = load_config(toml_path, session, env)
-    TEMPLATE_PATH = cfg["template_path"]
-    ANSWER_PATH = cfg["answer_path"]
-    SUBMIT_DIR    = cfg["submit_dir"]
-    OUT_DIR       = cfg["out_dir"]
+    # compact: 인자(--compact) 우선, 없으면 sessions.toml [session_N] COMPACT
+    compact = cfg["compact"] if compact is None else compact
+    TEMPLATE_PATH = Path(cfg["template_path"])
+    ANSWER_PATH   = Path(cfg["answer_path"])
+    SUBMIT_DIR    = Path(cfg["submit_dir"])
+    OUT_DIR       = Path(cfg["out_dir"])
+
+    # 교차 기수 인덱스는 OUT_DIR 밖의 SIM_INDEX_PATH 필수 (채점 전에 확인)
+    index_path = require_index_path(cfg["sim_index_path"]) if (cross_cohort or index_cohorts) else None
 
     RUN_TS = now_kst().strftime("%Y%m%d_%H%M%S")
-    OUT = Path(OUT_DIR); OUT.mkdir(parents=True, exist_ok=True)
-    EXEC_DIR = OUT / "executed" / RUN_TS
-    EXEC_DIR.mkdir(parents=True, exist_ok=True)
-
-    tmpl = nbformat.read(TEMPLATE_PATH, as_version=4)
-    sol  = nbformat.read(ANSWER_PATH, as_version=4)
-
-    # 태그 읽기 (노트북에서 만든 태깅본 없이 운영하려면 여기에 태깅 로직 추가해도 됨)
-    req_labels, opt_labels = set(), set()
-    for c in tmpl.cells:
-        if c.cell_type != "code": 
-            continue
-        tg = set(c.get("metadata", {}).get("tags", []))
-        lab = c.source.splitlines()[0].lstrip("#").strip().split()[0] if c.source else None
-        if "required" in tg and lab: req_labels.add(lab)
-        if "optional_ex" in tg and lab: opt_labels.add(lab)
-
-    sol_lmap = _label_map(sol)
-    base_score = 100.0
-
-    rows=[]
-    EXCLUDED_REQ_ALL=set(); EXCLUDED_OPT_ALL=set()
-
-    for p in sorted(Path(SUBMIT_DIR).glob("**/*.ipynb")):
-        sid, name = extract_id_and_name(p)
-        try:
-            nb = nbformat.read(str(p), as_version=4)
-        except Exception as e:
-            rows.append([sid, name, p.name, 0.0, "ERROR", "ipynb 파싱 실패", "ERROR", f"노트북 파싱 실패: {e}"])
-            continue
-
-        stu_lmap = _label_map(nb)
-
-        req_missing=[]; req_mismatch=[]; opt_missing=[]
-        excluded_req=[]; excluded_opt=[]
-
-        # 필수
-        for lab in sorted(req_labels, key=_label_key_robust):
-            solcell = sol_lmap.get(lab, {}).get("cell")
-            sol_out = _cell_output_text(solcell) if solcell else ""
-            if not should_grade_label(sol_out):
-                excluded_req.append(f"#{lab}")
-                continue
-
-            sinfo = stu_lmap.get(lab)
-            stu_out = _cell_output_text(sinfo["cell"]) if sinfo else ""
-            executed = student_executed_for_grading(stu_out)
-            if not executed:
-                req_missing.append(f"#{lab}"); 
-                continue
-
-            if not outputs_equal_loose_text(stu_out, sol_out):
-                req_mismatch.append(f"#{lab}")
-
-        # 연습
-        for lab in sorted(opt_labels, key=_label_key_robust):
-            solcell = sol_lmap.get(lab, {}).get("cell")
-            sol_out = _cell_output_text(solcell) if solcell else ""
-            if not should_grade_label(sol_out):
-                excluded_opt.append(f"#{lab}")
-                continue
-
-            sinfo = stu_lmap.get(lab)
-            stu_out = _cell_output_text(sinfo["cell"]) if sinfo else ""
-            executed = student_executed_for_grading(stu_out)
-            if not executed:
-                opt_missing.append(f"#{lab}")
-
-        # 점수
-        score = base_score \
-              - ScorePolicy.REQUIRED_MISSING * len(req_missing) \
-              - ScorePolicy.REQUIRED_MISMATCH * len(req_mismatch) \
-              - ScorePolicy.OPTIONAL_MISSING * len(opt_missing)
-        score = float(max(0.0, min(100.0, round(score, 1))))
-
-        status = "OK" if (not req_missing and not req_mismatch) else "INCOMPLETE"
-        output_match = decide_output_match(status, len(req_missing), len(req_mismatch))
-        reason = "" if status=="OK" else "필수 미실행/불일치 존재"
-
-        fbl = []
-        if req_missing:  fbl.append(f"[필수 미실행 {len(req_missing)}개] 셀: " + ", ".join(req_missing))
-        if req_mismatch: fbl.append(f"[필수 출력 불일치 {len(req_mismatch)}개] 셀: " + ", ".join(req_mismatch))
-        if opt_missing:  fbl.append(f"[연습문제 미실행 {len(opt_missing)}개] 셀: " + ", ".join(opt_missing))
-
-        from autograder.policy import build_score_line
-        score_line = build_score_line(base_score, len(req_missing), len(req_mismatch), len(opt_missing), score)
-
-        feedback = ("\n".join(fbl)) if fbl else "정상 제출로 판단되었습니다. 수고했습니다!"
-        feedback = (feedback + ("\n" if feedback else "") + score_line).strip()
-
-        rows.append([sid, name, p.name, score, status, reason, output_match, feedback])
-
-        EXCLUDED_REQ_ALL.update(excluded_req)
-        EXCLUDED_OPT_ALL.update(excluded_opt)
-
-    df = pd.DataFrame(rows, columns=["student_id","student_name","file","score","status","reasons","output_match","feedback"])
+    EXEC_DIR = OUT_DIR / "executed" / RUN_TS
+    LAYOUT = build_output_layout(OUT_DIR, EXEC_DIR, RUN_TS)
+
+    if args is not None and args.execute:
+        execute = ExecConfig(
+            pool_size=args.exec_pool,
+            cell_timeout=args.cell_timeout,
+            notebook_timeout=args.notebook_timeout,
+            reuse_kernels=not args.no_kernel_reuse,
+            engine=args.exec_engine,
+            dependency_slice=args.exec_slice,
+            cell_cache_path=str(LAYOUT.exec_cache) if args.exec_cache else None,
+            cell_cache_max_mb=args.exec_cache_mb,
+        )
+    answer_exec = None
+    if args is not None and args.exec_answer:
+        answer_exec = ExecConfig(cell_timeout=args.cell_timeout, notebook_timeout=args.notebook_timeout)
+
+    # 템플릿 태깅 (노트북 Step 2/3과 동일, 템플릿/정답이 그대로면 저장된 채점 계획 사용)
+    TAGGED_TEMP_PATH = OUT_DIR / "tagged_template.ipynb"
+    TAG_AUDIT_PATH   = OUT_DIR / "tag_audit.csv"
+    plan, _fresh = load_grading_plan(TEMPLATE_PATH, ANSWER_PATH, TAGGED_TEMP_PATH, TAG_AUDIT_PATH, LAYOUT.grading_plan)
+    req_labels, opt_labels, _req_idx, _opt_idx, template_fp, _req_map, _opt_map = plan.unpack()
+
+    # 보관된 기수 제출 폴더 → 인덱스 (이미 들어 있는 파일은 건너뜀)
+    for d in index_cohorts:
+        d = Path(d)
+        n = index_submit_dir(index_path, d.parent.name, d, template_fp,
+                             skip_names=(TEMPLATE_PATH.name, ANSWER_PATH.name, TAGGED_TEMP_PATH.name))
+        print(f"인덱스 추가: {d.parent.name} {n}건 ({index_path})")
+
+    # 채점
+    memo = ComparisonMemo()
+    (
+        df, fps, _eps, sid2file, sid2name, _sid2path,
+        _today_rows, EXCLUDED_REQ_ALL, EXCLUDED_OPT_ALL,
+    ) = grade_submissions(
+        submit_paths=sorted(SUBMIT_DIR.rglob("*.ipynb")),
+        template_path=TEMPLATE_PATH,
+        answer_path=ANSWER_PATH,
+        tagged_template_path=TAGGED_TEMP_PATH,
+        req_labels=req_labels,
+        opt_labels=opt_labels,
+        template_fingerprint=template_fp,
+        template_sim_threshold=DEFAULT_TEMPLATE_SIM_THRESHOLD,
+        cache_path=LAYOUT.grade_cache,
+        jobs=jobs,
+        execute=execute,
+        exec_dir=EXEC_DIR,
+        answer_exec=answer_exec,
+        answer_exec_dir=LAYOUT.answer_exec_dir,
+        compact=compact,
+        tolerances=parse_tolerances(cfg["tolerance"]),
+        memo=memo,
+        output_max_chars=cfg["output_max_chars"] or OUTPUT_MAX_CHARS,
+        image_cache_path=LAYOUT.image_hash,
+        normalizers=parse_normalizers(cfg["normalize"]),
+    )
 
     # 저장
-    summary_latest = Path(OUT_DIR) / "summary_static_with_name_latest.csv"
-    df.to_csv(summary_latest, index=False, encoding="utf-8-sig")
+    df.to_csv(LAYOUT.summary_ts, index=False, encoding="utf-8-sig")
+    df.to_csv(LAYOUT.summary_latest, index=False, encoding="utf-8-sig")
+
+    # 교차 기수 유사도 (인덱스 조회 후 현재 기수 추가)
+    if cross_cohort:
+        df_cross = cross_cohort_check(index_path, SUBMIT_DIR.parent.name, fps, sid2file, sid2name,
+                                      template_fp=template_fp)
+        if not df_cross.empty:
+            df_cross.to_csv(LAYOUT.cross_ts, index=False, encoding="utf-8-sig")
+            df_cross.to_csv(LAYOUT.cross_latest, index=False, encoding="utf-8-sig")
+        print(f"교차 기수 일치: {len(df_cross)}건 ({index_path})")
 
     # 통계/로그
     STATS_BLOCK = build_stats_block(df)
@@ -133,13 +126,42 @@ def main(session: int, env: str, toml_path: str):
     print(f"Policy version: {policy_version}")
     print("\n".join(["📊 Score & Distribution Summary", *STATS_BLOCK]))
     print(f"채점 제외(정답 출력 없음): 필수=[{excl_req_str}], 연습=[{excl_opt_str}]")
-    print("Saved:", summary_latest)
+    n_out = memo.distinct_outputs()
+    print("라벨별 서로 다른 출력 수: " + ", ".join(f"#{lab}={n_out[lab]}" for lab in sorted(n_out, key=_label_key_robust)))
+    print("Saved:", LAYOUT.summary_latest)
 
 
-if __name__ == "__main__":
+def _parse_args(argv=None):
     ap = argparse.ArgumentParser()
     ap.add_argument("--session", type=int, required=True)
     ap.add_argument("--env", type=str, choices=["DEV","PROD"], required=True)
-    ap.add_argument("--config", type=str, default="autograder/config/sessions.toml")
-    args = ap.parse_args()
-    main(args.session, args.env, args.config)
+    ap.add_argument("--config", type=str, default=DEFAULT_CONFIG)
+    ap.add_argument("--jobs", type=int, default=1,
+                    help="채점 프로세스 수 (1=순차, 0=CPU 코어 수)")
+    ap.add_argument("--execute", action="store_true",
+                    help="제출물을 커널 풀에서 재실행한 출력으로 채점")
+    ap.add_argument("--exec-pool", type=int, default=0, help="커널 수 (0=CPU 코어 수)")
+    ap.add_argument("--cell-timeout", type=int, default=60, help="셀 타임아웃(초)")
+    ap.add_argument("--notebook-timeout", type=int, default=600, help="노트북 타임아웃(초)")
+    ap.add_argument("--no-kernel-reuse", action="store_true",
+                    help="노트북마다 커널 재시작 (기본: %%reset 후 재사용)")
+    ap.add_argument("--exec-engine", choices=["kernel", "fork"], default="kernel",
+                    help="fork: 템플릿 준비 셀을 한 번만 실행하고 학생마다 fork (Linux)")
+    ap.add_argument("--exec-slice", action="store_true",
+                    help="채점 라벨 셀과 그 셀이 의존하는 셀만 실행")
+    ap.add_argument("--exec-cache", action="store_true",
+                    help="셀 실행 결과 캐시 사용 (OUT_DIR/exec_cache.sqlite)")
+    ap.add_argument("--exec-cache-mb", type=int, default=512, help="셀 캐시 최대 크기(MB)")
+    ap.add_argument("--exec-answer", action="store_true",
+                    help="정답 노트북을 현재 환경에서 재실행한 출력으로 채점 (환경별 1회, 캐시)")
+    ap.add_argument("--compact", action="store_true",
+                    help="fingerprint 압축 보관, summary finger_print 열은 digest (대형 클래스 메모리 절약)")
+    ap.add_argument("--cross-cohort", action="store_true",
+                    help="세션 유사도 인덱스(SIM_INDEX_PATH)의 이전 기수와 비교 후 현재 기수 추가")
+    ap.add_argument("--index-cohort", action="append", metavar="SUBMIT_DIR",
+                    help="보관된 기수 제출 폴더를 SIM_INDEX_PATH 에 추가 (기수 이름 = 상위 폴더 이름, 여러 번 지정 가능)")
+    return ap.parse_args(argv)
+
+
+if __name__ == "__main__":
+    main()
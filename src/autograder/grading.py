@@ -1,10 +1,12 @@
 # src/autograder/grading.py
 from __future__ import annotations
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable, Dict, List, Tuple
+from typing import Iterable, Dict, List, Optional, Tuple
 import nbformat
 import pandas as pd
-import re
 
 from .policy import (
     BASE_SCORE,
@@ -12,29 +14,37 @@ from .policy import (
     PENALTY_REQUIRED_MISMATCH,
     PENALTY_OPTIONAL_MISS,
     outputs_equal,
+    tokenize_output,
+    tokens_match,
+    OutputTokens,
+    Tolerance,
+    NumericOutput,
+    numeric_output,
+    outputs_close,
+    tolerance_for,
     decide_status_and_match,
+    DEFAULT_IMAGE_MAX_DISTANCE,
 )
-from .nb_utils import _label_map, _nb_fingerprint, _cell_output_text, _nb_exec_pattern
-from .io_utils import now_kst, mtime_kst, extract_id_and_name
-
-# summary normalizer for statsmodels (Date/Time line remover)
-# 전역 스위치: 기본 ON, 필요시 False로 바꿔도 됨
+from .nb_utils import (
+    _label_map, load_notebook_fast, scan_notebook, get_more_impact_352, TemplateMatcher,
+    cell_output, OutputText, OUTPUT_MAX_CHARS,
+)
+from .io_utils import now_kst, mtime_kst, extract_id_and_name, _id_and_name_from_filename
+from .result_cache import ResultCache, content_digest, entry_key, grading_version
+from .execution import ExecConfig, execute_submissions, execute_answer, build_exec_report_df
+from .paths import EXEC_REPORT_NAME
+from .records import CompressedTexts, cache_entry, summary_row
+from .output_memo import ComparisonMemo, output_digest
+from .normalizers import NormalizerPlan, OutputNormalizer, DEFAULT_NORMALIZERS
+from . import image_hash
+from .image_hash import ImageHashCache, images_match
+
+# 출력 정규화 (normalizers.py 레지스트리, 세션/라벨별 [session_N.NORMALIZE])
+# 전역 스위치: 세션 설정이 없을 때 statsmodels Date/Time 제거(datetime)를 기본 적용. 필요시 False로 바꿔도 됨
 NORMALIZE_DATETIME_DEFAULT = True
 
-_DATE_TIME_PATTERNS = [
-    r"Date:\s+[A-Za-z]{3},\s+\d{1,2}\s+[A-Za-z]{3}\s+\d{4}",
-    r"Time:\s*\d{2}:\d{2}:\d{2}",
-]
-_NORMALIZER_RE = re.compile("|".join(_DATE_TIME_PATTERNS),flags=re.MULTILINE)
-
-def _normalize_summary_text(s: str) -> str:
-    if not isinstance(s, str):
-        return s
-    s = _NORMALIZER_RE.sub("", s)
-    return s.strip()
-
-def _maybe_normalize(s: str, enable: bool = NORMALIZE_DATETIME_DEFAULT) -> str:
-    return _normalize_summary_text(s) if enable else s
+def _default_normalizer_plan() -> NormalizerPlan:
+    return NormalizerPlan(default=DEFAULT_NORMALIZERS if NORMALIZE_DATETIME_DEFAULT else ())
 
 
 
@@ -46,29 +56,331 @@ def _label_key(x: str) -> List[int]:
         return [999999]
 
 
-def _exec_and_out_expected(stu_map: dict, ans_map: dict, lab: str) -> Tuple[bool, str, bool]:
+@dataclass(frozen=True)
+class AnswerKey:
+    """
+    정답 노트북을 한 번만 분석해 둔 채점 키 (모든 학생이 공유).
+      - expected  : 라벨 → 정규화(라벨별 정규화기)된 정답 출력
+      - has_output: 라벨 → 정답 셀 출력 유무 (False면 채점 제외)
+      - req_order/opt_order: 채점 순서(_label_key 정렬)
+      - excluded_req/excluded_opt: 정답 출력이 없어 제외되는 라벨("#1.2" 형식, 채점 순서)
+      - expected_tokens: 라벨 → 미리 토큰화한 정답 출력 (학생마다 다시 토큰화하지 않음)
+      - expected_numeric: 허용오차가 지정된 라벨 → (숫자 배열, 허용오차). 숫자를 못 뽑은 라벨은 없음(텍스트 규칙)
+      - expected_digest: 출력이 max_chars 를 넘는 라벨 → 정규화 전체 출력 해시 (expected 는 앞/뒤 일부만)
+      - max_chars: 출력 비교 상한 (넘는 출력은 해시로만 비교)
+      - expected_images: 정답 출력에 image/png 가 있는 라벨 → dHash 목록 (이미지 비교를 하지 않으면 비어 있음)
+      - image_max_distance: 이미지 해밍 거리 상한
+      - normalizers: 라벨 → 컴파일된 출력 정규화기 (정답/학생 출력에 같은 것을 1회 적용)
+    """
+    expected: Dict[str, str]
+    has_output: Dict[str, bool]
+    req_order: Tuple[str, ...]
+    opt_order: Tuple[str, ...]
+    excluded_req: Tuple[str, ...]
+    excluded_opt: Tuple[str, ...]
+    expected_tokens: Dict[str, OutputTokens]
+    expected_numeric: Dict[str, Tuple[NumericOutput, Tolerance]]
+    expected_digest: Dict[str, str]
+    max_chars: int
+    expected_images: Dict[str, Tuple[str, ...]]
+    image_max_distance: Optional[int]
+    normalizers: Dict[str, OutputNormalizer]
+
+
+def build_answer_key(ans, req_labels: Iterable[str], opt_labels: Iterable[str],
+                     tolerances: Optional[Dict[str, Tolerance]] = None,
+                     max_chars: int = OUTPUT_MAX_CHARS,
+                     images: Optional[ImageHashCache] = None,
+                     image_max_distance: Optional[int] = None,
+                     normalizers: Optional[NormalizerPlan] = None) -> AnswerKey:
+    """
+    정답 노트북 + 태깅 라벨 (+ 라벨별 숫자 허용오차, 출력 비교 상한, 출력 정규화기) → AnswerKey.
+    images/image_max_distance 를 주면 정답 셀 image/png 출력의 해시도 미리 계산.
+    """
+    plan = normalizers if normalizers is not None else _default_normalizer_plan()
+    ans_lmap = _label_map(ans)
+    req_order = tuple(sorted(req_labels, key=_label_key))
+    opt_order = tuple(sorted(opt_labels, key=_label_key))
+
+    expected: Dict[str, str] = {}
+    has_output: Dict[str, bool] = {}
+    expected_digest: Dict[str, str] = {}
+    expected_images: Dict[str, Tuple[str, ...]] = {}
+    norms = {lab: plan.for_label(lab) for lab in (*req_order, *opt_order)}
+    for lab in (*req_order, *opt_order):
+        anscell = ans_lmap.get(lab, {}).get("cell")
+        if images is not None and image_max_distance is not None and anscell:
+            hs = images.cell_hashes(anscell)
+            if hs:
+                expected_images[lab] = hs
+        ans_out = cell_output(anscell, max_chars) if anscell else OutputText("", "", 0, False)
+        has_output[lab] = bool(ans_out.text)
+        expected[lab] = norms[lab].apply(ans_out.text)
+        if ans_out.truncated:
+            expected_digest[lab] = ans_out.digest
+
+    return AnswerKey(
+        expected=expected,
+        has_output=has_output,
+        req_order=req_order,
+        opt_order=opt_order,
+        excluded_req=tuple(f"#{lab}" for lab in req_order if not has_output[lab]),
+        excluded_opt=tuple(f"#{lab}" for lab in opt_order if not has_output[lab]),
+        expected_tokens={lab: tokenize_output(out) for lab, out in expected.items()},
+        expected_numeric=_numeric_expected(
+            {lab: out for lab, out in expected.items() if lab not in expected_digest}, tolerances or {}),
+        expected_digest=expected_digest,
+        max_chars=max_chars,
+        expected_images=expected_images,
+        image_max_distance=image_max_distance if expected_images else None,
+        normalizers=norms,
+    )
+
+
+def _numeric_expected(expected: Dict[str, str], tolerances: Dict[str, Tolerance]) -> Dict[str, Tuple[NumericOutput, Tolerance]]:
+    out = {}
+    for lab, text in expected.items():
+        tol = tolerance_for(tolerances, lab)
+        num = numeric_output(text) if tol is not None else None
+        if num is not None:
+            out[lab] = (num, tol)
+    return out
+
+
+def _output_matches(answer_key: AnswerKey, lab: str, stu_out: str) -> bool:
+    """텍스트 규칙(숫자 완전일치)으로 같으면 통과, 허용오차 라벨은 숫자 배열 비교까지."""
+    if lab in answer_key.expected_digest:
+        return False   # 정답이 대형 출력인데 학생 출력은 상한 이하 → 같을 수 없음
+    if tokens_match(answer_key.expected_tokens[lab], stu_out):
+        return True
+    num = answer_key.expected_numeric.get(lab)
+    return num is not None and outputs_close(num[0], stu_out, num[1])
+
+
+def _compare_label(answer_key: AnswerKey, memo: ComparisonMemo, lab: str,
+                   stu_out: OutputText, stu_images: Tuple[str, ...]) -> Tuple[str, bool]:
+    """
+    필수 라벨 1개 판정 → (메모 키 digest, 일치 여부)
+      - 대형 출력: 정규화 전체 해시끼리만 비교
+      - 정답에 이미지가 있으면 텍스트 일치 + 이미지 해밍 거리까지 (메모 키에 이미지 해시 포함)
+    """
+    if stu_out.truncated:
+        text, dg = "", stu_out.digest
+        same_text = lambda: answer_key.expected_digest.get(lab) == stu_out.digest
+    else:
+        text = answer_key.normalizers[lab].apply(stu_out.text)
+        dg = output_digest(text)
+        same_text = lambda: _output_matches(answer_key, lab, text)
+    exp_images = answer_key.expected_images.get(lab)
+    if exp_images is not None:
+        dg += ":" + ",".join(stu_images)
+    return memo.compare(
+        lab, text,
+        lambda _out: same_text() and (exp_images is None
+                                      or images_match(exp_images, stu_images, answer_key.image_max_distance)),
+        digest=dg,
+    )
+
+
+def _report_answer_changes(saved_path: Path, executed_path: Path,
+                           req_labels: Iterable[str], opt_labels: Iterable[str],
+                           normalizers: Optional[NormalizerPlan] = None) -> None:
+    """정답 재실행 직후 1회: 저장된 정답 출력과 달라진 라벨을 알려준다."""
+    old = build_answer_key(load_notebook_fast(saved_path), req_labels, opt_labels, normalizers=normalizers)
+    new = build_answer_key(load_notebook_fast(executed_path), req_labels, opt_labels, normalizers=normalizers)
+    changed = [f"#{lab}" for lab in (*new.req_order, *new.opt_order)
+               if old.expected_digest.get(lab) != new.expected_digest.get(lab)
+               or not outputs_equal(old.expected[lab], new.expected[lab])]
+    print(f"정답 재실행 완료: {executed_path.name}"
+          + (f" (저장된 출력과 다른 라벨: {', '.join(changed)})" if changed else " (저장된 출력과 동일)"))
+
+
+def _exec_and_out_expected(stu_map: dict, answer_key: AnswerKey, lab: str) -> Tuple[bool, OutputText, bool]:
     """
     expected_output: 정답 셀 출력 유무(True/False)
       - True  → 학생 출력이 있어야 '실행' 인정
       - False → 채점 제외(정보만 반환)
-    Returns: (executed, stu_out_text, expected_output)
+    Returns: (executed, stu_out, expected_output) — stu_out: 정규화 출력 (대형이면 해시 + 앞/뒤 일부)
     """
     sinfo = stu_map.get(lab)
-    anscell = ans_map.get(lab, {}).get("cell")
-    ans_out = _cell_output_text(anscell) if anscell else ""
-    expected_output = bool(ans_out)
+    expected_output = answer_key.has_output.get(lab, False)
 
     if not sinfo:
-        return False, "", expected_output
+        return False, OutputText("", "", 0, False), expected_output
 
     scell = sinfo["cell"]
-    stu_out = _cell_output_text(scell)
-    executed = bool(stu_out) if expected_output else (
-        bool(stu_out) or (scell.get("execution_count") not in (None, 0))
+    stu_out = cell_output(scell, answer_key.max_chars)
+    executed = bool(stu_out.text) if expected_output else (
+        bool(stu_out.text) or (scell.get("execution_count") not in (None, 0))
     )
     return executed, stu_out, expected_output
 
 
+_MATCHERS: Dict[Tuple[str, float], TemplateMatcher] = {}
+
+
+def _template_matcher(template_fp: str, threshold: float) -> TemplateMatcher:
+    """프로세스마다 템플릿별 매처 1개 (템플릿 색인 재사용)."""
+    key = (template_fp, threshold)
+    if key not in _MATCHERS:
+        _MATCHERS.clear()
+        _MATCHERS[key] = TemplateMatcher(template_fp, threshold)
+    return _MATCHERS[key]
+
+
+def _grade_one(
+    p: Path,
+    answer_key: AnswerKey,
+    template_fingerprint: dict,
+    template_sim_threshold: float,
+    exec_path: Optional[Path] = None,
+    memo: Optional[ComparisonMemo] = None,
+    images: Optional[ImageHashCache] = None,
+) -> dict:
+    """
+    제출물 1개 채점. 결과는 그대로 캐시에 저장할 수 있는 dict로 반환.
+    exec_path: 재실행본 경로. 주어지면 라벨 출력은 실행본에서, 나머지(이름/fingerprint/exec pattern)는 원본에서.
+      - row: summary 행
+      - fp/ep: fingerprint / exec pattern (파싱 실패 시 None)
+      - graded: 라벨 채점까지 진행했는지(ZERO/ERROR면 False) → EXCLUDED_* 집계 여부
+      - outputs: 비교한 필수 라벨 → [정규화 출력 digest, 일치 여부] (라벨별 출력 군집 집계용)
+    memo: 라벨별 출력 비교 메모 (같은 출력은 다시 비교하지 않음)
+    images: image/png 해시 캐시 (정답에 이미지가 있는 라벨만 학생 이미지 해시 계산)
+    """
+    result = {"fp": None, "ep": None, "graded": False, "excluded_req": [], "excluded_opt": [], "outputs": {}}
+    if memo is None:
+        memo = ComparisonMemo()
+
+    # 노트북 로드 (검증 생략 빠른 로더, 필요 시 nbformat 폴백)
+    try:
+        nb = load_notebook_fast(p)
+    except Exception as e:
+        sid, name = extract_id_and_name(p, read_notebook=False)
+        result["sid"], result["name"] = sid, name
+        result["row"] = [sid, name, p.name, 0.0, "ERROR", "ipynb 파싱 실패", "ERROR", f"노트북 파싱 실패: {e}",0,"","",""]#@jennie 20251118 label352
+        return result
+
+    # 셀 단일 패스: 라벨 맵 + fingerprint + exec pattern (+ 파일명에 이름이 없으면 이름 후보)
+    scan = scan_notebook(nb, find_name=not _id_and_name_from_filename(p)[1])
+    sid, name = extract_id_and_name(p, scan=scan)
+    result["sid"], result["name"] = sid, name
+
+    # 템플릿 유사도(원본/무변경 → 0점)
+    fp, ep = scan.fingerprint, scan.exec_pattern
+    result["fp"], result["ep"] = fp, ep
+
+    # ================================================================
+    # [Course-Specific Custom Logic / Example Code]
+    # 이 코드는 KHCU MR24 11차시 과제(#3.5.2) 전용 커스터마이징 예제입니다.
+    # AutoGrader 엔진의 핵심 기능이 아니라, 개별 수업 요구사항에 맞도록
+    # 라벨 기반으로 특정 변수 값을 추출하는 '샘플 구현' 용도입니다.
+    # 향후 다른 과제/강의에서는 이 패턴을 참고해 수정하여 사용하십시오.
+    # @jennie 20251118 label352 (as remark foot print)
+    # ================================================================
+    lab352 = get_more_impact_352(nb, lmap=scan.label_map)
+    #---------------
+
+    from_sim_template = False
+    try:
+        from_sim_template = (template_fingerprint is not None)
+    except Exception:
+        pass
+
+    if from_sim_template and template_fingerprint and template_sim_threshold is not None:
+        # 템플릿과 유사한 경우 0점 처리
+        # (이 조건은 이전 노트북 로직과 동일)
+        if _template_matcher(template_fingerprint, template_sim_threshold).is_unchanged(fp):
+            result["row"] = [
+                sid, name, p.name, 0.0, "ZERO",
+                "템플릿과 거의 동일(원본/무변경)", "ZERO",
+                "템플릿과 거의 동일하여 0점 처리되었습니다." ,len(fp or""),fp,ep, lab352
+            ]  #@jennie 20251118
+            return result
+
+    # 라벨 맵 (정답 쪽은 AnswerKey에 이미 계산되어 있음)
+    stu_lmap = scan.label_map
+    if exec_path is not None:
+        try:
+            stu_lmap = _label_map(load_notebook_fast(exec_path))
+        except Exception:
+            pass  # 실행본을 읽지 못하면 저장된 출력으로 채점
+
+    # 채점: 필수/옵션 (정답 출력 없는 라벨은 answer_key.excluded_* 로 제외)
+    req_missing, req_mismatch, opt_missing = [], [], []
+
+    # 1) 필수
+    for lab in answer_key.req_order:
+        if not answer_key.has_output[lab]:
+            continue
+        executed, stu_out, _expected = _exec_and_out_expected(stu_lmap, answer_key, lab)
+        if not executed:
+            req_missing.append(f"#{lab}")
+            continue
+
+        stu_images = ()
+        if lab in answer_key.expected_images and images is not None:
+            stu_images = images.cell_hashes(stu_lmap[lab]["cell"])
+        dg, ok = _compare_label(answer_key, memo, lab, stu_out, stu_images)
+        result["outputs"][lab] = [dg, ok]
+        if not ok:
+            req_mismatch.append(f"#{lab}")
+
+    # 2) 옵션
+    for lab in answer_key.opt_order:
+        if not answer_key.has_output[lab]:
+            continue
+        executed, _stu_out, _expected = _exec_and_out_expected(stu_lmap, answer_key, lab)
+        if not executed:
+            opt_missing.append(f"#{lab}")
+
+    # 점수 계산
+    score = (
+        BASE_SCORE
+        - PENALTY_REQUIRED_MISS * len(req_missing)
+        - PENALTY_REQUIRED_MISMATCH * len(req_mismatch)
+        - PENALTY_OPTIONAL_MISS * len(opt_missing)
+    )
+
+    # 상태/피드백
+    status, output_match = decide_status_and_match(req_missing, req_mismatch)
+    reason = "" if status == "OK" else "필수 미실행/불일치 존재"
+
+    parts: List[str] = []
+    if req_missing:
+        parts.append(f"[필수 미실행 {len(req_missing)}개] 셀: {', '.join(req_missing)}")
+    if req_mismatch:
+        parts.append(f"[필수 출력 불일치 {len(req_mismatch)}개] 셀: {', '.join(req_mismatch)}")
+    if opt_missing:
+        parts.append(f"[연습 미실행 {len(opt_missing)}개] 셀: {', '.join(opt_missing)}")
+
+    score_line = (
+        f"(채점) base={BASE_SCORE}"
+        f"{' − ' + str(PENALTY_REQUIRED_MISS)    + '×' + str(len(req_missing))  + '(필수 미실행)' if req_missing else ''}"
+        f"{' − ' + str(PENALTY_REQUIRED_MISMATCH)+ '×' + str(len(req_mismatch)) + '(필수 불일치)' if req_mismatch else ''}"
+        f"{' − ' + str(PENALTY_OPTIONAL_MISS)    + '×' + str(len(opt_missing))  + '(연습 미실행)' if opt_missing else ''}"
+        f" = {score}"
+    )
+
+    feedback = ("\n".join(parts) if parts else "정상 제출로 판단되었습니다. 수고했습니다!") + f"\n{score_line}"
+    result["row"] = [sid, name, p.name, score, status, reason, output_match, feedback.strip(), len(fp or ""), fp, ep, lab352] #@jennie 20251118 label352
+    result["graded"] = True
+    result["excluded_req"], result["excluded_opt"] = list(answer_key.excluded_req), list(answer_key.excluded_opt)
+    return result
+
+
+# ---- 병렬 채점(프로세스 풀)
+# 워커마다 AnswerKey 등 공통 인자를 한 번만 받아 두고, 작업마다 (경로, 실행본 경로)만 전달
+_WORKER_ARGS: dict = {}
+
+def _init_worker(common: dict) -> None:
+    global _WORKER_ARGS
+    _WORKER_ARGS = common
+
+def _grade_task(task: Tuple[Path, Optional[Path]]) -> dict:
+    p, exec_path = task
+    return _grade_one(p, exec_path=exec_path, **_WORKER_ARGS)
+
+
 def grade_submissions(
     submit_paths: Iterable[Path],
     template_path: Path,
@@ -78,6 +390,19 @@ def grade_submissions(
     opt_labels: List[str],
     template_fingerprint: dict,
     template_sim_threshold: float = 0.98,
+    cache_path: Optional[Path] = None,
+    jobs: int = 1,
+    execute: Optional[ExecConfig] = None,
+    exec_dir: Optional[Path] = None,
+    answer_exec: Optional[ExecConfig] = None,
+    answer_exec_dir: Optional[Path] = None,
+    compact: bool = False,
+    tolerances: Optional[Dict[str, Tolerance]] = None,
+    memo: Optional[ComparisonMemo] = None,
+    output_max_chars: int = OUTPUT_MAX_CHARS,
+    image_cache_path: Optional[Path] = None,
+    image_max_distance: Optional[int] = DEFAULT_IMAGE_MAX_DISTANCE,
+    normalizers: Optional[NormalizerPlan] = None,
 ) -> Tuple[
     pd.DataFrame,                 # summary_df
     Dict[str, dict],              # fps
@@ -90,161 +415,155 @@ def grade_submissions(
 ]:
     """
     제출물 전체 채점. (이전 Step5 로직을 함수화)
+
+    cache_path: 채점 결과 캐시 파일(예: LAYOUT.grade_cache). 지정하면
+      내용이 바뀌지 않은 제출물은 파싱/채점 없이 캐시된 결과를 그대로 사용.
+    jobs: 채점 프로세스 수(1=순차, 0 이하=CPU 코어 수). 결과 순서/집계는 순차 실행과 동일.
+    execute/exec_dir: ExecConfig를 주면 채점할 제출물을 커널 풀에서 재실행하고
+      (실행본: exec_dir, 실행 리포트: exec_dir/exec_report.csv) 저장된 출력 대신 새 출력으로 채점.
+      ExecConfig(engine="fork")면 템플릿 준비 셀 스냅샷에서 fork 실행 (Linux).
+      ExecConfig(dependency_slice=True)면 정답 출력이 있는 라벨 셀과 그 의존 셀만 실행.
+    answer_exec/answer_exec_dir: ExecConfig를 주면 정답 노트북을 현재 환경에서 재실행한 출력을 정답으로 사용.
+      (정답 파일 해시 + 설치 패키지 버전별로 answer_exec_dir 에 캐시 → 환경이 같으면 재실행 안 함)
+    compact: True 면 fps/eps 를 zlib 압축 매핑(records.CompressedTexts)으로 돌려주고,
+      summary_df 의 finger_print 열에는 코드 원문 대신 digest(sha256 앞 16자)를 넣는다
+      → 코드 원문이 학생 수만큼 메모리에 남지 않음 (fp_length 는 그대로, 유사도 계산은 그대로 가능)
+    tolerances: 라벨별 숫자 허용오차 (policy.parse_tolerances, sessions.toml [session_N.TOLERANCE]).
+      지정된 라벨은 텍스트 규칙으로 다르면 숫자 표/배열을 np.allclose 로 다시 비교.
+    memo: 라벨별 출력 비교 메모(output_memo.ComparisonMemo). 넘기면 채점 후
+      memo.distinct_outputs() / memo.label_summary_df() 로 라벨별 서로 다른 출력 수를 볼 수 있음.
+      (캐시된 제출물 포함 전체 집계, 채점 버전이 바뀌면 자동으로 비움)
+    output_max_chars: 셀 출력 비교 상한 (sessions.toml [session_N] OUTPUT_MAX_CHARS).
+      정규화 출력이 이보다 긴 라벨은 스트리밍 해시로만 비교 (날짜 정규화/허용오차 미적용).
+    image_cache_path/image_max_distance: 정답 셀에 image/png 출력이 있는 필수 라벨은 학생 이미지의
+      dHash 해밍 거리 ≤ image_max_distance 까지 맞아야 일치 (image_hash.py, 해시 캐시: image_cache_path).
+      None 또는 Pillow 미설치 → 이미지는 "[image/png]" 자리표시로만 비교 (기존 동작).
+    normalizers: 라벨별 출력 정규화기 (normalizers.parse_normalizers, sessions.toml [session_N.NORMALIZE]).
+      None 이면 NORMALIZE_DATETIME_DEFAULT 에 따라 datetime 만.
     """
+    normalizers = normalizers if normalizers is not None else _default_normalizer_plan()
+    submit_paths = list(submit_paths)
 
  
     rows: List[list] = []
     today_rows_tmp: List[list] = []
-    fps: Dict[str, dict] = {}
-    eps : Dict [str, dict] ={}
+    fps: Dict[str, dict] = CompressedTexts() if compact else {}
+    eps : Dict [str, dict] = CompressedTexts() if compact else {}
     sid2file: Dict[str, str] = {}
     sid2name: Dict[str, str] = {}
     sid2path: Dict[str, Path] = {}
-    sid2_more_impact_352: Dict [str,str] ={}    # @jennie 20251118 label352
     EXCLUDED_REQ_ALL, EXCLUDED_OPT_ALL = set(), set()
 
     # 템플릿/정답/태깅본 제외
     skip_names = {template_path.name, answer_path.name, tagged_template_path.name}
 
-    # 정답/태깅본 로드
-    ans = nbformat.read(answer_path, as_version=4)
+    # 정답 로드 → 채점 키는 런당 한 번만 생성
+    answer_src = Path(answer_path)
+    if answer_exec is not None:
+        if answer_exec_dir is None:
+            raise ValueError("answer_exec 사용 시 answer_exec_dir 가 필요합니다.")
+        answer_src, fresh = execute_answer(answer_path, answer_exec_dir, answer_exec)
+        if fresh:
+            _report_answer_changes(answer_path, answer_src, req_labels, opt_labels, normalizers)
+    ans_bytes = answer_src.read_bytes()
+    ans = nbformat.reads(ans_bytes.decode("utf-8"), as_version=4)
+    images = (ImageHashCache(image_cache_path)
+              if image_max_distance is not None and image_hash.available() else None)
+    answer_key = build_answer_key(ans, req_labels, opt_labels, tolerances, output_max_chars,
+                                  images, image_max_distance, normalizers)
+
+    version = grading_version(
+        content_digest(ans_bytes), req_labels, opt_labels,
+        template_fingerprint, template_sim_threshold,
+        mode=(execute.cache_tag(p.parent for p in submit_paths if p.name not in skip_names)
+              if execute is not None else "static"),
+        tolerances=tolerances,
+        output_max_chars=output_max_chars,
+        image_max_distance=answer_key.image_max_distance,
+        normalizers=normalizers.describe(),
+    )
+    cache = ResultCache(cache_path, version)
+    memo = (memo if memo is not None else ComparisonMemo()).bind(version)
 
+    # 1) 캐시 조회 → 채점이 필요한 제출물만 추림 (제출 순서 유지)
+    entries: List[list] = []     # [p, key, res]
+    todo: List[int] = []
     for p in submit_paths:
         if p.name in skip_names:
             continue
 
-        sid, name = extract_id_and_name(p)
-        sid2name[sid], sid2path[sid] = name, p
-
-        # 노트북 로드
         try:
-            nb = nbformat.read(p, as_version=4)
-        except Exception as e:
-            row = [sid, name, p.name, 0.0, "ERROR", "ipynb 파싱 실패", "ERROR", f"노트북 파싱 실패: {e}",0,"","",""]#@jennie 20251118 label352
+            key = entry_key(p.name, content_digest(p.read_bytes()))
+        except Exception:
+            key = None  # 읽기 실패 → 캐시 없이 채점(ERROR 행)
+        res = cache.get(key) if key is not None else None
+
+        if res is None:
+            todo.append(len(entries))
+        else:
+            memo.seed(res.get("outputs"))   # 캐시된 판정 → 새 제출물의 같은 출력은 비교 생략
+        entries.append([p, key, res])
+
+    # 2) (선택) 재실행 → 실행본 경로
+    todo_paths = [entries[i][0] for i in todo]
+    exec_paths: List[Optional[Path]] = [None] * len(todo_paths)
+    if execute is not None and todo_paths:
+        if exec_dir is None:
+            raise ValueError("execute 사용 시 exec_dir 가 필요합니다.")
+        exec_results = execute_submissions(
+            todo_paths, exec_dir, execute, template_path=template_path,
+            labels=[lab for lab in (*answer_key.req_order, *answer_key.opt_order) if answer_key.has_output[lab]],
+        )
+        exec_paths = [Path(r.executed_file) if r.executed_file else None for r in exec_results]
+        build_exec_report_df(exec_results).to_csv(
+            Path(exec_dir) / EXEC_REPORT_NAME, index=False, encoding="utf-8-sig")
+
+    # 3) 채점 (순차 또는 프로세스 풀) — 결과는 아래 병합 루프가 제출 순서대로 하나씩 받아 간다
+    common = dict(answer_key=answer_key, template_fingerprint=template_fingerprint,
+                  template_sim_threshold=template_sim_threshold, memo=memo, images=images)
+    # 파일 내용은 들고 있지 않고 채점 시 다시 읽음(대형 클래스 첫 런에서 메모리 폭증 방지)
+    tasks = list(zip(todo_paths, exec_paths))
+    n_jobs = (os.cpu_count() or 1) if jobs is None or jobs <= 0 else jobs
+    ex = None
+    if n_jobs > 1 and len(tasks) > 1:
+        n_jobs = min(n_jobs, len(tasks))
+        ex = ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_worker, initargs=(common,))
+        graded = ex.map(_grade_task, tasks, chunksize=max(1, len(tasks) // (n_jobs * 4)))
+    else:
+        graded = (_grade_one(p, exec_path=e, **common) for p, e in tasks)
+
+    # 4) 제출 순서대로 병합: 새 결과는 도착하는 즉시 캐시 항목(fp/ep 원문 1벌)과 요약 행으로 나눠 담고
+    #    결과 dict 는 버린다 (전체 결과 목록을 들고 있지 않음)
+    try:
+        for k, (p, key, res) in enumerate(entries):
+            entries[k] = None
+            if res is None:   # 1) 에서 캐시에 없던 제출물 = todo 순서 그대로
+                res = next(graded)
+                if key is not None:
+                    cache.put(key, cache_entry(res))
+            sid = res["sid"]
+            row = summary_row(res, compact=compact)
+            sid2name[sid], sid2path[sid] = res["name"], p
+            if res["fp"] is not None:
+                fps[sid], eps[sid], sid2file[sid] = res["fp"], res["ep"], p.name
             rows.append(row)
+            memo.record(res.get("outputs"))
+
             try:
                 if mtime_kst(p).date() == now_kst().date():
                     today_rows_tmp.append(row)
             except Exception:
                 pass
-            continue
-
-        # 템플릿 유사도(원본/무변경 → 0점)
-        fp = _nb_fingerprint(nb)
-        ep = _nb_exec_pattern(nb)
-        fps[sid],eps[sid], sid2file[sid] = fp,ep, p.name
-
-        # ================================================================
-        # [Course-Specific Custom Logic / Example Code]
-        # 이 코드는 KHCU MR24 11차시 과제(#3.5.2) 전용 커스터마이징 예제입니다.
-        # AutoGrader 엔진의 핵심 기능이 아니라, 개별 수업 요구사항에 맞도록
-        # 라벨 기반으로 특정 변수 값을 추출하는 '샘플 구현' 용도입니다.
-        # 향후 다른 과제/강의에서는 이 패턴을 참고해 수정하여 사용하십시오.
-        # @jennie 20251118 label352 (as remark foot print)
-        # ================================================================
-        from .nb_utils import get_more_impact_352
-        lab352 = get_more_impact_352(nb)
-        sid2_more_impact_352[sid] = lab352
-        #---------------
-
-        from_sim_template = False
-        try:
-            from_sim_template = (template_fingerprint is not None)
-        except Exception:
-            pass
-
-        if from_sim_template and template_fingerprint and template_sim_threshold is not None:
-            # 템플릿과 유사한 경우 0점 처리
-            # (이 조건은 이전 노트북 로직과 동일)
-            from .nb_utils import _sim
-            if _sim(fp, template_fingerprint) >= template_sim_threshold:
-                row = [
-                    sid, name, p.name, 0.0, "ZERO",
-                    "템플릿과 거의 동일(원본/무변경)", "ZERO",
-                    "템플릿과 거의 동일하여 0점 처리되었습니다." ,len(fp or""),fp,ep, lab352
-                ]  #@jennie 20251118
-                rows.append(row)
-                try:
-                    if mtime_kst(p).date() == now_kst().date():
-                        today_rows_tmp.append(row)
-                except Exception:
-                    pass
-                continue
-
-        # 라벨 맵
-        stu_lmap, ans_lmap = _label_map(nb), _label_map(ans)
-
-        # 채점: 필수/옵션
-        req_missing, req_mismatch, opt_missing = [], [], []
-        excluded_req, excluded_opt = [], []
-
-        # 1) 필수
-        for lab in sorted(req_labels, key=_label_key):
-            executed, stu_out, expected_output = _exec_and_out_expected(stu_lmap, ans_lmap, lab)
-            if not expected_output:
-                excluded_req.append(f"#{lab}")
-                continue
-            anscell = ans_lmap.get(lab, {}).get("cell")
-            ans_out = _cell_output_text(anscell) if anscell else ""
-            if not executed:
-                req_missing.append(f"#{lab}")
-                continue
-
-            _stu_cmp = _maybe_normalize(stu_out)
-            _ans_cmp  = _maybe_normalize(ans_out)
-
-            if not outputs_equal(_stu_cmp, _ans_cmp):
-                req_mismatch.append(f"#{lab}")
-
-        # 2) 옵션
-        for lab in sorted(opt_labels, key=_label_key):
-            executed, _stu_out, expected_output = _exec_and_out_expected(stu_lmap, ans_lmap, lab)
-            if not expected_output:
-                excluded_opt.append(f"#{lab}")
-                continue
-            if not executed:
-                opt_missing.append(f"#{lab}")
-
-        # 점수 계산
-        score = (
-            BASE_SCORE
-            - PENALTY_REQUIRED_MISS * len(req_missing)
-            - PENALTY_REQUIRED_MISMATCH * len(req_mismatch)
-            - PENALTY_OPTIONAL_MISS * len(opt_missing)
-        )
-
-        # 상태/피드백
-        status, output_match = decide_status_and_match(req_missing, req_mismatch)
-        reason = "" if status == "OK" else "필수 미실행/불일치 존재"
-
-        parts: List[str] = []
-        if req_missing:
-            parts.append(f"[필수 미실행 {len(req_missing)}개] 셀: {', '.join(req_missing)}")
-        if req_mismatch:
-            parts.append(f"[필수 출력 불일치 {len(req_mismatch)}개] 셀: {', '.join(req_mismatch)}")
-        if opt_missing:
-            parts.append(f"[연습 미실행 {len(opt_missing)}개] 셀: {', '.join(opt_missing)}")
-
-        score_line = (
-            f"(채점) base={BASE_SCORE}"
-            f"{' − ' + str(PENALTY_REQUIRED_MISS)    + '×' + str(len(req_missing))  + '(필수 미실행)' if req_missing else ''}"
-            f"{' − ' + str(PENALTY_REQUIRED_MISMATCH)+ '×' + str(len(req_mismatch)) + '(필수 불일치)' if req_mismatch else ''}"
-            f"{' − ' + str(PENALTY_OPTIONAL_MISS)    + '×' + str(len(opt_missing))  + '(연습 미실행)' if opt_missing else ''}"
-            f" = {score}"
-        )
-
-        feedback = ("\n".join(parts) if parts else "정상 제출로 판단되었습니다. 수고했습니다!") + f"\n{score_line}"
-        row = [sid, name, p.name, score, status, reason, output_match, feedback.strip(), len(fp or ""), fp, ep, lab352] #@jennie 20251118 label352
-        rows.append(row)
-
-        try:
-            if mtime_kst(p).date() == now_kst().date():
-                today_rows_tmp.append(row)
-        except Exception:
-            pass
 
-        EXCLUDED_REQ_ALL.update(excluded_req)
-        EXCLUDED_OPT_ALL.update(excluded_opt)
+            if res["graded"]:
+                EXCLUDED_REQ_ALL.update(res["excluded_req"])
+                EXCLUDED_OPT_ALL.update(res["excluded_opt"])
+    finally:
+        if ex is not None:
+            ex.shutdown(cancel_futures=True)
+    cache.save()
+    if images is not None:
+        images.close()
 
     summary_df = pd.DataFrame(
         rows,
@@ -0,0 +1,106 @@
+# src/autograder/grading_plan.py
+"""
+채점 계획(grading plan) 캐시 — Step 2(템플릿 태깅) + Step 3(라벨 분류) 결과를 한 파일로 저장
+
+- 키: 템플릿/정답 파일 내용 해시 + 태깅 규칙(STRICT_REQUIRED_FROM_ANSWER, MIN_CODE_LEN) + PLAN_FORMAT
+- 저장: OUT_DIR/grading_plan.json
+- 키가 같고 태깅본(tagged_template.ipynb)도 있으면 태깅/분류를 건너뛰고 바로 로드,
+  다르거나(템플릿·정답 수정) 태깅본이 지워졌으면 태깅본/감사 CSV까지 다시 만든다
+  (이전에는 tagged_template.ipynb 가 있으면 템플릿이 바뀌어도 그대로 썼음)
+"""
+from __future__ import annotations
+import hashlib
+import json
+import os
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import List, Tuple
+
+from . import label_tagging
+from .label_tagging import template_label_tagging, classify_labels
+from .nb_utils import _label_key_robust
+
+# 계획 파일 구조가 바뀌면 올린다
+PLAN_FORMAT = 1
+
+
+def _file_digest(path: Path) -> str:
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+
+def plan_key(template_digest: str, answer_digest: str) -> str:
+    parts = (
+        f"format={PLAN_FORMAT}",
+        f"template={template_digest}",
+        f"answer={answer_digest}",
+        f"strict={label_tagging.STRICT_REQUIRED_FROM_ANSWER}",
+        f"min_code_len={label_tagging.MIN_CODE_LEN}",
+    )
+    return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()
+
+
+@dataclass
+class GradingPlan:
+    key: str
+    template_digest: str
+    answer_digest: str
+    req_labels: List[str] = field(default_factory=list)
+    opt_labels: List[str] = field(default_factory=list)
+    req_idx: List[int] = field(default_factory=list)
+    opt_idx: List[int] = field(default_factory=list)
+    template_fp: str = ""
+    required_cell_map: List[str] = field(default_factory=list)
+    optional_cell_map: List[str] = field(default_factory=list)
+
+    def unpack(self) -> Tuple:
+        """classify_labels() 와 같은 순서/형태의 튜플."""
+        return (set(self.req_labels), set(self.opt_labels), set(self.req_idx), set(self.opt_idx),
+                self.template_fp, list(self.required_cell_map), list(self.optional_cell_map))
+
+    def save(self, path: Path) -> None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(asdict(self), f, ensure_ascii=False, indent=1)
+        os.replace(tmp, path)   # 중간에 끊겨도 이전 계획 파일이 깨지지 않도록
+
+    @classmethod
+    def load(cls, path: Path) -> "GradingPlan":
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(**json.load(f))
+
+
+def load_grading_plan(
+    template_path: Path,
+    answer_path: Path,
+    tagged_path: Path,
+    audit_path: Path,
+    plan_path: Path,
+) -> Tuple[GradingPlan, bool]:
+    """
+    Returns: (plan, fresh) — fresh=True 이면 이번에 태깅/분류를 새로 수행
+    (태깅본/감사 CSV 는 확인용 산출물이므로 태깅본이 지워졌으면 키가 같아도 다시 태깅)
+    """
+    t_dg, a_dg = _file_digest(template_path), _file_digest(answer_path)
+    key = plan_key(t_dg, a_dg)
+    if Path(plan_path).exists() and Path(tagged_path).exists():
+        try:
+            plan = GradingPlan.load(plan_path)
+            if plan.key == key:
+                return plan, False
+        except (OSError, ValueError, TypeError):
+            pass  # 깨진/옛 형식 → 다시 만듦
+
+    template_label_tagging(template_path, answer_path, tagged_path, audit_path)
+    req_labels, opt_labels, req_idx, opt_idx, template_fp, req_map, opt_map = classify_labels(tagged_path)
+    plan = GradingPlan(
+        key=key, template_digest=t_dg, answer_digest=a_dg,
+        req_labels=sorted(req_labels, key=_label_key_robust),
+        opt_labels=sorted(opt_labels, key=_label_key_robust),
+        req_idx=sorted(req_idx), opt_idx=sorted(opt_idx),
+        template_fp=template_fp,
+        required_cell_map=list(req_map), optional_cell_map=list(opt_map),
+    )
+    plan.save(plan_path)
+    return plan, True
@@ -0,0 +1,146 @@
+# src/autograder/image_hash.py
+"""
+image/png 출력 지각 해시(perceptual hash) — 그래프 셀(히스토그램, 산점도 등) 채점용
+
+- 해시: 가로+세로 dHash 128비트 (흑백 9×8 / 8×9 평균 축소 후 이웃 칸 밝기 비교) → 32자리 hex
+  같은 그래프는 렌더링 메타데이터/압축/잡티가 달라도 거의 같은 해시, 막대 순서·모양이 다르면 멀리 떨어짐
+  (가로만 쓰는 64비트 dHash 는 흰 배경이 대부분인 그래프에서 서로 다른 그림도 5~10비트 차이밖에 안 남)
+- 비교: 정답 셀 이미지와 학생 셀 이미지를 순서대로 해밍 거리 ≤ max_distance 이면 일치
+- 캐시: base64 문자열 sha256 → 해시 (내용 주소). 같은 이미지는 한 번만 디코드
+  · 프로세스 안 dict + sqlite(OUT_DIR/image_hash.sqlite) → 다음 런/다른 워커도 재사용
+- Pillow(선택 의존성, Colab 기본 설치)가 없으면 해시를 만들지 않음 → 이미지 비교 생략(기존과 동일)
+"""
+from __future__ import annotations
+import base64
+import hashlib
+import io
+import os
+import sqlite3
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+try:
+    from PIL import Image as _PILImage  # 선택 의존성: 없으면 이미지 비교를 하지 않음
+except ImportError:
+    _PILImage = None
+
+HASH_SIZE = 8   # dHash 한 변 (가로/세로 각 8×8 → 128비트)
+
+
+def available() -> bool:
+    return _PILImage is not None
+
+
+def _content_key(b64: str) -> str:
+    return f"dd{HASH_SIZE}:" + hashlib.sha256(b64.encode("ascii", "ignore")).hexdigest()
+
+
+def dhash_png(data: bytes) -> Optional[str]:
+    """PNG bytes → dHash hex (디코드 실패 시 None)."""
+    try:
+        with _PILImage.open(io.BytesIO(data)) as im:
+            if im.mode in ("RGBA", "LA", "P"):   # 투명 배경은 흰색으로 (matplotlib 기본 저장과 맞춤)
+                im = im.convert("RGBA")
+                bg = _PILImage.new("RGBA", im.size, (255, 255, 255, 255))
+                im = _PILImage.alpha_composite(bg, im)
+            gray = im.convert("L")
+            horiz = gray.resize((HASH_SIZE + 1, HASH_SIZE), _PILImage.Resampling.BOX).tobytes()
+            vert = gray.resize((HASH_SIZE, HASH_SIZE + 1), _PILImage.Resampling.BOX).tobytes()
+    except Exception:
+        return None
+    n, bits = HASH_SIZE, 0
+    for y in range(n):
+        for x in range(n):
+            bits = (bits << 1) | (horiz[y * (n + 1) + x] > horiz[y * (n + 1) + x + 1])
+    for y in range(n):
+        for x in range(n):
+            bits = (bits << 1) | (vert[y * n + x] > vert[(y + 1) * n + x])
+    return f"{bits:0{2 * n * n // 4}x}"
+
+
+def hamming(a: str, b: str) -> int:
+    return (int(a, 16) ^ int(b, 16)).bit_count()
+
+
+def images_match(expected: Sequence[str], actual: Sequence[str], max_distance: int) -> bool:
+    """이미지 수가 같고 순서대로 모두 해밍 거리 ≤ max_distance."""
+    return len(expected) == len(actual) and all(hamming(a, b) <= max_distance for a, b in zip(expected, actual))
+
+
+def _png_payloads(cell) -> List[str]:
+    out = []
+    for o in (cell.get("outputs", []) or []):
+        if o.get("output_type") in ("execute_result", "display_data"):
+            data = o.get("data", {}) or {}
+            png = data.get("image/png")
+            if png:
+                out.append(png if isinstance(png, str) else "".join(png))
+    return out
+
+
+class ImageHashCache:
+    """내용 주소 해시 캐시. 프로세스마다 sqlite 연결을 따로 연다 (path=None 이면 메모리만)."""
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path else None
+        self._mem: Dict[str, str] = {}
+        self._conn = None
+        self._pid = None
+
+    def __getstate__(self):   # 워커로 넘길 때 연결은 빼고 경로/메모리 캐시만
+        return {"path": self.path, "_mem": dict(self._mem), "_conn": None, "_pid": None}
+
+    def _db(self) -> Optional[sqlite3.Connection]:
+        if self.path is None:
+            return None
+        if self._conn is None or self._pid != os.getpid():
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS images (key TEXT PRIMARY KEY, h TEXT NOT NULL)")
+            self._conn, self._pid = conn, os.getpid()
+        return self._conn
+
+    def _lookup(self, key: str) -> Optional[str]:
+        try:
+            db = self._db()
+            row = db.execute("SELECT h FROM images WHERE key=?", (key,)).fetchone() if db else None
+        except sqlite3.Error:
+            return None
+        return row[0] if row else None
+
+    def _store(self, key: str, h: str) -> None:
+        try:
+            db = self._db()
+            if db:
+                db.execute("INSERT OR REPLACE INTO images(key, h) VALUES (?,?)", (key, h))
+        except sqlite3.Error:
+            pass
+
+    def hash_b64(self, b64: str) -> Optional[str]:
+        key = _content_key(b64)
+        h = self._mem.get(key)
+        if h is None:
+            h = self._lookup(key)
+            if h is None:
+                try:
+                    h = dhash_png(base64.b64decode(b64))
+                except ValueError:
+                    h = None
+                if h is None:
+                    return None
+                self._store(key, h)
+            self._mem[key] = h
+        return h
+
+    def cell_hashes(self, cell) -> Tuple[str, ...]:
+        """셀의 image/png 출력 → 해시 목록 (Pillow 없으면 빈 튜플, 디코드 실패 이미지는 제외)."""
+        if not available() or cell is None:
+            return ()
+        hs = (self.hash_b64(b64) for b64 in _png_payloads(cell))
+        return tuple(h for h in hs if h is not None)
+
+    def close(self) -> None:
+        if self._conn is not None and self._pid == os.getpid():
+            self._conn.close()
+        self._conn = None
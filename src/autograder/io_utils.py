@@ -4,7 +4,7 @@
 
 import os, re, unicodedata, datetime as dt
 from pathlib import Path
-from typing import Tuple, Dict, Any
+from typing import Tuple, Dict, Any, Optional
 from datetime import datetime, timedelta, timezone
 
 # ---- Time (KST)
@@ -30,7 +30,8 @@ def _filesize_bytes(path: str) -> int:
         return -1
 
 # ---- Student id / name
-def extract_id_and_name(p: Path) -> Tuple[str, str]:
+def _id_and_name_from_filename(p: Path) -> Tuple[Optional[str], str]:
+    """파일명에서 (학번, 이름) 추출. 못 찾으면 (None, "")."""
     name = ""
     sid = None
     fname = unicodedata.normalize("NFC", p.name)
@@ -48,30 +49,27 @@ def extract_id_and_name(p: Path) -> Tuple[str, str]:
         m2 = re.search(r"(\d{7,})", stem)
         if m2:
             sid = m2.group(1)
+    return sid, name
+
+def extract_id_and_name(p: Path, scan=None, read_notebook: bool = True) -> Tuple[str, str]:
+    """
+    학번/이름 추출: 파일명 우선, 이름이 없으면 노트북 내용(NAME= 셀 > 마크다운 > 메타데이터).
+    - scan: 이미 파싱한 노트북의 nb_utils.scan_notebook() 결과 → 파일을 다시 읽지 않음
+    - read_notebook=False: scan이 없어도 파일을 읽지 않음(예: 파싱 실패가 확정된 파일)
+    """
+    sid, name = _id_and_name_from_filename(p)
 
     if not name:
         try:
-            import nbformat
-            nb_ = nbformat.read(str(p), as_version=4)
-            for c in nb_.cells:
-                if c.cell_type == "code":
-                    src = unicodedata.normalize("NFC", c.source or "")
-                    m3 = re.search(r"(?:NAME|STUDENT_NAME|학생명|이름|성명)\s*=\s*['\"]([^'\"]+)['\"]", src, re.I)
-                    if m3: name = m3.group(1).strip(); break
-            if not name:
-                for c in nb_.cells:
-                    if c.cell_type == "markdown":
-                        txt = unicodedata.normalize("NFC", c.source or "")
-                        m4 = re.search(r"(?:이름|성명)\s*[:：]\s*([^\n]+)", txt)
-                        if m4: name = m4.group(1).strip(); break
-            if not name:
-                md = getattr(nb_, "metadata", {}) or {}
-                for key in ("student_name","name","성명","이름"):
-                    if key in md and str(md[key]).strip():
-                        name = str(md[key]).strip(); break
+            if scan is None and read_notebook:
+                from .nb_utils import load_notebook_fast, scan_notebook
+                scan = scan_notebook(load_notebook_fast(p))
+            if scan is not None:
+                name = scan.name_hint
         except Exception:
             pass
 
+    stem = unicodedata.normalize("NFC", p.stem)
     if not sid:  sid = f"UNIDENTIFIED_{stem}"
     if not name: name = "이름미상"
     name = unicodedata.normalize("NFC", name)
@@ -99,4 +97,14 @@ def load_config(toml_path: str, session: int, env: str) -> Dict[str, Any]:
         "answer_path": block["ANSWER_PATH"],
         "submit_dir":    block["SUBMIT_DIR"],
         "out_dir":       block["OUT_DIR"],
+        # DEV/PROD 공용 교차 기수 유사도 인덱스 (선택, [session_N] 바로 아래 키)
+        "sim_index_path": data[key].get("SIM_INDEX_PATH", ""),
+        # 라벨별 숫자 허용오차 (선택, [session_N.TOLERANCE] 표 → policy.parse_tolerances)
+        "tolerance": dict(data[key].get("TOLERANCE", {})),
+        # 셀 출력 비교 상한 (선택, 0 = 기본값 nb_utils.OUTPUT_MAX_CHARS)
+        "output_max_chars": int(data[key].get("OUTPUT_MAX_CHARS", 0)),
+        # 라벨별 출력 정규화기 (선택, [session_N.NORMALIZE] 표 → normalizers.parse_normalizers)
+        "normalize": dict(data[key].get("NORMALIZE", {})),
+        # 대형 클래스용 압축 보관 (선택, True → fps 압축 + summary finger_print 열은 digest)
+        "compact": bool(data[key].get("COMPACT", False)),
     }
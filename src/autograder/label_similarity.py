@@ -0,0 +1,163 @@
+# src/autograder/label_similarity.py
+"""
+라벨(채점 셀) 단위 유사도
+
+- 노트북 전체 fingerprint 대신 채점 라벨 셀마다 비교
+  · 템플릿 셀에 이미 있던 줄을 빼고(다중집합 차감) 학생이 직접 쓴 부분만 남김
+  · 남은 부분이 MIN_RESIDUAL_LEN 보다 짧으면 비교하지 않음 (df.mean() 같은 짧은 정답은 누구나 같음)
+  · 제출자의 COMMON_ANSWER_RATIO 넘게 같은 코드면 모범 답안으로 보고 제외
+- 라벨마다 해시 색인: 같은 잔여 코드는 한 번만 비교, 길이 창 안의 서로 다른 잔여 코드만 ratio() 비교
+- 결과
+  · 학생쌍별 일치 라벨 목록 (한 문제만 베낀 경우도 드러남)
+  · 학생 × 라벨 그룹 번호 표 (같은 번호 = 그 라벨에서 서로 일치한 학생 묶음, 0 = 없음)
+"""
+from __future__ import annotations
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+import pandas as pd
+
+from .nb_utils import load_notebook_fast, _label_map
+from .policy import DEFAULT_LABEL_SIM_THRESHOLD
+from .similarity import _UnionFind, bounded_ratios
+
+MIN_RESIDUAL_LEN = 30
+COMMON_ANSWER_RATIO = 0.2   # 한 그룹이 라벨 제출자의 이 비율(최소 COMMON_ANSWER_MIN명)을 넘으면
+COMMON_ANSWER_MIN = 5       # 공통 답안으로 보고 보고하지 않음
+
+LABEL_PAIR_COLS: List[str] = ["student_a", "name_a", "student_b", "name_b", "n_labels", "labels", "min_similarity"]
+
+
+def _code_lines(src: str) -> List[str]:
+    """주석/빈 줄 제외, 줄 안 공백 정리."""
+    out = []
+    for ln in (src or "").splitlines():
+        s = " ".join(ln.split())
+        if s and not s.startswith("#"):
+            out.append(s)
+    return out
+
+
+def residual_code(src: str, template_src: str) -> str:
+    """학생 셀에서 템플릿 셀 줄을 (개수만큼) 뺀 나머지."""
+    left = Counter(_code_lines(template_src))
+    keep = []
+    for ln in _code_lines(src):
+        if left[ln] > 0:
+            left[ln] -= 1
+        else:
+            keep.append(ln)
+    return "\n".join(keep)
+
+
+def label_sources(path: Path, labels: Iterable[str]) -> Dict[str, str]:
+    """노트북의 라벨 셀 소스 {label: source} (읽기 실패 시 빈 dict)."""
+    try:
+        lmap = _label_map(load_notebook_fast(path))
+    except Exception:
+        return {}
+    return {lab: lmap[lab]["cell"].source or "" for lab in labels if lab in lmap}
+
+
+def _label_matches(texts: Sequence[str], threshold: float) -> List[Tuple[int, int, float]]:
+    """
+    서로 다른 잔여 코드 목록에서 유사도 ≥ threshold 인 (i, j, ratio).
+    길이순 정렬 후 길이 상한(2·la/(la+lb))을 넘는 범위까지만 후보로 → 대부분 쌍은 보지도 않음.
+    """
+    order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+    cand = []
+    for x, i in enumerate(order):
+        li = len(texts[i])
+        for j in order[x + 1:]:
+            if 2.0 * li / (li + len(texts[j])) < threshold:
+                break
+            cand.append((min(i, j), max(i, j)))
+    return bounded_ratios(texts, cand, threshold)
+
+
+def _add_pairs(out: dict, pos: Dict[str, int], lab: str, r: float, xs: List[str], ys: List[str]) -> None:
+    """xs × ys 학생쌍에 라벨 일치 기록 (같은 목록이면 자기 자신/역순 중복 제외)."""
+    for a in xs:
+        for b in ys:
+            if a == b or (xs is ys and pos[a] > pos[b]):
+                continue
+            key = (a, b) if pos[a] < pos[b] else (b, a)
+            out.setdefault(key, []).append((lab, r))
+
+
+def compute_label_similarity(
+    sid2path: Dict[str, Path],
+    sid2name: Dict[str, str],
+    labels: Sequence[str],
+    template_path: Path,
+    threshold: float = DEFAULT_LABEL_SIM_THRESHOLD,
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Returns:
+        df_pairs: LABEL_PAIR_COLS — 하나 이상 라벨이 일치한 학생쌍 (일치 라벨 수 내림차순)
+        df_matrix: student_id, name, n_matched, <label...> — 라벨별 일치 그룹 번호 (0 = 없음)
+    """
+    labels = list(labels)
+    tmpl = label_sources(template_path, labels)
+    sids = list(sid2path.keys())
+    pos = {sid: k for k, sid in enumerate(sids)}
+    srcs = {sid: label_sources(p, labels) for sid, p in sid2path.items()}
+
+    groups = {sid: {lab: 0 for lab in labels} for sid in sids}
+    pair_labels: Dict[Tuple[str, str], List[Tuple[str, float]]] = {}
+    for lab in labels:
+        # 라벨별 해시 색인: 잔여 코드 → 학생 목록
+        by_text: Dict[str, List[str]] = {}
+        for sid in sids:
+            if lab not in srcs[sid]:
+                continue
+            r = residual_code(srcs[sid][lab], tmpl.get(lab, ""))
+            if len(r) >= MIN_RESIDUAL_LEN:
+                by_text.setdefault(r, []).append(sid)
+        texts = list(by_text.keys())
+        if not texts:
+            continue
+
+        uf = _UnionFind(len(texts))
+        matches = _label_matches(texts, threshold)
+        for i, j, _r in matches:
+            uf.union(i, j)
+        size: Dict[int, int] = {}
+        for i, t in enumerate(texts):
+            size[uf.find(i)] = size.get(uf.find(i), 0) + len(by_text[t])
+        # 제출자 상당수가 같은 코드 → 모범 답안으로 보고 제외
+        limit = max(COMMON_ANSWER_MIN, COMMON_ANSWER_RATIO * sum(size.values()))
+        skip = {root for root, n in size.items() if n < 2 or n > limit}
+
+        for i, t in enumerate(texts):   # 잔여 코드가 완전히 같은 학생끼리
+            if uf.find(i) not in skip:
+                _add_pairs(pair_labels, pos, lab, 1.0, by_text[t], by_text[t])
+        for i, j, r in matches:
+            if uf.find(i) not in skip:
+                _add_pairs(pair_labels, pos, lab, r, by_text[texts[i]], by_text[texts[j]])
+
+        roots: Dict[int, int] = {}
+        for i, t in enumerate(texts):
+            root = uf.find(i)
+            if root in skip:
+                continue
+            gid = roots.setdefault(root, len(roots) + 1)
+            for sid in by_text[t]:
+                groups[sid][lab] = gid
+
+    rows = []
+    for (a, b), hits in pair_labels.items():
+        labs = sorted({lab for lab, _r in hits}, key=labels.index)
+        rows.append([a, sid2name.get(a, ""), b, sid2name.get(b, ""), len(labs), ", ".join(labs),
+                     f"{min(r for _lab, r in hits):.3f}"])
+    df_pairs = pd.DataFrame(rows, columns=LABEL_PAIR_COLS)
+    df_pairs = df_pairs.sort_values(["n_labels", "student_a", "student_b"], ascending=[False, True, True],
+                                    ignore_index=True)
+
+    mrows = []
+    for sid in sids:
+        g = groups[sid]
+        mrows.append([sid, sid2name.get(sid, ""), sum(1 for v in g.values() if v)] + [g[lab] for lab in labels])
+    df_matrix = pd.DataFrame(mrows, columns=["student_id", "name", "n_matched", *labels])
+    return df_pairs, df_matrix
@@ -2,13 +2,144 @@
 노트북 파싱/라벨/출력 유틸 모듈
 """
 
+import hashlib
+import json
 import re
 import unicodedata
+from collections import deque
+from dataclasses import dataclass
 from difflib import SequenceMatcher
+from pathlib import Path
 from typing import Dict, Any, List
 
+try:
+    import orjson as _orjson  # 선택 의존성: 설치되어 있으면 JSON 파싱에 사용
+except ImportError:
+    _orjson = None
+
 LABEL_PATTERN = re.compile(r'^\s*#\s*([0-9]+(?:\.[0-9]+)*)')
 
+# ---- 빠른 노트북 로더 (스키마 검증/NotebookNode 변환 생략)
+def _join_lines(v):
+    """nbformat multiline string(list[str]) → str"""
+    if isinstance(v, list) and all(isinstance(x, str) for x in v):
+        return "".join(v)
+    return v
+
+def _is_json_mime(mime: str) -> bool:
+    return mime == "application/json" or (mime.startswith("application/") and mime.endswith("+json"))
+
+def _rejoin_output(o: dict) -> dict:
+    """nbformat.read(rejoin_lines)와 같은 규칙으로 출력 1개의 텍스트를 합친다."""
+    ot = o.get("output_type", "")
+    if ot in ("execute_result", "display_data"):
+        data = o.get("data") or {}
+        if any(isinstance(v, list) for v in data.values()):
+            o = dict(o)
+            o["data"] = {k: (v if _is_json_mime(k) else _join_lines(v)) for k, v in data.items()}
+    elif ot and isinstance(o.get("text"), list):
+        o = dict(o)
+        o["text"] = _join_lines(o["text"])
+    return o
+
+class LazyCell:
+    """
+    원본 JSON dict를 감싸는 가벼운 셀 뷰.
+    채점에 쓰는 속성(cell_type/source/outputs/execution_count/metadata)만 제공하고,
+    source/outputs의 줄 합치기는 처음 접근할 때 한 번만 한다.
+    """
+    __slots__ = ("_raw", "_source", "_outputs")
+
+    def __init__(self, raw: dict):
+        self._raw = raw
+        self._source = None
+        self._outputs = None
+
+    @property
+    def cell_type(self):
+        return self._raw.get("cell_type")
+
+    @property
+    def source(self) -> str:
+        if self._source is None:
+            self._source = _join_lines(self._raw.get("source", "")) or ""
+        return self._source
+
+    @property
+    def metadata(self) -> dict:
+        return self._raw.get("metadata") or {}
+
+    @property
+    def outputs(self) -> list:
+        if self._outputs is None:
+            self._outputs = [_rejoin_output(o) for o in (self._raw.get("outputs") or [])]
+        return self._outputs
+
+    def get(self, key, default=None):
+        if key == "source":
+            return self.source
+        if key == "outputs":
+            return self.outputs if "outputs" in self._raw else default
+        return self._raw.get(key, default)
+
+    def __getitem__(self, key):
+        if key not in self._raw:
+            raise KeyError(key)
+        return self.get(key)
+
+    def __contains__(self, key):
+        return key in self._raw
+
+class LazyNotebook:
+    """load_notebook_fast()가 반환하는 노트북 뷰. cells는 첫 접근 시 LazyCell로 감싼다."""
+    __slots__ = ("_raw", "_cells")
+
+    def __init__(self, raw: dict):
+        self._raw = raw
+        self._cells = None
+
+    @property
+    def cells(self) -> List[LazyCell]:
+        if self._cells is None:
+            self._cells = [LazyCell(c) for c in self._raw["cells"]]
+        return self._cells
+
+    @property
+    def metadata(self) -> dict:
+        return self._raw.get("metadata") or {}
+
+    @property
+    def nbformat(self) -> int:
+        return self._raw.get("nbformat")
+
+    @property
+    def nbformat_minor(self) -> int:
+        return self._raw.get("nbformat_minor")
+
+def load_notebook_fast(path):
+    """
+    채점용 빠른 로더.
+    - 가장 빠른 JSON 파서(orjson > json)로 읽고 스키마 검증 없이 LazyNotebook 반환
+    - v4가 아니거나(버전 변환 필요) 형식이 이상하면 nbformat.reads(as_version=4)로 폴백
+      → 깨진 파일의 예외 메시지는 기존(nbformat.read)과 동일
+    """
+    data = Path(path).read_bytes()
+    try:
+        raw = _orjson.loads(data) if _orjson is not None else json.loads(data)
+    except Exception:
+        raw = None
+
+    if (
+        isinstance(raw, dict)
+        and raw.get("nbformat") == 4
+        and isinstance(raw.get("cells"), list)
+        and all(isinstance(c, dict) for c in raw["cells"])
+    ):
+        return LazyNotebook(raw)
+
+    import nbformat
+    return nbformat.reads(data.decode("utf-8"), as_version=4)
+
 def _extract_label(text: str):
     if not text:
         return None
@@ -51,6 +182,36 @@ def _nb_exec_pattern(nb) -> str:
 def _sim(a,b): 
     return SequenceMatcher(None, a or "", b or "").ratio()
 
+class TemplateMatcher:
+    """
+    "템플릿과 거의 동일" 판정: _sim(fp, template) >= threshold 와 항상 같은 결과를 단계별로.
+    1) 완전 일치 → 1.0
+    2) 길이 상한 2·min/(la+lb) < threshold → 아님 (대부분 학생은 코드를 추가해서 여기서 끝)
+    3) quick_ratio(글자 빈도 상한) < threshold → 아님
+    4) 경계 사례만 ratio()
+    템플릿 쪽 SequenceMatcher 색인(seq2)은 한 번만 만든다.
+    """
+
+    def __init__(self, template_fp: str, threshold: float):
+        self.template = template_fp or ""
+        self.threshold = threshold
+        self._sm = None
+
+    def is_unchanged(self, fp: str) -> bool:
+        fp = fp or ""
+        if fp == self.template:
+            return 1.0 >= self.threshold
+        la, lb = len(fp), len(self.template)
+        if 2.0 * min(la, lb) / (la + lb) < self.threshold:
+            return False
+        if self._sm is None:
+            self._sm = SequenceMatcher(None)
+            self._sm.set_seq2(self.template)
+        self._sm.set_seq1(fp)
+        if self._sm.quick_ratio() < self.threshold:
+            return False
+        return self._sm.ratio() >= self.threshold
+
 def _label_map(nb) -> Dict[str, Dict[str, Any]]:
     m = {}
     for i, c in enumerate(nb.cells):
@@ -61,6 +222,59 @@ def _label_map(nb) -> Dict[str, Dict[str, Any]]:
             m[lab] = {"idx": i, "cell": c}
     return m
 
+# ---- 제출물 단일 패스 스캔 (라벨 맵 + fingerprint + exec pattern + 이름 후보)
+# 이름 후보 패턴 (io_utils.extract_id_and_name 에서 파일명에 이름이 없을 때 사용)
+NAME_CODE_PATTERN = re.compile(r"(?:NAME|STUDENT_NAME|학생명|이름|성명)\s*=\s*['\"]([^'\"]+)['\"]", re.I)
+NAME_MD_PATTERN   = re.compile(r"(?:이름|성명)\s*[:：]\s*([^\n]+)")
+NAME_META_KEYS    = ("student_name", "name", "성명", "이름")
+
+@dataclass
+class NotebookScan:
+    label_map: Dict[str, Dict[str, Any]]   # _label_map(nb) 과 동일
+    fingerprint: str                       # _nb_fingerprint(nb) 과 동일
+    exec_pattern: str                      # _nb_exec_pattern(nb) 과 동일
+    name_hint: str = ""                    # NAME= 코드 셀 > 마크다운 "이름:" > 메타데이터 순
+
+def scan_notebook(nb, find_name: bool = True) -> NotebookScan:
+    """
+    셀을 한 번만 돌면서 채점에 필요한 정보를 모두 뽑는다.
+    find_name=False 이면 이름 후보 검색(정규식)은 건너뜀 (파일명에 이름이 있는 경우).
+    """
+    lmap: Dict[str, Dict[str, Any]] = {}
+    chunks, seq = [], []
+    code_name = md_name = ""
+
+    for i, c in enumerate(nb.cells):
+        ct = c.cell_type
+        if ct == "code":
+            src = c.source or ""
+            lab = _extract_label(src)
+            if lab:
+                lmap[lab] = {"idx": i, "cell": c}
+            t = _normalize_code(src)
+            if t:
+                chunks.append(t)
+            ec = c.get("execution_count", None)
+            seq.append("N" if ec is None else str(ec))
+            if find_name and not code_name:
+                m = NAME_CODE_PATTERN.search(unicodedata.normalize("NFC", src))
+                if m:
+                    code_name = m.group(1).strip()
+        elif ct == "markdown" and find_name and not md_name:
+            m = NAME_MD_PATTERN.search(unicodedata.normalize("NFC", c.source or ""))
+            if m:
+                md_name = m.group(1).strip()
+
+    name = code_name or md_name
+    if find_name and not name:
+        md = getattr(nb, "metadata", {}) or {}
+        for key in NAME_META_KEYS:
+            if key in md and str(md[key]).strip():
+                name = str(md[key]).strip(); break
+
+    return NotebookScan(label_map=lmap, fingerprint=" ".join(chunks),
+                        exec_pattern=" ".join(seq), name_hint=name)
+
 def _indexes_with_labels(nb, idx_set) -> List[str]:
     items = []
     for i in sorted(idx_set):
@@ -72,7 +286,7 @@ def _indexes_with_labels(nb, idx_set) -> List[str]:
             items.append(f"{i}:(error)")
     return items
 
-def _cell_output_text(cell) -> str:
+def _output_chunks(cell) -> List[str]:
     outs = cell.get("outputs", []) or []
     chunks = []
     for o in outs:
@@ -90,11 +304,94 @@ def _cell_output_text(cell) -> str:
                 chunks.append("[image/png]")
         elif ot in ("error",):
             chunks.append("ERROR:" + " ".join(o.get("traceback", [])))
-    import re as _re, unicodedata as _ud
-    text = "\n".join(chunks)
-    text = _ud.normalize("NFC", text)
-    text = _re.sub(r"\s+", " ", text).strip()
-    return text
+    return chunks
+
+def _normalize_output(text: str) -> str:
+    text = unicodedata.normalize("NFC", text)
+    return _WS_RUN_RE.sub(" ", text).strip()
+
+def _cell_output_text(cell) -> str:
+    return _normalize_output("\n".join(_output_chunks(cell)))
+
+
+# === 대형 셀 출력 (DataFrame 전체 출력, 긴 traceback 등) ===
+# 원문 길이가 OUTPUT_MAX_CHARS 를 넘으면 청크를 조각 단위로 정규화하며 해시만 누적하고
+# 표시용 앞/뒤 OUTPUT_EDGE_CHARS 만 남김 → 채점은 해시 비교 (전체 문자열/정규식 사본을 만들지 않음)
+OUTPUT_MAX_CHARS = 100_000
+OUTPUT_EDGE_CHARS = 2_000
+_OUTPUT_PIECE = 1 << 16   # 조각 길이 (다음 공백에서 자름 → 단어/NFC 조합이 조각 경계에 걸리지 않음)
+_WS_RE = re.compile(r"\s")
+_WS_RUN_RE = re.compile(r"\s+")
+
+
+@dataclass(frozen=True)
+class OutputText:
+    """
+    정규화한 셀 출력 (_cell_output_text 와 같은 규칙)
+      - text: 전체 (truncated=True 이면 앞부분 … 뒷부분, 표시용)
+      - digest: truncated=True 일 때 정규화 전체 출력의 blake2b (아니면 "")
+      - length: 정규화 전체 길이
+    """
+    text: str
+    digest: str
+    length: int
+    truncated: bool
+
+
+def _normalized_pieces(chunks: List[str]):
+    """청크 → 공백 정리/NFC 를 마친 조각 (조각끼리는 공백 하나로 이어짐)."""
+    for chunk in chunks:
+        n, i = len(chunk), 0
+        while i < n:
+            j = i + _OUTPUT_PIECE
+            if j < n:
+                m = _WS_RE.search(chunk, j)
+                j = m.start() if m else n
+            else:
+                j = n
+            piece = chunk[i:j]
+            if not unicodedata.is_normalized("NFC", piece):
+                piece = unicodedata.normalize("NFC", piece)
+            piece = " ".join(piece.split())
+            if piece:
+                yield piece
+            i = j
+
+
+def cell_output(cell, max_chars: int = OUTPUT_MAX_CHARS) -> OutputText:
+    """셀 출력 → OutputText. 원문이 max_chars 이하이면 _cell_output_text 와 동일한 경로."""
+    chunks = _output_chunks(cell)
+    if sum(len(c) for c in chunks) + len(chunks) <= max_chars:
+        text = _normalize_output("\n".join(chunks))
+        return OutputText(text, "", len(text), False)
+
+    h = hashlib.blake2b(digest_size=16)
+    full: List[str] = []          # max_chars 이하인 동안만 보관
+    head: List[str] = []
+    tail: deque = deque()
+    length = head_len = tail_len = 0
+    for piece in _normalized_pieces(chunks):
+        if length:
+            h.update(b" ")
+            length += 1
+        h.update(piece.encode("utf-8"))
+        length += len(piece)
+        if full is not None:
+            full.append(piece)
+            if length > max_chars:
+                full = None
+        if head_len < OUTPUT_EDGE_CHARS:
+            head.append(piece)
+            head_len += len(piece) + 1
+        tail.append(piece)
+        tail_len += len(piece) + 1
+        while len(tail) > 1 and tail_len - len(tail[0]) - 1 >= OUTPUT_EDGE_CHARS:
+            tail_len -= len(tail.popleft()) + 1
+    if full is not None:
+        text = " ".join(full)
+        return OutputText(text, "", len(text), False)
+    shown = " ".join(head)[:OUTPUT_EDGE_CHARS] + " … " + " ".join(tail)[-OUTPUT_EDGE_CHARS:]
+    return OutputText(shown, h.hexdigest(), length, True)
 
 def _label_key_robust(label_str: str):
     """
@@ -122,7 +419,7 @@ def _label_key_robust(label_str: str):
 # 향후 다른 과제/강의에서는 이 패턴을 참고해 수정하여 사용하십시오.
 # ================================================================
 
-def get_more_impact_352(nb, label: str = "3.5.2") -> str:
+def get_more_impact_352(nb, label: str = "3.5.2", lmap: Dict[str, Dict[str, Any]] = None) -> str:
     """
     3.5.2 문제에서 학생이 선택한 more_impact 값을 추출.
     반환값: "reading" / "math" / ""(없거나 인식 불가)
@@ -133,8 +430,10 @@ def get_more_impact_352(nb, label: str = "3.5.2") -> str:
         more_impact = "Reading."
         more_impact = "math score"
     모두 인식 가능.
+    lmap: 이미 만든 라벨 맵이 있으면 넘겨서 재계산을 피한다.
     """
-    lmap = _label_map(nb)
+    if lmap is None:
+        lmap = _label_map(nb)
     info = lmap.get(label)
     if not info:
         return ""
@@ -0,0 +1,130 @@
+# src/autograder/normalizers.py
+"""
+출력 정규화기 레지스트리 (실행할 때마다 달라지는 부분을 비교 전에 지움)
+
+- NORMALIZERS: 이름 → (정규식, 치환 문자열). 셀 출력은 이미 NFC + 공백 1칸으로 정리된 상태(nb_utils)
+- 세션/라벨별 선택: sessions.toml [session_N.NORMALIZE]
+    default = ["datetime", "memory_address"]   # 아래에 없는 모든 라벨
+    "2.1"   = ["datetime", "dtype_footer"]
+    [session_N.NORMALIZE.custom]                # 코드 수정 없이 추가하는 정규식 (이름 = 패턴, 치환은 "")
+    run_id = 'run-\\d+'
+- 선택된 정규화기 묶음마다 하나의 교대(alternation) 정규식으로 컴파일 → 출력당 1회 치환 후 strip
+  (같은 묶음은 한 번만 컴파일, 라벨이 많아도 묶음 수만큼)
+"""
+from __future__ import annotations
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Optional, Tuple
+
+NORMALIZERS: Dict[str, Tuple[str, str]] = {
+    # statsmodels summary 의 Date/Time 줄 (기존 _maybe_normalize 와 동일)
+    "datetime": (r"Date:\s+[A-Za-z]{3},\s+\d{1,2}\s+[A-Za-z]{3}\s+\d{4}|Time:\s*\d{2}:\d{2}:\d{2}", ""),
+    # 2024-03-05 14:22:01(.123) / 2024-03-05T14:22:01
+    "timestamp": (r"\b\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}:\d{2}(?:\.\d+)?\b", "<timestamp>"),
+    # <object at 0x7f3a2c...>
+    "memory_address": (r"\b0x[0-9a-fA-F]{6,16}\b", "0x?"),
+    # random_state=42 / seed=7 (출력된 모델 repr 등)
+    "random_seed": (r"\b(random_state|seed)\s*=\s*\d+", r"\1=?"),
+    # /content/drive/... , C:\Users\... (읽은 파일 경로)
+    # (폴더 이름 안의 공백 허용: "Colab Notebooks/" 처럼 뒤에 구분자가 오는 경우)
+    "file_path": (r"(?:\b[A-Za-z]:\\|(?<![\w.])/)(?:[^\s'\"<>|:/\\]+(?: [^\s'\"<>|:/\\]+)*[/\\])+"
+                  r"[^\s'\"<>|:,)]*", "<path>"),
+    # pandas Series 꼬리 (Name: x, Length: n, dtype: float64)
+    "dtype_footer": (r"(?:Name: [^,]*, )?(?:Length: \d+, )?dtype: \w+", ""),
+    # %time / %%timeit
+    "elapsed": (r"CPU times: user [\d.]+ \S+, sys: [\d.]+ \S+, total: [\d.]+ \S+|Wall time: [\d.]+ \S+|"
+                r"[\d.]+ (?:ns|µs|us|ms|s) ± [\d.]+ (?:ns|µs|us|ms|s) per loop \([^)]*\)", ""),
+}
+
+DEFAULT_NORMALIZERS: Tuple[str, ...] = ("datetime",)
+
+
+@dataclass(frozen=True)
+class OutputNormalizer:
+    """정규화기 묶음을 컴파일한 것. apply() = 1회 치환 + strip."""
+    names: Tuple[str, ...]
+    pattern: Optional["re.Pattern"]
+    replacements: Tuple[str, ...]   # 그룹 n → 치환 문자열
+
+    def apply(self, s: str) -> str:
+        if not isinstance(s, str):
+            return s
+        if self.pattern is not None:
+            s = self.pattern.sub(self._replace, s)
+        return s.strip()
+
+    def _replace(self, m: "re.Match") -> str:
+        return m.expand(self.replacements[m.lastindex])
+
+
+_COMPILED: Dict[Tuple[Tuple[str, ...], Tuple[Tuple[str, str], ...]], OutputNormalizer] = {}
+
+
+def compile_normalizers(names: Iterable[str], custom: Optional[Dict[str, str]] = None) -> OutputNormalizer:
+    """
+    이름 목록 → OutputNormalizer (모르는 이름이면 ValueError).
+    각 정규식은 바깥 그룹 하나로 감싸고, 안쪽 그룹 번호를 옮겨 치환 문자열(\\1 등)이 그대로 동작하도록 한다.
+    """
+    names = tuple(dict.fromkeys(names))
+    custom = dict(custom or {})
+    key = (names, tuple(sorted((n, custom[n]) for n in names if n in custom)))
+    if key in _COMPILED:
+        return _COMPILED[key]
+
+    parts, repls = [], [""]
+    for name in names:
+        if name in custom:
+            pat, repl = custom[name], ""
+        elif name in NORMALIZERS:
+            pat, repl = NORMALIZERS[name]
+        else:
+            raise ValueError(f"알 수 없는 출력 정규화기: {name} (가능: {', '.join(NORMALIZERS)})")
+        base = len(repls)   # 이 항목의 바깥 그룹 번호
+        inner = re.compile(pat).groups
+        if inner and repl:
+            repl = re.sub(r"\\(\d+)", lambda m: f"\\g<{int(m.group(1)) + base}>", repl)
+        parts.append(f"({pat})")
+        repls.append(repl.replace("\\", "\\\\") if not inner else repl)
+        repls.extend([""] * inner)   # 안쪽 그룹 자리 (lastindex 는 항상 바깥 그룹)
+    norm = OutputNormalizer(
+        names=names,
+        pattern=re.compile("|".join(parts)) if parts else None,
+        replacements=tuple(repls),
+    )
+    _COMPILED[key] = norm
+    return norm
+
+
+@dataclass(frozen=True)
+class NormalizerPlan:
+    """세션 설정 → 라벨별 정규화기 (같은 묶음은 같은 객체)."""
+    default: Tuple[str, ...] = DEFAULT_NORMALIZERS
+    labels: Dict[str, Tuple[str, ...]] = field(default_factory=dict)
+    custom: Dict[str, str] = field(default_factory=dict)
+
+    def for_label(self, lab: str) -> OutputNormalizer:
+        return compile_normalizers(self.labels.get(lab, self.default), self.custom)
+
+    def describe(self) -> str:
+        """캐시 버전용 문자열."""
+        parts = ["default=" + ",".join(self.default)]
+        parts += [f"{lab}=" + ",".join(v) for lab, v in sorted(self.labels.items())]
+        parts += [f"custom:{n}={p}" for n, p in sorted(self.custom.items())]
+        return ";".join(parts)
+
+
+def parse_normalizers(block: Optional[dict], default: Tuple[str, ...] = DEFAULT_NORMALIZERS) -> NormalizerPlan:
+    """
+    [session_N.NORMALIZE] 표 → NormalizerPlan. 표가 없으면 default 만.
+    이름 오타는 여기서 바로 ValueError (채점 도중이 아니라 설정 읽을 때).
+    """
+    block = dict(block or {})
+    custom = {str(k): str(v) for k, v in (block.pop("custom", None) or {}).items()}
+    plan = NormalizerPlan(
+        default=tuple(block.pop("default", default)),
+        labels={str(lab).lstrip("#"): tuple(v) for lab, v in block.items()},
+        custom=custom,
+    )
+    for names in (plan.default, *plan.labels.values()):
+        compile_normalizers(names, custom)
+    return plan
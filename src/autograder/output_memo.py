@@ -0,0 +1,99 @@
+# src/autograder/output_memo.py
+"""
+라벨별 출력 비교 메모 (채점 런 단위)
+
+- 키: (라벨, 정규화한 학생 출력의 digest) → 정답 일치 여부
+  한 라벨에서 같은 출력을 낸 학생은 비교 없이 dict 조회로 끝남 (대부분 학생의 출력이 서로 같음)
+- 워커 공유: grade_submissions 가 캐시된 결과의 판정으로 메모를 먼저 채운 뒤 워커 초기 인자로 넘김
+  (워커끼리 실시간으로 주고받지는 않음: 프로세스 간 조회 비용이 비교 자체보다 큼. 워커 안에서는 계속 누적)
+- 채점 결과 dict 의 outputs {라벨: [digest, 일치]} 를 모아 라벨별 서로 다른 출력 수(답안 군집 수) 집계
+"""
+from __future__ import annotations
+import hashlib
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+OUTPUT_DIGEST_SIZE = 8   # blake2b 바이트 수 (라벨 하나의 출력 종류 구분에는 충분)
+
+LABEL_OUTPUT_COLS: List[str] = ["label", "n_students", "n_distinct", "n_distinct_match", "top_share", "top_match"]
+
+
+def output_digest(s: str) -> str:
+    return hashlib.blake2b((s or "").encode("utf-8"), digest_size=OUTPUT_DIGEST_SIZE).hexdigest()
+
+
+class ComparisonMemo:
+    """(라벨, 출력 digest) → 일치 여부 + 학생 수."""
+
+    def __init__(self):
+        self.version: Optional[str] = None
+        self._verdicts: Dict[Tuple[str, str], bool] = {}
+        self._counts: Dict[Tuple[str, str], int] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def bind(self, version: str) -> "ComparisonMemo":
+        """채점 버전(정답/라벨/허용오차 등)이 바뀌면 비움 → 다른 세션의 판정을 재사용하지 않음."""
+        if version != self.version:
+            self.version = version
+            self._verdicts.clear()
+            self._counts.clear()
+            self.hits = self.misses = 0
+        return self
+
+    def compare(self, lab: str, out: str, compare: Callable[[str], bool],
+                digest: Optional[str] = None) -> Tuple[str, bool]:
+        """
+        Returns: (digest, 일치 여부). 처음 보는 출력만 compare(out) 호출.
+        digest: 이미 계산된 출력 해시 (대형 출력: nb_utils.cell_output 의 스트리밍 해시)
+        """
+        dg = digest or output_digest(out)
+        key = (lab, dg)
+        ok = self._verdicts.get(key)
+        if ok is None:
+            self.misses += 1
+            ok = self._verdicts[key] = bool(compare(out))
+        else:
+            self.hits += 1
+        return dg, ok
+
+    def seed(self, outputs: Dict[str, list]) -> None:
+        """캐시된 결과의 판정만 채움 (학생 수는 record 에서)."""
+        for lab, (dg, ok) in (outputs or {}).items():
+            self._verdicts.setdefault((lab, dg), bool(ok))
+
+    def record(self, outputs: Dict[str, list]) -> None:
+        """제출물 1개의 outputs 반영 (판정 + 학생 수)."""
+        for lab, (dg, ok) in (outputs or {}).items():
+            key = (lab, dg)
+            self._verdicts.setdefault(key, bool(ok))
+            self._counts[key] = self._counts.get(key, 0) + 1
+
+    def distinct_outputs(self) -> Dict[str, int]:
+        """라벨 → 서로 다른 출력 수 (record 된 제출물 기준)."""
+        out: Dict[str, int] = {}
+        for lab, _dg in self._counts:
+            out[lab] = out.get(lab, 0) + 1
+        return out
+
+    def label_summary_df(self, labels: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """
+        라벨별 출력 군집 요약 (LABEL_OUTPUT_COLS)
+          - n_distinct_match: 정답과 일치한 출력 종류 수 (허용오차 라벨은 1보다 클 수 있음)
+          - top_share / top_match: 가장 많은 학생이 낸 출력의 비율 / 그 출력의 정답 일치 여부
+        """
+        per: Dict[str, List[Tuple[int, bool]]] = {}
+        for (lab, dg), n in self._counts.items():
+            per.setdefault(lab, []).append((n, self._verdicts[(lab, dg)]))
+        order = list(labels) if labels is not None else sorted(per)
+        rows = []
+        for lab in order:
+            if lab not in per:
+                continue
+            groups = per[lab]
+            total = sum(n for n, _ok in groups)
+            top_n, top_ok = max(groups, key=lambda g: (g[0], g[1]))
+            rows.append([lab, total, len(groups), sum(1 for _n, ok in groups if ok),
+                         round(top_n / total, 3), top_ok])
+        return pd.DataFrame(rows, columns=LABEL_OUTPUT_COLS)
@@ -7,11 +7,25 @@ from pathlib import Path
 SUMMARY_TS_FMT   = "summary_static_with_name_{run_ts}.csv"
 SIMILAR_TS_FMT   = "similar_pairs_{run_ts}.csv"
 NEWTODAY_TS_FMT  = "new_today_{run_ts}.csv"
+DUPCLUSTER_TS_FMT = "duplicate_clusters_{run_ts}.csv"
+CROSS_TS_FMT     = "cross_cohort_{run_ts}.csv"
+LABELSIM_TS_FMT  = "label_similar_pairs_{run_ts}.csv"
+LABELMATRIX_TS_FMT = "label_match_matrix_{run_ts}.csv"
 RUN_LOG_NAME     = "autograde_run.log"
+GRADE_CACHE_NAME = "grade_cache.json"
+GRADING_PLAN_NAME = "grading_plan.json"
+IMAGE_HASH_NAME  = "image_hash.sqlite"
+EXEC_REPORT_NAME = "exec_report.csv"
+EXEC_CACHE_NAME  = "exec_cache.sqlite"
+ANSWER_EXEC_DIR  = "answer_exec"
 
 SUMMARY_LATEST   = "summary_static_with_name_latest.csv"
 SIMILAR_LATEST   = "similar_pairs_latest.csv"
 NEWTODAY_LATEST  = "new_today_latest.csv"
+DUPCLUSTER_LATEST = "duplicate_clusters_latest.csv"
+CROSS_LATEST     = "cross_cohort_latest.csv"
+LABELSIM_LATEST  = "label_similar_pairs_latest.csv"
+LABELMATRIX_LATEST = "label_match_matrix_latest.csv"
 
 @dataclass(frozen=True)
 class OutputLayout:
@@ -32,6 +46,22 @@ class OutputLayout:
     def newtoday_ts(self) -> Path:
         return self.exec_dir / NEWTODAY_TS_FMT.format(run_ts=self.run_ts)
 
+    @property
+    def dupcluster_ts(self) -> Path:
+        return self.exec_dir / DUPCLUSTER_TS_FMT.format(run_ts=self.run_ts)
+
+    @property
+    def cross_ts(self) -> Path:
+        return self.exec_dir / CROSS_TS_FMT.format(run_ts=self.run_ts)
+
+    @property
+    def labelsim_ts(self) -> Path:
+        return self.exec_dir / LABELSIM_TS_FMT.format(run_ts=self.run_ts)
+
+    @property
+    def labelmatrix_ts(self) -> Path:
+        return self.exec_dir / LABELMATRIX_TS_FMT.format(run_ts=self.run_ts)
+
     @property
     def summary_latest(self) -> Path:
         return self.out_dir / SUMMARY_LATEST
@@ -44,10 +74,50 @@ class OutputLayout:
     def newtoday_latest(self) -> Path:
         return self.out_dir / NEWTODAY_LATEST
 
+    @property
+    def dupcluster_latest(self) -> Path:
+        return self.out_dir / DUPCLUSTER_LATEST
+
+    @property
+    def cross_latest(self) -> Path:
+        return self.out_dir / CROSS_LATEST
+
+    @property
+    def labelsim_latest(self) -> Path:
+        return self.out_dir / LABELSIM_LATEST
+
+    @property
+    def labelmatrix_latest(self) -> Path:
+        return self.out_dir / LABELMATRIX_LATEST
+
     @property
     def run_log(self) -> Path:
         return self.out_dir / RUN_LOG_NAME
 
+    @property
+    def exec_report(self) -> Path:
+        return self.exec_dir / EXEC_REPORT_NAME
+
+    @property
+    def grade_cache(self) -> Path:
+        return self.out_dir / GRADE_CACHE_NAME
+
+    @property
+    def grading_plan(self) -> Path:
+        return self.out_dir / GRADING_PLAN_NAME
+
+    @property
+    def image_hash(self) -> Path:
+        return self.out_dir / IMAGE_HASH_NAME
+
+    @property
+    def exec_cache(self) -> Path:
+        return self.out_dir / EXEC_CACHE_NAME
+
+    @property
+    def answer_exec_dir(self) -> Path:
+        return self.out_dir / ANSWER_EXEC_DIR
+
     def ensure_dirs(self) -> "OutputLayout":
         self.out_dir.mkdir(parents=True, exist_ok=True)
         self.exec_dir.mkdir(parents=True, exist_ok=True)
@@ -1,6 +1,12 @@
 # autograder/policy.py
 import re
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Tuple
 
+import numpy as np
+
+# 채점 규칙(감점/출력 비교)이 바뀌면 올린다 → 채점 결과 캐시 무효화 키로 사용
+__version__ = "1.0.0"
 
 # === 감점 규칙 ===
 BASE_SCORE = 100.0
@@ -11,6 +17,9 @@ PENALTY_OPTIONAL_MISS = 0.2
 #  유사도 임계값 기본값
 DEFAULT_TEMPLATE_SIM_THRESHOLD = 0.98
 DEFAULT_PAIR_SIM_THRESHOLD     = 0.99
+DEFAULT_LABEL_SIM_THRESHOLD    = 0.95   # 라벨 셀 단위 (템플릿 줄 제외한 잔여 코드)
+DEFAULT_CROSS_COHORT_THRESHOLD = 0.8    # 이전 기수 대비 winnowing 지문 containment
+DEFAULT_IMAGE_MAX_DISTANCE = 12         # image/png 출력 dHash(128비트) 해밍 거리 상한
 
 def score_rule_str(
     base: float = BASE_SCORE,
@@ -24,20 +33,117 @@ def score_rule_str(
         f"optional: miss -{opt_miss}"
     )
 # === 출력 비교 정책 ===
+# 숫자는 완전일치, 공백/개행/연속공백은 무시.
+# 출력 = 숫자 토큰 목록 + (숫자를 지운 뒤 공백으로 나눈) 단어 목록 → 두 목록이 각각 같으면 같은 출력
+_NUM_PAT = r"[-+]?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?"
+# 숫자가 될 수 있는 위치(숫자/부호)에서는 항상 숫자를 먼저 시도 → re.findall(_NUM_PAT) 과 같은 숫자열
+_TOKEN_RE = re.compile(rf"(?P<num>{_NUM_PAT})|(?P<ws>\s+)|(?P<txt>[^\s\d+-]+|[+-])")
+
+
+@dataclass(frozen=True)
+class OutputTokens:
+    nums: Tuple[str, ...]
+    words: Tuple[str, ...]
+
+
+def _iter_tokens(s: str) -> Iterator[Tuple[bool, str]]:
+    """(숫자 여부, 토큰) 순서대로. 숫자는 단어를 끊지 않는다 ("a1b" → 숫자 "1", 단어 "ab")."""
+    word: List[str] = []
+    for m in _TOKEN_RE.finditer(s or ""):
+        kind = m.lastgroup
+        if kind == "num":
+            yield True, m.group()
+        elif kind == "ws":
+            if word:
+                yield False, "".join(word)
+                word = []
+        else:
+            word.append(m.group())
+    if word:
+        yield False, "".join(word)
+
+
+def tokenize_output(s: str) -> OutputTokens:
+    """정답 출력처럼 여러 번 비교할 출력은 한 번만 토큰화해 둔다 (AnswerKey.expected_tokens)."""
+    nums, words = [], []
+    for is_num, tok in _iter_tokens(s):
+        (nums if is_num else words).append(tok)
+    return OutputTokens(tuple(nums), tuple(words))
+
+
+def tokens_match(expected: OutputTokens, actual: str) -> bool:
+    """미리 토큰화한 출력과 비교. 학생 출력은 토큰화하면서 비교, 처음 다른 토큰에서 종료."""
+    nums, words = expected.nums, expected.words
+    i = j = 0
+    for is_num, tok in _iter_tokens(actual):
+        if is_num:
+            if i >= len(nums) or nums[i] != tok:
+                return False
+            i += 1
+        else:
+            if j >= len(words) or words[j] != tok:
+                return False
+            j += 1
+    return i == len(nums) and j == len(words)
+
 
 def outputs_equal(a: str, b: str) -> bool:
     """숫자는 완전일치, 공백/개행/연속공백은 무시."""
-    def strip_space(s: str) -> str:
-        return re.sub(r"\s+", " ", (s or "").strip())
-    a_s, b_s = strip_space(a), strip_space(b)
+    return tokens_match(tokenize_output(b), a)
+
+
+# === 숫자 허용오차 비교 (라벨별, sessions.toml [session_N.TOLERANCE]) ===
+# describe()/상관행렬/회귀 요약처럼 숫자 표가 긴 출력: 숫자는 배열로 한 번에 np.allclose, 나머지 단어는 완전일치
+_HTML_TAG_RE = re.compile(r"<[^>]+>")
+
+
+@dataclass(frozen=True)
+class Tolerance:
+    atol: float = 0.0
+    rtol: float = 0.0
+
+
+def parse_tolerances(block: Optional[dict]) -> Dict[str, Tolerance]:
+    """
+    {"default": {"atol": 1e-6, "rtol": 1e-4}, "2.1": {"atol": 0.001}} → {라벨: Tolerance}
+    ("default" 는 표에 없는 모든 라벨에 적용)
+    """
+    out = {}
+    for lab, v in (block or {}).items():
+        v = v or {}
+        out[str(lab).lstrip("#")] = Tolerance(float(v.get("atol", 0.0)), float(v.get("rtol", 0.0)))
+    return out
+
+
+def tolerance_for(tols: Dict[str, Tolerance], lab: str) -> Optional[Tolerance]:
+    return tols.get(lab) or tols.get("default")
+
+
+@dataclass(frozen=True)
+class NumericOutput:
+    tokens: OutputTokens      # HTML 태그를 지운 출력의 토큰
+    values: np.ndarray        # tokens.nums 의 float 배열
+
+
+def numeric_output(s: str) -> Optional[NumericOutput]:
+    """출력 → 숫자 배열 + 단어 (숫자가 없거나 변환 실패 시 None → 기존 텍스트 규칙)."""
+    tok = tokenize_output(_HTML_TAG_RE.sub(" ", s or ""))
+    if not tok.nums:
+        return None
+    try:
+        return NumericOutput(tok, np.array(tok.nums, dtype=np.float64))
+    except ValueError:
+        return None
+
 
-    num_pat = r"[-+]?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?"
-    a_nums, b_nums = re.findall(num_pat, a_s), re.findall(num_pat, b_s)
-    if len(a_nums) != len(b_nums): return False
-    if any(x != y for x, y in zip(a_nums, b_nums)): return False
+def outputs_close(expected: NumericOutput, actual: str, tol: Tolerance) -> bool:
+    act = numeric_output(actual)
+    if act is None:
+        return False
+    if act.tokens.words != expected.tokens.words or act.values.shape != expected.values.shape:
+        return False
+    return bool(np.allclose(act.values, expected.values, rtol=tol.rtol, atol=tol.atol, equal_nan=True))
 
-    def remove_nums(s): return re.sub(num_pat, "", s)
-    return strip_space(remove_nums(a_s)) == strip_space(remove_nums(b_s))
 
 # === 상태/출력매핑 ===
 def decide_status_and_match(req_missing, req_mismatch):
@@ -0,0 +1,74 @@
+# src/autograder/records.py
+"""
+채점 결과 병합 도우미 (대형 클래스/여러 세션 일괄 처리 시 메모리 절약)
+
+- cache_entry: 채점 결과 dict → 캐시 항목 (행 안의 fingerprint/exec pattern 사본을 비움, 원문은 fp/ep 에 한 번만)
+- summary_row: 채점 결과 dict 또는 캐시 항목 → summary_df 행 (비워 둔 칸을 채우고, compact 면 fp 원문 대신 digest)
+- CompressedTexts: fingerprint / exec pattern 을 zlib 압축해 두는 dict 대용
+  (유사도 계산처럼 읽을 때만 풀어서 str 로 돌려줌 → compute_similarity_pairs 등 그대로 사용 가능)
+"""
+from __future__ import annotations
+import hashlib
+import zlib
+from typing import Dict, Iterator, MutableMapping, Optional
+
+# summary_df 의 finger_print / exec_pattern 열 위치 (grading._grade_one 의 row 순서)
+FP_COL = 9
+EP_COL = 10
+
+
+def fp_digest(fp: Optional[str]) -> str:
+    return hashlib.sha256((fp or "").encode("utf-8")).hexdigest()[:16]
+
+
+def summary_row(res: dict, compact: bool = False) -> list:
+    """
+    _grade_one 결과 dict 또는 cache_entry → summary_df 행 (비워 둔 finger_print/exec_pattern 칸은 fp/ep 로 채움).
+    compact=True 면 행의 finger_print 를 digest 로 바꿔 원문을 놓아준다.
+    """
+    row = list(res["row"])
+    if len(row) > EP_COL:
+        if row[FP_COL] is None:
+            row[FP_COL] = res["fp"]
+        if row[EP_COL] is None:
+            row[EP_COL] = res["ep"]
+    if compact and len(row) > FP_COL and row[FP_COL]:
+        row[FP_COL] = fp_digest(res["fp"])
+    return row
+
+
+def cache_entry(res: dict) -> dict:
+    """채점 결과 dict → grade_cache 항목. 행의 fp/ep 사본은 None 으로 (summary_row 가 다시 채움)."""
+    row = list(res["row"])
+    if len(row) > EP_COL and res["fp"] is not None:
+        if row[FP_COL] == res["fp"]:
+            row[FP_COL] = None
+        if row[EP_COL] == res["ep"]:
+            row[EP_COL] = None
+    return {**res, "row": row}
+
+
+class CompressedTexts(MutableMapping):
+    """{key: str} 을 zlib 압축 bytes 로 보관 (코드 텍스트는 보통 1/4~1/8 크기)."""
+
+    def __init__(self, level: int = 6):
+        self._data: Dict[str, bytes] = {}
+        self._level = level
+
+    def __getitem__(self, key: str) -> str:
+        return zlib.decompress(self._data[key]).decode("utf-8")
+
+    def __setitem__(self, key: str, value: Optional[str]) -> None:
+        self._data[key] = zlib.compress((value or "").encode("utf-8"), self._level)
+
+    def __delitem__(self, key: str) -> None:
+        del self._data[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def nbytes(self) -> int:
+        return sum(len(v) for v in self._data.values())
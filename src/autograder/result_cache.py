@@ -0,0 +1,117 @@
+# src/autograder/result_cache.py
+"""
+제출물 채점 결과 캐시 (증분 채점)
+
+- 저장 위치: OUT_DIR/grade_cache.json
+- 항목 키  : 파일 내용 해시(sha256) + 파일명
+- 버전 키  : 정답 파일 해시 + 필수/연습 라벨 + 템플릿 fingerprint + 임계값 + 정책 버전
+             + 재실행 모드(ExecConfig.cache_tag: 실행 설정, 패키지 버전, 작업 폴더 파일 목록)
+  → 버전이 바뀌면 캐시 전체를 버리고 다시 채점한다.
+"""
+from __future__ import annotations
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+from .policy import __version__ as policy_version
+
+# 캐시 항목 구조가 바뀌면 올린다
+CACHE_FORMAT = 3   # 2: 라벨별 출력 digest/판정(outputs) 추가, 3: 행 안의 fp/ep 사본 제거(records.cache_entry)
+
+
+def content_digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def grading_version(
+    answer_digest: str,
+    req_labels: Iterable[str],
+    opt_labels: Iterable[str],
+    template_fingerprint: Optional[str],
+    template_sim_threshold: Optional[float],
+    mode: str = "static",
+    tolerances: Optional[dict] = None,
+    output_max_chars: Optional[int] = None,
+    image_max_distance: Optional[int] = None,
+    normalizers: Optional[str] = None,
+) -> str:
+    """채점 결과에 영향을 주는 입력을 하나의 버전 문자열로 묶는다."""
+    h = hashlib.sha256()
+    parts = [
+        f"format={CACHE_FORMAT}",
+        f"policy={policy_version}",
+        f"answer={answer_digest}",
+        "req=" + ",".join(sorted(req_labels)),
+        "opt=" + ",".join(sorted(opt_labels)),
+        "template=" + hashlib.sha256((template_fingerprint or "").encode("utf-8")).hexdigest(),
+        f"threshold={template_sim_threshold}",
+        f"mode={mode}",   # static(저장된 출력) / exec:...(재실행 출력)
+        f"out_cap={output_max_chars}",
+        f"image={image_max_distance}",   # None: 이미지 내용 비교 안 함 (Pillow 없음/끔)
+        f"normalize={normalizers}",       # 라벨별 출력 정규화기 (NormalizerPlan.describe)
+    ]
+    if tolerances:   # 지정한 경우에만 → 허용오차를 안 쓰는 세션의 기존 캐시는 그대로 유효
+        parts.append("tol=" + ";".join(f"{k}:{v.atol}:{v.rtol}" for k, v in sorted(tolerances.items())))
+    for part in parts:
+        h.update(part.encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def entry_key(file_name: str, digest: str) -> str:
+    # 같은 내용이라도 파일명이 다르면 학번/이름이 달라지므로 파일명까지 키에 포함
+    return f"{digest}:{file_name}"
+
+
+class ResultCache:
+    """
+    grade_cache.json 읽기/쓰기.
+    - 이번 런에서 조회/저장된 항목만 다시 저장 → 삭제된 제출물 항목은 자연히 정리됨
+    - 파일이 없거나 깨졌거나 버전이 다르면 빈 캐시로 시작
+    """
+
+    def __init__(self, path: Optional[Path], version: str):
+        self.path = Path(path) if path else None
+        self.version = version
+        self._old: Dict[str, Any] = {}
+        self._new: Dict[str, Any] = {}
+        self.hits = 0
+        self.misses = 0
+        if self.path is not None:
+            self._old = self._load()
+
+    def _load(self) -> Dict[str, Any]:
+        try:
+            with self.path.open("r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != self.version:
+                return {}
+            return dict(data.get("entries", {}))
+        except Exception:
+            return {}
+
+    def get(self, key: str) -> Optional[dict]:
+        entry = self._old.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._new[key] = entry
+        return entry
+
+    def put(self, key: str, entry: dict) -> None:
+        self._new[key] = entry
+
+    def save(self) -> None:
+        if self.path is None:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_name(self.path.name + ".tmp")
+            with tmp.open("w", encoding="utf-8") as f:
+                json.dump({"version": self.version, "entries": self._new}, f, ensure_ascii=False)
+            os.replace(tmp, self.path)  # 원자적 교체(중간에 끊겨도 기존 캐시 유지)
+        except Exception as e:
+            print("⚠️ grade cache save failed:", e)
@@ -0,0 +1,259 @@
+# src/autograder/sim_index.py
+"""
+세션별 교차 기수(cohort) 유사도 인덱스 (이전 학년도 제출물 복사 탐지)
+
+- 지문: 정규화 코드(_nb_fingerprint)를 토큰화 → 토큰 WINNOW_K-gram 해시 → winnowing
+  (연속 WINNOW_W 개 해시 창마다 최솟값만 남김, 같은 내용이면 위치와 무관하게 같은 지문)
+  템플릿 지문 해시는 모두 제외 → 공통 뼈대 코드만으로는 매칭되지 않음
+- 저장: sqlite 역색인 postings(h → doc_id), 기수/학번 단위로 추가
+  · 이미 들어 있는 (기수, 학번)은 내용 digest 가 같으면 건너뜀 → 이전 기수 노트북은 다시 읽지 않음
+- 조회: 새 제출물의 지문 해시로 역색인을 찾아 다른 기수 문서별 공유 지문 수를 집계
+  → containment = 공유 / min(|A|, |B|) ≥ threshold 인 쌍만 보고
+  · 색인 문서의 MAX_DF_RATIO 이상에 나오는 흔한 해시는 조회하지 않음 (답안 공통 코드)
+- 인덱스 파일은 sessions.toml 의 [session_N] SIM_INDEX_PATH 로 반드시 지정 (require_index_path)
+  OUT_DIR 은 기수(DEV/PROD)마다 달라서 그 안에 두면 다른 기수를 볼 수 없음
+"""
+from __future__ import annotations
+import hashlib
+import re
+import sqlite3
+import zlib
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .io_utils import now_kst, extract_id_and_name
+from .nb_utils import load_notebook_fast, scan_notebook, _nb_fingerprint
+from .policy import DEFAULT_CROSS_COHORT_THRESHOLD
+
+WINNOW_K = 5          # 토큰 k-gram
+WINNOW_W = 4          # winnowing 창 크기 (길이 K+W-1 토큰 이상 같은 구간은 반드시 지문 공유)
+MIN_SHARED = 8        # 공유 지문이 이보다 적으면 보고하지 않음 (짧은 우연 일치)
+MAX_DF_RATIO = 0.5
+MIN_DF_DOCS = 20      # 색인 문서가 이보다 적으면 흔한 해시 제외를 하지 않음
+
+CROSS_COLS: List[str] = [
+    "student_id", "name", "file",
+    "match_cohort", "match_student_id", "match_name", "match_file",
+    "shared_fp", "containment",
+]
+
+_TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+
+
+def winnow(text: str, exclude: Optional[Set[int]] = None) -> Set[int]:
+    toks = _TOKEN_RE.findall(text or "")
+    if len(toks) < WINNOW_K:
+        return set()
+    h = np.array([zlib.crc32(" ".join(toks[i:i + WINNOW_K]).encode("utf-8"))
+                  for i in range(len(toks) - WINNOW_K + 1)], dtype=np.int64)
+    if len(h) >= WINNOW_W:
+        h = np.lib.stride_tricks.sliding_window_view(h, WINNOW_W).min(axis=1)
+    else:
+        h = h.min(keepdims=True)
+    fps = set(h.tolist())
+    return fps - exclude if exclude else fps
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha256((text or "").encode("utf-8")).hexdigest()
+
+
+class SimIndex:
+    """sqlite 역색인 (docs + postings)."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS docs ("
+                         "doc_id INTEGER PRIMARY KEY, cohort TEXT NOT NULL, student_id TEXT NOT NULL, "
+                         "name TEXT, file TEXT, digest TEXT NOT NULL, n_fp INTEGER NOT NULL, added_at TEXT, "
+                         "UNIQUE(cohort, student_id))")
+            conn.execute("CREATE TABLE IF NOT EXISTS postings ("
+                         "h INTEGER NOT NULL, doc_id INTEGER NOT NULL, PRIMARY KEY(h, doc_id)) WITHOUT ROWID")
+            conn.execute("CREATE INDEX IF NOT EXISTS postings_doc ON postings(doc_id)")
+            self._conn = conn
+        return self._conn
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def cohorts(self) -> Dict[str, int]:
+        return dict(self._db().execute("SELECT cohort, COUNT(*) FROM docs GROUP BY cohort ORDER BY cohort"))
+
+    def indexed_files(self, cohort: str) -> Set[str]:
+        return {f for (f,) in self._db().execute("SELECT file FROM docs WHERE cohort=?", (cohort,))}
+
+    def add(
+        self,
+        cohort: str,
+        docs: Iterable[Tuple[str, str, str, str]],
+        template_text: str = "",
+    ) -> int:
+        """
+        docs: (학번, 이름, 파일명, 정규화 코드) 목록. 같은 (기수, 학번)이 내용만 바뀌었으면 교체.
+        Returns: 추가/교체한 문서 수
+        """
+        db = self._db()
+        exclude = winnow(template_text)
+        now = now_kst().strftime("%Y-%m-%d %H:%M:%S")
+        changed = 0
+        db.execute("BEGIN")
+        try:
+            for sid, name, file, text in docs:
+                dg = _digest(text)
+                row = db.execute("SELECT doc_id, digest FROM docs WHERE cohort=? AND student_id=?",
+                                 (cohort, sid)).fetchone()
+                if row and row[1] == dg:
+                    continue
+                if row:
+                    db.execute("DELETE FROM postings WHERE doc_id=?", (row[0],))
+                    db.execute("DELETE FROM docs WHERE doc_id=?", (row[0],))
+                fps = winnow(text, exclude)
+                cur = db.execute("INSERT INTO docs(cohort, student_id, name, file, digest, n_fp, added_at) "
+                                 "VALUES (?,?,?,?,?,?,?)", (cohort, sid, name, file, dg, len(fps), now))
+                db.executemany("INSERT OR IGNORE INTO postings(h, doc_id) VALUES (?,?)",
+                               [(h, cur.lastrowid) for h in fps])
+                changed += 1
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        return changed
+
+    def query(
+        self,
+        texts: Dict[str, str],
+        exclude_cohort: str,
+        threshold: float,
+        template_text: str = "",
+    ) -> List[Tuple[str, int, int, float]]:
+        """
+        Returns: (학번, 매칭 doc_id, 공유 지문 수, containment) 목록 — 다른 기수 문서만.
+        """
+        db = self._db()
+        exclude = winnow(template_text)
+        n_docs = db.execute("SELECT COUNT(*) FROM docs WHERE cohort != ?", (exclude_cohort,)).fetchone()[0]
+        if n_docs == 0:
+            return []
+        n_fp = dict(db.execute("SELECT doc_id, n_fp FROM docs WHERE cohort != ?", (exclude_cohort,)))
+        max_df = int(MAX_DF_RATIO * n_docs) if n_docs >= MIN_DF_DOCS else None
+
+        out = []
+        for sid, text in texts.items():
+            hs = list(winnow(text, exclude))
+            if len(hs) < MIN_SHARED:
+                continue
+            counts: Dict[int, int] = {}
+            for i in range(0, len(hs), 500):
+                chunk = hs[i:i + 500]
+                marks = ",".join("?" * len(chunk))
+                if max_df is not None:   # 문서 빈도도 n_docs 와 같이 다른 기수 문서만 센다
+                    rare = [h for h, n in db.execute(
+                        f"SELECT p.h, COUNT(*) FROM postings p JOIN docs d ON d.doc_id = p.doc_id "
+                        f"WHERE p.h IN ({marks}) AND d.cohort != ? GROUP BY p.h",
+                        [*chunk, exclude_cohort]) if n <= max_df]
+                    if not rare:
+                        continue
+                    chunk, marks = rare, ",".join("?" * len(rare))
+                for doc_id, in db.execute(f"SELECT doc_id FROM postings WHERE h IN ({marks})", chunk):
+                    if doc_id in n_fp:
+                        counts[doc_id] = counts.get(doc_id, 0) + 1
+            for doc_id, shared in counts.items():
+                if shared < MIN_SHARED:
+                    continue
+                c = shared / max(1, min(len(hs), n_fp[doc_id]))
+                if c >= threshold:
+                    out.append((sid, doc_id, shared, c))
+        return out
+
+    def doc_info(self, doc_ids: Iterable[int]) -> Dict[int, Tuple[str, str, str, str]]:
+        """doc_id → (기수, 학번, 이름, 파일명)"""
+        ids = list(set(doc_ids))
+        info = {}
+        for i in range(0, len(ids), 500):
+            chunk = ids[i:i + 500]
+            q = "SELECT doc_id, cohort, student_id, name, file FROM docs WHERE doc_id IN (%s)" % ",".join("?" * len(chunk))
+            for doc_id, *rest in self._db().execute(q, chunk):
+                info[doc_id] = tuple(rest)
+        return info
+
+
+def require_index_path(path) -> Path:
+    """SIM_INDEX_PATH 확인 (교차 기수 비교/과거 기수 추가 전에 호출, 비어 있으면 ValueError)."""
+    if not path:
+        raise ValueError("교차 기수 비교에는 sessions.toml [session_N] 의 SIM_INDEX_PATH 가 필요합니다 "
+                         "(DEV/PROD 가 같이 쓰는 경로, OUT_DIR 밖)")
+    return Path(path)
+
+
+def cross_cohort_check(
+    index_path: Path,
+    cohort: str,
+    fps: Dict[str, str],
+    sid2file: Dict[str, str],
+    sid2name: Dict[str, str],
+    template_fp: str = "",
+    threshold: float = DEFAULT_CROSS_COHORT_THRESHOLD,
+    update: bool = True,
+) -> pd.DataFrame:
+    """
+    현재 기수 제출물을 인덱스의 다른 기수 전체와 비교하고, (update=True 이면) 현재 기수를 인덱스에 추가.
+    Returns: CROSS_COLS DataFrame (containment 내림차순)
+    """
+    index = SimIndex(index_path)
+    try:
+        hits = index.query(fps, exclude_cohort=cohort, threshold=threshold, template_text=template_fp)
+        info = index.doc_info(h[1] for h in hits)
+        rows = []
+        for sid, doc_id, shared, c in hits:
+            m_cohort, m_sid, m_name, m_file = info[doc_id]
+            rows.append([sid, sid2name.get(sid, ""), sid2file.get(sid, ""),
+                         m_cohort, m_sid, m_name, m_file, shared, round(c, 3)])
+        if update:
+            index.add(cohort, ((s, sid2name.get(s, ""), sid2file.get(s, ""), fp) for s, fp in fps.items()),
+                      template_text=template_fp)
+    finally:
+        index.close()
+    df = pd.DataFrame(rows, columns=CROSS_COLS)
+    return df.sort_values(["containment", "student_id"], ascending=[False, True], ignore_index=True)
+
+
+def index_submit_dir(
+    index_path: Path,
+    cohort: str,
+    submit_dir: Path,
+    template_fp: str = "",
+    skip_names: Iterable[str] = (),
+) -> int:
+    """
+    보관된 기수 제출 폴더를 인덱스에 추가 (처음 한 번, 이후에는 새 파일만 읽음).
+    skip_names: 제출물이 아닌 노트북 파일명 (grade_submissions 와 같게 템플릿/정답/태깅본)
+    Returns: 추가/교체한 문서 수
+    """
+    index = SimIndex(index_path)
+    try:
+        skip = set(index.indexed_files(cohort)) | set(skip_names)
+        docs = []
+        for p in sorted(Path(submit_dir).rglob("*.ipynb")):
+            if p.name in skip:
+                continue
+            try:
+                nb = load_notebook_fast(p)
+            except Exception:
+                continue
+            sid, name = extract_id_and_name(p, scan=scan_notebook(nb))
+            docs.append((sid or p.stem, name, p.name, _nb_fingerprint(nb)))
+        return index.add(cohort, docs, template_text=template_fp)
+    finally:
+        index.close()
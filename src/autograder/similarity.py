@@ -1,9 +1,17 @@
 # src/autograder/similarity.py
 from __future__ import annotations
+import hashlib
+import os
+import re
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from difflib import SequenceMatcher
 from pathlib import Path
-from typing import Iterable, Sequence, Dict, List, Tuple, Any
+from typing import Iterable, Sequence, Dict, List, Tuple, Any, Set, Optional
+import numpy as np
 import pandas as pd
 from autograder.io_utils import _mtime_kst_str, _filesize_bytes
+from autograder.nb_utils import _sim
 
 SIM_COLS: List[str] = [
     "student_a", "name_a", "file_a", "mtime_a_kst", "size_a_bytes",
@@ -11,13 +19,309 @@ SIM_COLS: List[str] = [
     "similarity",
 ]
 
+CLUSTER_COLS: List[str] = ["cluster_id", "size", "fp_hash", "student_ids", "names", "files"]
+
+
+# ---- 완전 중복(fingerprint 동일) 클러스터
+class _UnionFind:
+    def __init__(self, n: int):
+        self.parent = list(range(n))
+
+    def find(self, x: int) -> int:
+        while self.parent[x] != x:
+            self.parent[x] = self.parent[self.parent[x]]
+            x = self.parent[x]
+        return x
+
+    def union(self, a: int, b: int) -> None:
+        ra, rb = self.find(a), self.find(b)
+        if ra != rb:
+            self.parent[max(ra, rb)] = min(ra, rb)   # 제출 순서가 빠른 쪽이 대표
+
+
+def _fp_hash(fp: Any) -> str:
+    return hashlib.sha256(str(fp).encode("utf-8")).hexdigest()
+
+
+def cluster_exact_duplicates(fps: Dict[str, Any]) -> List[List[str]]:
+    """
+    정규화된 fingerprint 가 완전히 같은 제출물 묶음 (2명 이상만).
+    각 묶음의 첫 학생(fps 순서)이 대표 → compute_similarity_pairs(clusters=...) 에서 대표만 비교.
+    """
+    sids = list(fps.keys())
+    uf = _UnionFind(len(sids))
+    first: Dict[str, int] = {}
+    for i, sid in enumerate(sids):
+        h = _fp_hash(fps[sid])
+        if h in first:
+            uf.union(first[h], i)
+        else:
+            first[h] = i
+
+    groups: Dict[int, List[str]] = {}
+    for i, sid in enumerate(sids):
+        groups.setdefault(uf.find(i), []).append(sid)
+    return [g for _root, g in sorted(groups.items()) if len(g) > 1]
+
+
+def build_cluster_df(
+    clusters: List[List[str]],
+    fps: Dict[str, Any],
+    sid2file: Dict[str, str],
+    sid2name: Dict[str, str],
+) -> pd.DataFrame:
+    """클러스터 1개 = 1행 (학번/이름/파일은 ' | ' 로 연결)."""
+    rows = []
+    for n, members in enumerate(clusters, start=1):
+        rows.append([
+            n, len(members), _fp_hash(fps[members[0]])[:12],
+            " | ".join(members),
+            " | ".join(sid2name.get(s, "") for s in members),
+            " | ".join(sid2file.get(s, "") for s in members),
+        ])
+    return pd.DataFrame(rows, columns=CLUSTER_COLS)
+
+
+# ---- MinHash / LSH 후보쌍 생성
+# 유사도 ≥ threshold 인 쌍을 놓치지 않도록 threshold 로부터 Jaccard 하한을 구해 밴드 수를 정한다.
+#  - ratio(=2M/(|a|+|b|)) ≥ t 이면 어긋난 글자 수 ≤ (1-t)(|a|+|b|), 글자/블록 경계 하나가 깨는 shingle ≤ k개
+#    → (다중집합) Jaccard ≥ (1-x)/(1+x),  x = k·(2(1-t) + 1/SHORT_LEN)
+#  - SHORT_LEN 보다 짧은 fingerprint 는 하한이 성립하지 않으므로 후보 여부와 관계없이 전부 직접 비교
+#  - 버킷 후보 중 시그니처 일치율(Jaccard 추정치)이 하한 - SIG_MARGIN 보다 낮은 쌍은 제외
+#    (Hoeffding: 놓칠 확률 ≤ exp(-2·NUM_PERM·SIG_MARGIN²) ≈ 4e-5)
+SHINGLE_K = 5
+NUM_PERM = 128
+SHORT_LEN = 200
+LSH_MIN_RECALL = 0.999       # 하한 Jaccard 에서의 후보 포함 확률
+LSH_MIN_JACCARD = 0.3        # 하한이 이보다 낮으면(임계값이 낮으면) LSH 이득이 없으므로 전체 비교
+SIG_MARGIN = 0.2
+_MERSENNE = np.uint64((1 << 31) - 1)
+
+
+def _rolling_hashes(text: str, k: int = SHINGLE_K) -> np.ndarray:
+    """k글자 shingle 의 다항식 해시 (mod 2^32, uint64 배열, 등장 순서)."""
+    codes = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+    if len(codes) < k:
+        codes = np.concatenate([codes, np.zeros(k - len(codes), dtype=np.uint64)])
+    n = len(codes) - k + 1
+    h = np.zeros(n, dtype=np.uint64)
+    for j in range(k):
+        h = (h * np.uint64(1000003) + codes[j:j + n]) & np.uint64(0xFFFFFFFF)
+    return h
+
+
+def _shingle_hashes(text: str, k: int = SHINGLE_K) -> np.ndarray:
+    """k글자 shingle 해시(uint32). 같은 shingle 이 여러 번 나오면 등장 순번을 섞어 다중집합으로 만든다."""
+    h = _rolling_hashes(text, k)
+    n = len(h)
+    order = np.argsort(h, kind="stable")
+    hs = h[order]
+    starts = np.r_[0, np.flatnonzero(hs[1:] != hs[:-1]) + 1]
+    occ = np.arange(n) - np.repeat(starts, np.diff(np.r_[starts, n]))
+    tagged = (hs * np.uint64(0x9E3779B1) + occ.astype(np.uint64) * np.uint64(0x85EBCA77)) & np.uint64(0xFFFFFFFF)
+    return tagged
+
+
+def _perm_params(num_perm: int = NUM_PERM, seed: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+    rng = np.random.RandomState(seed)
+    a = rng.randint(1, (1 << 31) - 1, size=num_perm).astype(np.uint64)
+    b = rng.randint(0, (1 << 31) - 1, size=num_perm).astype(np.uint64)
+    return a, b
+
+
+def minhash_signature(text: str, perms: Tuple[np.ndarray, np.ndarray]) -> np.ndarray:
+    a, b = perms
+    x = _shingle_hashes(text)
+    return ((a[:, None] * x[None, :] + b[:, None]) % _MERSENNE).min(axis=1)
+
+
+def lsh_params(threshold: float, num_perm: int = NUM_PERM, k: int = SHINGLE_K):
+    """Returns: (bands, rows, jaccard 하한) / LSH를 쓰기 어려우면 None"""
+    x = k * (2 * (1 - threshold) + 1 / SHORT_LEN)
+    j_min = (1 - x) / (1 + x)
+    if j_min < LSH_MIN_JACCARD:
+        return None
+    best = None
+    for r in range(1, num_perm + 1):
+        bands = num_perm // r
+        if 1 - (1 - j_min ** r) ** bands >= LSH_MIN_RECALL:
+            best = (bands, r)   # r 이 클수록 낮은 유사도 쌍이 덜 걸림
+    return (*best, j_min) if best else None
+
+
+def lsh_candidate_pairs(texts: Sequence[str], threshold: float) -> Set[Tuple[int, int]]:
+    """
+    MinHash + LSH 밴드 버킷으로 후보쌍 (i < j) 생성. SHORT_LEN 미만 fingerprint 는 길이 조건만 맞으면 후보.
+    """
+    params = lsh_params(threshold)
+    n = len(texts)
+    if params is None:
+        return {(i, j) for i in range(n) for j in range(i + 1, n)}
+    bands, rows, j_min = params
+    perms = _perm_params()
+
+    cands: Set[Tuple[int, int]] = set()
+    buckets: Dict[Tuple[int, bytes], List[int]] = {}
+    sigs: Dict[int, np.ndarray] = {}
+    short = []
+    for i, t in enumerate(texts):
+        if len(t) < SHORT_LEN:
+            short.append(i)
+            continue
+        sig = sigs[i] = minhash_signature(t, perms)
+        for bi in range(bands):
+            buckets.setdefault((bi, sig[bi * rows:(bi + 1) * rows].tobytes()), []).append(i)
+    for members in buckets.values():
+        for x in range(len(members)):
+            for y in range(x + 1, len(members)):
+                cands.add((members[x], members[y]))
+    cands = {(i, j) for i, j in cands if np.mean(sigs[i] == sigs[j]) >= j_min - SIG_MARGIN}
+    # 짧은 fingerprint: 길이 상한(2·min/(la+lb))으로만 거른다
+    lens = [len(t) for t in texts]
+    for i in short:
+        for j in range(n):
+            if i != j and _length_bound(lens[i], lens[j]) >= threshold:
+                cands.add((min(i, j), max(i, j)))
+    return cands
+
+
+def _length_bound(la: int, lb: int) -> float:
+    """SequenceMatcher.ratio 의 상한 (real_quick_ratio 와 같은 식)."""
+    return 1.0 if la + lb == 0 else 2.0 * min(la, lb) / (la + lb)
+
+
+# ---- 코사인 모드: 해시된 n-gram 빈도 벡터 + 블록 행렬곱 (근사, difflib 없이 한 번에)
+COSINE_DIM = 1 << 12          # 해시 버킷 수 (행렬 폭, 메모리 ≈ n × 16KB)
+COSINE_BLOCK = 256            # 한 번에 곱하는 행 수 → 메모리 ≈ COSINE_BLOCK × n × 4 bytes
+COSINE_TOKEN_K = 3            # analyzer="token" 일 때 토큰 n-gram 길이
+_TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+
+
+def _token_hashes(text: str, k: int = COSINE_TOKEN_K) -> np.ndarray:
+    toks = _TOKEN_RE.findall(text)
+    grams = [" ".join(toks[i:i + k]) for i in range(max(1, len(toks) - k + 1))]
+    return np.array([zlib.crc32(g.encode("utf-8")) for g in grams], dtype=np.uint64)
+
+
+def shingle_matrix(texts: Sequence[str], analyzer: str = "char", dim: int = COSINE_DIM) -> np.ndarray:
+    """
+    문자열마다 n-gram 빈도를 dim 개 버킷으로 해시한 행(float32), L2 정규화.
+    analyzer: "char" → SHINGLE_K 글자 shingle, "token" → COSINE_TOKEN_K 토큰 n-gram
+    """
+    X = np.zeros((len(texts), dim), dtype=np.float32)
+    for r, t in enumerate(texts):
+        if not t:
+            continue
+        h = _token_hashes(t) if analyzer == "token" else _rolling_hashes(t)
+        X[r] = np.bincount((h % np.uint64(dim)).astype(np.int64), minlength=dim)
+    norms = np.linalg.norm(X, axis=1, keepdims=True)
+    np.divide(X, norms, out=X, where=norms > 0)
+    return X
+
+
+def cosine_pairs(
+    texts: Sequence[str],
+    threshold: float,
+    analyzer: str = "char",
+    block: int = COSINE_BLOCK,
+) -> List[Tuple[int, int, float]]:
+    """
+    코사인 유사도 ≥ threshold 인 (i, j, sim), i < j, (i, j) 오름차순.
+    n×n 행렬은 만들지 않고 행 블록마다 X[r0:r1] @ X[r0:].T 의 위쪽 삼각형만 본다.
+    """
+    X = shingle_matrix(texts, analyzer)
+    out = []
+    n = len(texts)
+    for r0 in range(0, n, block):
+        r1 = min(n, r0 + block)
+        S = X[r0:r1] @ X[r0:].T
+        rows, cols = np.nonzero(S >= threshold - 1e-6)   # float32 반올림 오차 허용
+        for a, c in zip(rows.tolist(), cols.tolist()):
+            i, j = r0 + a, r0 + c
+            if j > i:
+                out.append((i, j, min(1.0, float(S[a, c]))))
+    out.sort()
+    return out
+
+
+# ---- 정확 비교(_sim = SequenceMatcher.ratio): 상한으로 가지치기 + 블록 단위 병렬
+SIM_BLOCK_PAIRS = 2000        # 프로세스 풀 작업 1개의 쌍 수 (같은 열 j 는 한 블록에)
+SIM_POOL_MIN_PAIRS = 5000     # 후보쌍이 이보다 적으면 순차 (프로세스 기동 비용이 더 큼)
+
+_SIM_ARGS: Tuple[List[str], float] = ([], 1.0)
+
+
+def bounded_ratios(texts: Sequence[str], pairs: Iterable[Tuple[int, int]], threshold: float) -> List[Tuple[int, int, float]]:
+    """
+    _sim(texts[i], texts[j]) ≥ threshold 인 쌍만 (i, j, ratio).
+    - 같은 j 끼리 묶어 SequenceMatcher 의 seq2 색인(b2j/fullbcount)을 한 번만 만든다
+    - real_quick_ratio(길이) → quick_ratio(글자 다중집합) 상한이 threshold 미만이면 ratio() 생략
+    (seq1/seq2 방향은 _sim(a, b) 와 같게 유지 → autojunk 포함 결과 동일)
+    """
+    sm = SequenceMatcher(None)
+    out = []
+    cur_j = None
+    for i, j in sorted(pairs, key=lambda p: (p[1], p[0])):
+        if j != cur_j:
+            sm.set_seq2(texts[j])
+            cur_j = j
+        sm.set_seq1(texts[i])
+        if sm.real_quick_ratio() < threshold or sm.quick_ratio() < threshold:
+            continue
+        r = sm.ratio()
+        if r >= threshold:
+            out.append((i, j, r))
+    return out
+
+
+def _init_sim_worker(texts: List[str], threshold: float) -> None:
+    global _SIM_ARGS
+    _SIM_ARGS = (texts, threshold)
+
+
+def _sim_block(pairs: List[Tuple[int, int]]) -> List[Tuple[int, int, float]]:
+    return bounded_ratios(_SIM_ARGS[0], pairs, _SIM_ARGS[1])
+
+
+def _pair_blocks(pairs: List[Tuple[int, int]], size: int = SIM_BLOCK_PAIRS) -> List[List[Tuple[int, int]]]:
+    """쌍 행렬을 열(j) 단위로 잘라 블록 구성 → 워커마다 seq2 색인 재사용."""
+    by_col: Dict[int, List[Tuple[int, int]]] = {}
+    for i, j in pairs:
+        by_col.setdefault(j, []).append((i, j))
+    blocks, cur = [], []
+    for j in sorted(by_col):
+        cur.extend(by_col[j])
+        if len(cur) >= size:
+            blocks.append(cur)
+            cur = []
+    if cur:
+        blocks.append(cur)
+    return blocks
+
+
+def _exact_scores(texts: List[str], pairs: List[Tuple[int, int]], threshold: float, jobs: int) -> Dict[Tuple[int, int], float]:
+    n_jobs = (os.cpu_count() or 1) if jobs is None or jobs <= 0 else jobs
+    if n_jobs > 1 and len(pairs) >= SIM_POOL_MIN_PAIRS:
+        blocks = _pair_blocks(pairs)
+        with ProcessPoolExecutor(max_workers=min(n_jobs, len(blocks)),
+                                 initializer=_init_sim_worker, initargs=(texts, threshold)) as ex:
+            found = [r for part in ex.map(_sim_block, blocks) for r in part]
+    else:
+        found = bounded_ratios(texts, pairs, threshold)
+    return {(i, j): r for i, j, r in found}
+
+
 def compute_similarity_pairs(
     fps: Dict[str, Any],
     sid2file: Dict[str, str],
     sid2path: Dict[str, Path],
     sid2name: Dict[str, str],
     sim_func,
-    threshold: float = 0.99
+    threshold: float = 0.99,
+    candidate_mode: str = "lsh",
+    clusters: Optional[List[List[str]]] = None,
+    jobs: int = 1,
+    metric: str = "ratio",
 ) -> Tuple[List[list], pd.DataFrame]:
     """
     학생 제출물 간 코드 유사도(pairwise) 계산.
@@ -25,36 +329,70 @@ def compute_similarity_pairs(
     Args:
         fps: {student_id: fingerprint_object}
         sid2file, sid2path, sid2name: 학생 id → 정보 매핑
-        sim_func: 유사도 계산 함수, ex) lambda a,b: _sim(a,b)
+        sim_func: 유사도 계산 함수, ex) nb_utils._sim (그대로 넘겨야 LSH/상한 가지치기/병렬 비교 적용,
+                  lambda 로 감싸거나 다른 함수면 모든 쌍을 sim_func 로 순차 비교)
         threshold: 유사도로 필터할 기준값
+        candidate_mode: "lsh" → MinHash/LSH 후보쌍만 확인 (fingerprint 가 문자열이고 sim_func 가 _sim 일 때만,
+                        LSH 재현율 보장은 SequenceMatcher ratio 기준), "all" → 모든 쌍 비교(O(n²))
+        clusters: cluster_exact_duplicates() 결과. 주면 각 클러스터의 대표(첫 학생)만 비교
+                  (클러스터 내부 쌍은 클러스터 리포트로 대신함)
+        jobs: sim_func 가 nb_utils._sim 일 때 정확 비교 프로세스 수 (1=순차, 0 이하=CPU 코어 수)
+              → 상한 가지치기 후 남은 쌍만 블록 단위로 나눠 ratio() 계산. 결과는 순차와 동일
+        metric: "ratio" → sim_func (기본), "cosine" / "cosine_token" → 해시된 글자/토큰 n-gram
+                빈도 벡터의 코사인 유사도 (sim_func, candidate_mode 무시, 모든 쌍을 행렬곱으로 계산)
 
     Returns:
         pairs (list of lists), df_sim (DataFrame)
     """
-    sids = list(fps.keys())
+    non_rep = {s for members in (clusters or []) for s in members[1:]}
+    sids = [s for s in fps.keys() if s not in non_rep]
     pairs = []
 
-    for i, a in enumerate(sids):
-        for b in sids[i + 1:]:
-            sab = sim_func(fps[a], fps[b])
-            if sab >= threshold:
-                file_a, file_b = sid2file.get(a, ""), sid2file.get(b, "")
-                path_a, path_b = sid2path.get(a, ""), sid2path.get(b, "")
-                name_a, name_b = sid2name.get(a, ""), sid2name.get(b, "")
-
-                try:
-                    mtime_a = _mtime_kst_str(path_a) if path_a else ""
-                    mtime_b = _mtime_kst_str(path_b) if path_b else ""
-                    size_a = _filesize_bytes(path_a) if path_a else -1
-                    size_b = _filesize_bytes(path_b) if path_b else -1
-                except Exception:
-                    mtime_a, mtime_b, size_a, size_b = "", "", -1, -1
-
-                pairs.append([
-                    a, name_a, file_a, mtime_a, size_a,
-                    b, name_b, file_b, mtime_b, size_b,
-                    f"{sab:.3f}"
-                ])
+    all_str = all(isinstance(fps[s], str) for s in sids)
+    if metric in ("cosine", "cosine_token"):
+        analyzer = "token" if metric == "cosine_token" else "char"
+        hits = cosine_pairs([str(fps[s] or "") for s in sids], threshold, analyzer)
+    else:
+        exact = sim_func is _sim and all_str
+        if candidate_mode == "lsh" and exact:
+            texts = [fps[s] for s in sids]
+            cand = sorted(
+                (i, j) for i, j in lsh_candidate_pairs(texts, threshold)
+                if _length_bound(len(texts[i]), len(texts[j])) >= threshold
+            )
+        else:
+            cand = [(i, j) for i in range(len(sids)) for j in range(i + 1, len(sids))]
+
+        if exact:
+            scores = _exact_scores([fps[s] for s in sids], cand, threshold, jobs)
+            hits = [(i, j, scores[(i, j)]) for i, j in cand if (i, j) in scores]
+        else:
+            hits = []
+            for i, j in cand:
+                sab = sim_func(fps[sids[i]], fps[sids[j]])
+                if sab >= threshold:
+                    hits.append((i, j, sab))
+
+    # 파일 정보는 학생당 한 번만 조회
+    stats: Dict[str, Tuple[str, int]] = {}
+
+    def _stat(sid: str) -> Tuple[str, int]:
+        if sid not in stats:
+            path = sid2path.get(sid, "")
+            stats[sid] = (_mtime_kst_str(path), _filesize_bytes(path)) if path else ("", -1)
+        return stats[sid]
+
+    for i, j, sab in hits:
+        a, b = sids[i], sids[j]
+        file_a, file_b = sid2file.get(a, ""), sid2file.get(b, "")
+        name_a, name_b = sid2name.get(a, ""), sid2name.get(b, "")
+        (mtime_a, size_a), (mtime_b, size_b) = _stat(a), _stat(b)
+
+        pairs.append([
+            a, name_a, file_a, mtime_a, size_a,
+            b, name_b, file_b, mtime_b, size_b,
+            f"{sab:.3f}"
+        ])
 
     df_sim = pd.DataFrame( pairs,columns = SIM_COLS )
 
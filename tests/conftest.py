@@ -0,0 +1,86 @@
+# tests/conftest.py
+"""
+채점 파이프라인 테스트용 작은 세션: 템플릿 / 정답 / 제출물(정답·오답·미실행·템플릿 복사·깨진 파일·하위 폴더)
+"""
+from pathlib import Path
+from typing import Optional
+
+import nbformat
+import pytest
+from nbformat.v4 import new_code_cell, new_markdown_cell, new_notebook, new_output
+
+from autograder.label_tagging import classify_labels, template_label_tagging
+
+TEMPLATE = [
+    ("md", "# 과제 10"),
+    ("code", "import math\nimport json"),
+    ("code", "data = [1, 2, 3, 4, 5]"),
+    ("code", "# 1.1\n# TODO: 평균을 출력하세요\n"),
+    ("code", "# 1.2\n# TODO: 합계\n"),
+    ("code", "# 1.3\nscratch = 1"),
+    ("code", "# 2.1\n# TODO: 최대값\n"),
+    ("md", "## 연습문제"),
+    ("code", "# 3.1\n# TODO\n"),
+]
+ANSWER = {
+    "1.1": ("mean = sum(data)/len(data)\nprint(mean)", "3.0\n"),
+    "1.2": ("total = sum(data)\nprint(total)", "15\n"),
+    "2.1": ("print(max(data))", "5\n"),
+    "3.1": ("print(math.sqrt(16))", "4.0\n"),
+}
+TEMPLATE_NAME = "MR_10_템플릿_학번_성명.ipynb"
+ANSWER_NAME = "MR_10_템플릿_학번_성명_src.ipynb"
+
+
+def make_notebook(solved: bool = True, outputs: bool = True, wrong=(), extra: Optional[str] = None):
+    """solved=False → 템플릿 그대로, wrong: 오답 라벨, extra: 앞에 끼워 넣을 코드 셀"""
+    cells, n = [], 1
+    for kind, src in TEMPLATE:
+        if kind == "md":
+            cells.append(new_markdown_cell(src))
+            continue
+        lab = src.splitlines()[0][2:] if src[2:3].isdigit() else None
+        c = new_code_cell(src)
+        if solved and lab in ANSWER:
+            code, out = ANSWER[lab]
+            if lab in wrong:
+                code, out = code.replace("data", "data[:1]"), "999\n"
+            c = new_code_cell(f"# {lab}\n{code}")
+            if outputs:
+                c.outputs = [new_output("stream", name="stdout", text=out)]
+        if solved and (outputs or lab not in ANSWER):
+            c.execution_count, n = n, n + 1
+        cells.append(c)
+    if extra:
+        cells.insert(1, new_code_cell(extra))
+    return new_notebook(cells=cells)
+
+
+@pytest.fixture(scope="session")
+def grading_session(tmp_path_factory):
+    """grade_submissions 에 넘길 인자 (submit_paths 포함)."""
+    root = tmp_path_factory.mktemp("session")
+    sub = root / "submit"
+    (sub / "late").mkdir(parents=True)
+    out = root / "out"
+    out.mkdir()
+    template, answer = root / TEMPLATE_NAME, root / ANSWER_NAME
+    nbformat.write(make_notebook(solved=False), template)
+    nbformat.write(make_notebook(), answer)
+
+    for i in range(8):
+        nb = make_notebook(wrong=("1.2",) if i % 3 == 0 else (), outputs=(i != 5))
+        nbformat.write(nb, sub / f"MR_10_{20240000 + i}_학생{i}.ipynb")
+    nbformat.write(make_notebook(solved=False), sub / "MR_10_20249999_복붙.ipynb")
+    nbformat.write(make_notebook(extra="NAME = '홍길동'"), sub / "late" / "misnamed_20247777.ipynb")
+    (sub / "broken_20248888_고장.ipynb").write_text("{not json", encoding="utf-8")
+
+    tagged = out / "tagged_template.ipynb"
+    template_label_tagging(template, answer, tagged, out / "tag_audit.csv")
+    req, opt, _, _, tfp, _, _ = classify_labels(tagged)
+    return dict(
+        submit_paths=sorted(sub.rglob("*.ipynb")),
+        template_path=template, answer_path=answer, tagged_template_path=tagged,
+        req_labels=sorted(req), opt_labels=sorted(opt), template_fingerprint=tfp,
+        template_sim_threshold=0.98,
+    )
@@ -0,0 +1,61 @@
+from autograder.dataflow import PLOT_STATE, analyze_cell, slice_cells
+
+
+def test_function_mutating_global_keeps_call_cell():
+    cells = ['import pandas as pd\ndf = pd.DataFrame({"a": [1]})',
+             'def g():\n    df["x"] = 1',
+             'g()',
+             'print(df.x)']
+    assert slice_cells(cells, [3]) == [0, 1, 2, 3]
+
+
+def test_global_declaration_in_function():
+    cells = ['def f():\n    global x\n    x = 5', 'f()', 'print(x)']
+    assert slice_cells(cells, [2]) == [0, 1, 2]
+
+
+def test_transitive_function_effects():
+    cells = ['lst = []',
+             'def add():\n    lst.append(1)',
+             'def run():\n    add()',
+             'run()',
+             'print(lst)']
+    assert slice_cells(cells, [4]) == [0, 1, 2, 3, 4]
+
+
+def test_function_passed_as_argument():
+    cells = ['seen = []',
+             'def f(v):\n    seen.append(v)',
+             'list(map(f, [1, 2]))',
+             'print(seen)']
+    assert slice_cells(cells, [3]) == [0, 1, 2, 3]
+
+
+def test_function_locals_are_not_global_writes():
+    cells = ['df = 1',
+             'def f(d):\n    d = 2\n    y = d\n    return y',
+             'z = f(3)',
+             'print(df)']
+    assert slice_cells(cells, [3]) == [0, 3]
+
+
+def test_pure_method_cell_is_dropped():
+    cells = ['import pandas as pd\ndf = pd.DataFrame({"a": [1]})',
+             'df.head()',
+             'df.append_col = 1',
+             'print(df)']
+    assert slice_cells(cells, [3]) == [0, 2, 3]
+
+
+def test_plot_cells_are_kept_for_plot_target():
+    cells = ['import matplotlib.pyplot as plt',
+             'plt.figure()',
+             'x = 1',
+             'plt.title("t")\nplt.show()']
+    assert PLOT_STATE in analyze_cell(cells[1]).defs
+    assert slice_cells(cells, [3]) == [0, 1, 3]
+
+
+def test_opaque_cell_keeps_everything_before():
+    cells = ['a = 1', 'b = 2', '%matplotlib inline', 'print(a)']
+    assert slice_cells(cells, [3]) == [0, 1, 2, 3]
@@ -0,0 +1,50 @@
+import time
+
+from autograder.exec_cache import ExecCache, cell_cache_text, chain_keys, is_stable
+
+
+def _out(text):
+    return [{"output_type": "stream", "name": "stdout", "text": text}]
+
+
+def test_cell_cache_text_ignores_comments_and_blank_lines_only():
+    assert cell_cache_text("# 풀이\nx = 1   \n\n  # 메모\nprint(x)") == "x = 1\nprint(x)"
+    assert cell_cache_text("if a:\n    x = 1") != cell_cache_text("if a:\n  x = 1")
+    assert cell_cache_text("s = 'a  b'") != cell_cache_text("s = 'a b'")
+
+
+def test_chain_keys_depend_on_every_previous_cell():
+    a = chain_keys("seed", ["x = 1", "y = 2", "print(y)"])
+    b = chain_keys("seed", ["x = 3", "y = 2", "print(y)"])
+    assert len(a) == 3 and all(ka != kb for ka, kb in zip(a, b))
+    assert chain_keys("seed", ["# 주석\nx = 1  ", "\ny = 2"]) == a[:2]
+    assert chain_keys("other", ["x = 1"])[0] != a[0]
+
+
+def test_lookup_stops_at_first_missing_cell(tmp_path):
+    cache = ExecCache(tmp_path / "c.sqlite")
+    keys = chain_keys("s", ["a = 1", "b = 2", "c = 3"])
+    cache.store([keys[0], keys[2]], [(_out("1"), 1), (_out("3"), 3)])
+    assert cache.lookup(keys) == [(_out("1"), 1)]
+    assert cache.lookup([]) == []
+    cache.close()
+
+
+def test_evict_drops_least_recently_used(tmp_path):
+    cache = ExecCache(tmp_path / "c.sqlite")
+    keys = chain_keys("s", ["a = 1", "b = 2", "c = 3"])
+    for k in keys:
+        cache.store([k], [(_out("x" * 100), 1)])
+        time.sleep(0.01)
+    cache.lookup(keys[:1])   # 첫 항목을 최근 사용으로
+    size = len('[{"output_type": "stream", "name": "stdout", "text": "' + "x" * 100 + '"}]')
+    cache.max_bytes = 2 * size
+    assert cache.evict() == 1
+    assert cache.lookup(keys[:1]) and not cache.lookup(keys[1:2]) and cache.lookup(keys[2:])
+    assert cache.evict() == 0
+    cache.close()
+
+
+def test_interrupted_results_are_unstable():
+    assert is_stable([(_out("1"), 1)])
+    assert not is_stable([([{"output_type": "error", "ename": "KeyboardInterrupt"}], 2)])
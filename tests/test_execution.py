@@ -0,0 +1,146 @@
+import nbformat
+import pytest
+
+from autograder.execution import ExecConfig, execute_answer, execute_submissions, run_cells
+from autograder.fork_exec import fork_supported
+from autograder.nb_utils import _cell_output_text
+
+from conftest import make_notebook
+
+
+def _kernel_available() -> bool:
+    try:
+        from jupyter_client.kernelspec import KernelSpecManager
+        return "python3" in KernelSpecManager().find_kernel_specs()
+    except Exception:
+        return False
+
+
+needs_kernel = pytest.mark.skipif(not _kernel_available(), reason="python3 커널 없음")
+
+
+def _nb(sources):
+    return nbformat.v4.new_notebook(cells=[nbformat.v4.new_code_cell(s) for s in sources])
+
+
+class _FakeRunner:
+    """실행한 셀 번호를 기록하고, 셀 번호를 출력으로 돌려주는 가짜 커널."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, idx):
+        self.calls.append(list(idx))
+        out = {i: ([{"output_type": "stream", "name": "stdout", "text": f"{i}\n"}], n + 1)
+               for n, i in enumerate(idx)}
+        return out, "OK", ""
+
+
+def _cfg(tmp_path):
+    return ExecConfig(cwd=str(tmp_path), cell_cache_path=str(tmp_path / "cc.sqlite"))
+
+
+def test_cell_cache_skips_cells_later_cells_do_not_depend_on(tmp_path):
+    cfg = _cfg(tmp_path)
+    src = ["a = 1", "b = 2", "print(b)", "c = a + 1", "print(c)"]
+    run = _FakeRunner()
+    ran, status, _, reused = run_cells(_nb(src), cfg, list(range(5)), run)
+    assert status == "OK" and reused == 0 and run.calls == [[0, 1, 2, 3, 4]]
+
+    # 마지막 셀만 바뀜 → 캐시 셀 중 c 를 만드는 0, 3 만 다시 실행, 1·2 는 출력만 재사용
+    src2 = src[:4] + ["print(c * 2)"]
+    run2 = _FakeRunner()
+    ran2, status2, _, reused2 = run_cells(_nb(src2), cfg, list(range(5)), run2)
+    assert run2.calls == [[0, 3, 4]]
+    assert reused2 == 2
+    assert ran2[1] == ran[1] and ran2[2] == ran[2]
+
+
+def test_cell_cache_full_hit_runs_nothing(tmp_path):
+    cfg = _cfg(tmp_path)
+    src = ["x = 1", "print(x)"]
+    run_cells(_nb(src), cfg, [0, 1], _FakeRunner())
+    run = _FakeRunner()
+    _, status, _, reused = run_cells(_nb(src), cfg, [0, 1], run)
+    assert status == "OK" and reused == 2 and run.calls == []
+
+
+def test_cwd_change_invalidates_cell_cache(tmp_path):
+    cfg = _cfg(tmp_path)
+    src = ["x = 1", "print(x)"]
+    run_cells(_nb(src), cfg, [0, 1], _FakeRunner())
+    other = tmp_path / "other"
+    other.mkdir()
+    run = _FakeRunner()
+    run_cells(_nb(src), ExecConfig(cwd=str(other), cell_cache_path=cfg.cell_cache_path), [0, 1], run)
+    assert run.calls == [[0, 1]]
+
+
+def _outputs(path):
+    nb = nbformat.read(path, as_version=4)
+    return [_cell_output_text(c) for c in nb.cells if c.cell_type == "code"]
+
+
+@needs_kernel
+def test_kernel_pool_runs_each_submission_in_its_folder(tmp_path):
+    src = ["print('x' in globals())",
+           "x = open('data.txt').read()",
+           "print(x)",
+           "import time\ntime.sleep(30)",
+           "print('after')"]
+    paths = []
+    for name in ("alpha", "beta"):
+        d = tmp_path / name
+        d.mkdir()
+        (d / "data.txt").write_text(name)
+        paths.append(d / "MR_10_2024000_학생.ipynb")   # 같은 파일명 → 실행본은 _2 로 구분
+        nbformat.write(_nb(src), paths[-1])
+
+    res = execute_submissions(paths, tmp_path / "exec", ExecConfig(pool_size=1, cell_timeout=2))
+    assert [r.status for r in res] == ["OK", "OK"]
+    assert res[0].executed_file != res[1].executed_file
+    for r, name in zip(res, ("alpha", "beta")):
+        out = _outputs(r.executed_file)
+        assert out[0] == "False"                # 커널 재사용 시 네임스페이스 초기화
+        assert out[2] == name                   # 제출 폴더가 작업 폴더
+        assert out[3].startswith("ERROR")       # 셀 타임아웃 → interrupt, 에러 출력으로 기록
+        assert out[4] == "after"                # 다음 셀은 계속 실행
+
+
+@needs_kernel
+@pytest.mark.skipif(not fork_supported(), reason="fork 미지원 플랫폼")
+def test_fork_outputs_equal_kernel_outputs(tmp_path):
+    template = tmp_path / "template.ipynb"
+    nbformat.write(make_notebook(solved=False), template)
+    sub = tmp_path / "submit"
+    sub.mkdir()
+    nbs = [make_notebook(), make_notebook(wrong=("1.2",)), make_notebook(outputs=False),
+           make_notebook(extra="data = [10, 20]")]   # 마지막은 준비 셀이 달라 커널 풀에서 실행
+    paths = []
+    for i, nb in enumerate(nbs):
+        paths.append(sub / f"MR_10_{20240000 + i}_학생{i}.ipynb")
+        nbformat.write(nb, paths[-1])
+
+    kernel = execute_submissions(paths, tmp_path / "k", ExecConfig(pool_size=1), template_path=template)
+    fork = execute_submissions(paths, tmp_path / "f", ExecConfig(pool_size=1, engine="fork"), template_path=template)
+    assert [r.status for r in fork] == ["OK"] * 4
+    assert [r.engine for r in fork] == ["fork", "fork", "fork", "kernel"]
+    for k, f in zip(kernel, fork):
+        assert _outputs(f.executed_file) == _outputs(k.executed_file)
+    assert _outputs(fork[0].executed_file)[2:4] == ["3.0", "15"]
+
+
+@needs_kernel
+def test_execute_answer_is_cached(tmp_path):
+    answer = tmp_path / "answer.ipynb"
+    nbformat.write(_nb(["x = 6 * 7", "print(x)"]), answer)
+    cache = tmp_path / "cache"
+    first, fresh = execute_answer(answer, cache)
+    assert fresh and first.parent == cache
+    assert _outputs(first) == ["", "42"]
+    again, fresh2 = execute_answer(answer, cache)
+    assert (again, fresh2) == (first, False)
+
+    nbformat.write(_nb(["x = 6 * 8", "print(x)"]), answer)   # 정답이 바뀌면 새 키로 다시 실행
+    changed, fresh3 = execute_answer(answer, cache)
+    assert fresh3 and changed != first and _outputs(changed) == ["", "48"]
@@ -0,0 +1,23 @@
+# tests/test_grade_submissions.py
+"""
+grade_submissions 전체 흐름: 병렬 채점 = 순차 채점, 정답 키는 런당 한 번
+"""
+from autograder import grading
+from autograder.grading import grade_submissions
+
+
+def test_parallel_grading_equals_sequential(grading_session):
+    seq = grade_submissions(**grading_session, jobs=1)
+    assert len(seq[0]) == len(grading_session["submit_paths"])
+    for jobs in (2, 3):
+        par = grade_submissions(**grading_session, jobs=jobs)
+        assert par[0].equals(seq[0])
+        assert par[1:] == seq[1:]
+
+
+def test_answer_key_built_once_per_run(grading_session, monkeypatch):
+    calls = []
+    real = grading.build_answer_key
+    monkeypatch.setattr(grading, "build_answer_key", lambda *a, **kw: calls.append(1) or real(*a, **kw))
+    df = grade_submissions(**grading_session)[0]
+    assert calls == [1] and len(df) > 1
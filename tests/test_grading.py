@@ -0,0 +1,53 @@
+# tests/test_grading.py
+"""
+grading 정답 키(build_answer_key)와 라벨 출력 비교(_compare_label): 숫자 허용오차, 상한을 넘는 출력의 해시 비교
+"""
+import nbformat
+from nbformat.v4 import new_code_cell, new_notebook, new_output
+
+from autograder.grading import build_answer_key, _compare_label
+from autograder.nb_utils import cell_output
+from autograder.output_memo import ComparisonMemo
+from autograder.policy import Tolerance
+
+
+def _cell(label: str, text: str):
+    return new_code_cell(f"# {label}\nprint(x)", outputs=[new_output("stream", name="stdout", text=text)])
+
+
+def _notebook(outputs: dict):
+    return nbformat.from_dict(new_notebook(cells=[_cell(lab, text) for lab, text in outputs.items()]))
+
+
+def _verdict(answer_key, lab: str, text: str, memo=None) -> bool:
+    memo = memo if memo is not None else ComparisonMemo()
+    out = cell_output(_cell(lab, text), answer_key.max_chars)
+    return _compare_label(answer_key, memo, lab, out, ())[1]
+
+
+def test_answer_key_orders_labels_and_excludes_labels_without_output():
+    ans = _notebook({"1.10": "a\n", "1.2": "b\n", "2.1": "", "3.1": "c\n"})
+    key = build_answer_key(ans, ["1.10", "2.1", "1.2"], ["3.1", "3.2"])
+    assert key.req_order == ("1.2", "1.10", "2.1") and key.opt_order == ("3.1", "3.2")
+    assert key.excluded_req == ("#2.1",) and key.excluded_opt == ("#3.2",)
+    assert key.expected["1.10"] == "a" and key.has_output["1.2"]
+    assert _verdict(key, "1.2", "b") and not _verdict(key, "1.2", "c")
+
+
+def test_tolerance_applies_only_to_configured_labels():
+    ans = _notebook({"1.1": "mean 0.5000\n", "1.2": "mean 0.5000\n"})
+    key = build_answer_key(ans, ["1.1", "1.2"], [], tolerances={"1.1": Tolerance(atol=0.01)})
+    assert _verdict(key, "1.1", "mean 0.5031\n")
+    assert not _verdict(key, "1.1", "mean 0.5200\n")
+    assert not _verdict(key, "1.2", "mean 0.5031\n")   # 허용오차 없는 라벨은 숫자 완전일치
+    assert _verdict(key, "1.2", "mean   0.5000")
+
+
+def test_outputs_above_cap_compare_by_digest():
+    big = "\n".join(f"{i}  {i * 0.5:.3f}  row" for i in range(3000))
+    ans = _notebook({"1.1": big})
+    key = build_answer_key(ans, ["1.1"], [], max_chars=5000)
+    assert "1.1" in key.expected_digest
+    assert _verdict(key, "1.1", big.replace("  ", "   "))       # 공백만 다름 → 같은 해시
+    assert not _verdict(key, "1.1", big.replace("1499", "1498"))  # 가운데 한 글자 → 다른 해시
+    assert not _verdict(key, "1.1", big[:4000])                  # 상한 이하 학생 출력 → 불일치
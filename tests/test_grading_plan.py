@@ -0,0 +1,50 @@
+import nbformat
+
+from autograder.grading_plan import load_grading_plan
+from autograder.label_tagging import classify_labels, template_label_tagging
+
+from conftest import make_notebook
+
+
+def _paths(tmp_path):
+    template, answer = tmp_path / "t.ipynb", tmp_path / "a.ipynb"
+    nbformat.write(make_notebook(solved=False), template)
+    nbformat.write(make_notebook(), answer)
+    out = tmp_path / "out"
+    out.mkdir()
+    return template, answer, out / "tagged_template.ipynb", out / "tag_audit.csv", out / "grading_plan.json"
+
+
+def test_plan_equals_direct_classification(tmp_path):
+    template, answer, tagged, audit, plan_path = _paths(tmp_path)
+    plan, fresh = load_grading_plan(template, answer, tagged, audit, plan_path)
+    assert fresh and plan_path.exists()
+    template_label_tagging(template, answer, tmp_path / "direct.ipynb", tmp_path / "direct.csv")
+    assert plan.unpack() == classify_labels(tmp_path / "direct.ipynb")
+
+
+def test_plan_reused_until_inputs_change(tmp_path):
+    template, answer, tagged, audit, plan_path = _paths(tmp_path)
+    first, _ = load_grading_plan(template, answer, tagged, audit, plan_path)
+    again, fresh = load_grading_plan(template, answer, tagged, audit, plan_path)
+    assert not fresh and again == first
+
+    nbformat.write(make_notebook(wrong=("1.2",)), answer)
+    _, fresh = load_grading_plan(template, answer, tagged, audit, plan_path)
+    assert fresh
+
+
+def test_missing_tagged_template_is_rebuilt(tmp_path):
+    template, answer, tagged, audit, plan_path = _paths(tmp_path)
+    first, _ = load_grading_plan(template, answer, tagged, audit, plan_path)
+    tagged.unlink()
+    plan, fresh = load_grading_plan(template, answer, tagged, audit, plan_path)
+    assert fresh and tagged.exists() and plan == first
+
+
+def test_broken_plan_file_is_rebuilt(tmp_path):
+    template, answer, tagged, audit, plan_path = _paths(tmp_path)
+    load_grading_plan(template, answer, tagged, audit, plan_path)
+    plan_path.write_text("{broken", encoding="utf-8")
+    _, fresh = load_grading_plan(template, answer, tagged, audit, plan_path)
+    assert fresh
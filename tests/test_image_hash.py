@@ -0,0 +1,70 @@
+# tests/test_image_hash.py
+"""
+image/png 지각 해시 비교 + Pillow 가 없을 때 이미지 비교 생략
+"""
+import base64
+import io
+
+import nbformat
+import pytest
+from nbformat.v4 import new_code_cell, new_notebook, new_output
+
+from autograder import image_hash
+from autograder.grading import build_answer_key
+from autograder.image_hash import ImageHashCache, hamming, images_match
+from autograder.policy import DEFAULT_IMAGE_MAX_DISTANCE
+
+
+def _png_cell(*payloads):
+    outs = [new_output("display_data", data={"image/png": p, "text/plain": "<Figure>"}) for p in payloads]
+    return new_code_cell("# 1.1\nplt.show()", outputs=outs)
+
+
+def test_images_match_by_hamming_distance_in_order():
+    a, b = "0" * 32, "0" * 31 + "7"          # 3비트 차이
+    assert hamming(a, b) == 3
+    assert images_match((a,), (b,), 3)
+    assert not images_match((a,), (b,), 2)
+    assert not images_match((a, b), (a,), 12)           # 개수가 다르면 불일치
+    assert not images_match((a, "f" * 32), ("f" * 32, a), 12)   # 순서대로 비교
+
+
+def test_cache_skips_images_without_pillow(monkeypatch, tmp_path):
+    monkeypatch.setattr(image_hash, "_PILImage", None)
+    cache = ImageHashCache(tmp_path / "image_hash.sqlite")
+    assert not image_hash.available()
+    assert cache.cell_hashes(_png_cell("iVBORw0KGgo=")) == ()
+    assert not (tmp_path / "image_hash.sqlite").exists()   # 디코드/저장도 하지 않음
+
+    # 정답 키도 이미지 해시 없이 → "[image/png]" 자리표시 텍스트로만 비교 (캐시 버전의 image=None)
+    ans = nbformat.from_dict(new_notebook(cells=[_png_cell("iVBORw0KGgo=")]))
+    key = build_answer_key(ans, ["1.1"], [], images=cache, image_max_distance=DEFAULT_IMAGE_MAX_DISTANCE)
+    assert key.expected_images == {} and key.image_max_distance is None
+
+
+def _bar_png(heights, size=(160, 120), fmt_kwargs=None):
+    from PIL import Image, ImageDraw
+    im = Image.new("RGB", size, "white")
+    d = ImageDraw.Draw(im)
+    w = size[0] // len(heights)
+    for i, h in enumerate(heights):
+        d.rectangle([i * w + 4, size[1] - h, (i + 1) * w - 4, size[1] - 1], fill=(31, 119, 180))
+    buf = io.BytesIO()
+    im.save(buf, "PNG", **(fmt_kwargs or {}))
+    return base64.b64encode(buf.getvalue()).decode("ascii")
+
+
+def test_same_plot_matches_different_plot_does_not(tmp_path):
+    pytest.importorskip("PIL")
+    cache = ImageHashCache(tmp_path / "image_hash.sqlite")
+    ref = cache.cell_hashes(_png_cell(_bar_png([20, 60, 100, 40])))
+    resaved = cache.cell_hashes(_png_cell(_bar_png([20, 60, 100, 40], fmt_kwargs={"compress_level": 1})))
+    other = cache.cell_hashes(_png_cell(_bar_png([100, 40, 20, 60])))
+    assert len(ref) == 1 and images_match(ref, resaved, DEFAULT_IMAGE_MAX_DISTANCE)
+    assert not images_match(ref, other, DEFAULT_IMAGE_MAX_DISTANCE)
+    assert cache.cell_hashes(_png_cell("not-base64!!")) == ()   # 디코드 실패 이미지는 제외
+    cache.close()
+
+    again = ImageHashCache(tmp_path / "image_hash.sqlite")   # 다음 런: sqlite 에서 읽음
+    assert again.cell_hashes(_png_cell(_bar_png([20, 60, 100, 40]))) == ref
+    again.close()
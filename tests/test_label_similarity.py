@@ -0,0 +1,48 @@
+import nbformat
+from nbformat.v4 import new_code_cell, new_notebook
+
+from autograder.label_similarity import compute_label_similarity, residual_code
+
+LABELS = ["1.1", "1.2"]
+
+
+def _write(path, answers):
+    cells = [new_code_cell(f"# {lab}\n# TODO\nresult = None\n{answers.get(lab, '')}") for lab in LABELS]
+    nbformat.write(new_notebook(cells=cells), path)
+    return path
+
+
+def _own(k):
+    return "\n".join(f"part_{k}_{i} = sorted(values_{k}, key=lambda v: v % {k + i + 2})[{i}]" for i in range(3))
+
+
+def test_residual_code_subtracts_template_lines_once():
+    tmpl = "# 1.1\nx = 1\n\nprint(x)"
+    assert residual_code("# 1.1\nx  =  1\nx = 1\ny = 2\nprint(x)", tmpl) == "x = 1\ny = 2"
+    assert residual_code(tmpl, tmpl) == ""
+
+
+def test_label_pairs_and_group_matrix(tmp_path):
+    template = _write(tmp_path / "t.ipynb", {})
+    copied = _own(100)
+    paths = {
+        "s1": _write(tmp_path / "s1.ipynb", {"1.1": copied, "1.2": "print(1)"}),
+        "s2": _write(tmp_path / "s2.ipynb", {"1.1": copied + "  # 복사", "1.2": "print(1)"}),
+        "s3": _write(tmp_path / "s3.ipynb", {"1.1": _own(3), "1.2": "print(1)"}),
+        "s4": _write(tmp_path / "s4.ipynb", {"1.1": _own(4)}),
+    }
+    names = {sid: sid.upper() for sid in paths}
+    pairs, matrix = compute_label_similarity(paths, names, LABELS, template, threshold=0.9)
+
+    # 1.2 의 print(1) 은 짧아서 비교하지 않음
+    assert pairs[["student_a", "name_b", "n_labels", "labels"]].values.tolist() == [["s1", "S2", 1, "1.1"]]
+    assert matrix.set_index("student_id")[["n_matched", "1.1", "1.2"]].loc["s1"].tolist() == [1, 1, 0]
+    assert matrix["1.1"].tolist() == [1, 1, 0, 0]
+
+
+def test_common_answer_is_not_reported(tmp_path):
+    template = _write(tmp_path / "t.ipynb", {})
+    paths = {f"s{i}": _write(tmp_path / f"s{i}.ipynb", {"1.1": _own(0) if i < 6 else _own(i)}) for i in range(8)}
+    pairs, matrix = compute_label_similarity(paths, {}, LABELS, template, threshold=0.9)
+    assert pairs.empty
+    assert matrix["n_matched"].sum() == 0
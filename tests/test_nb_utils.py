@@ -0,0 +1,152 @@
+# tests/test_nb_utils.py
+"""
+빠른 로더(load_notebook_fast) = nbformat.read, 단일 패스 스캔(scan_notebook) = 개별 파싱 함수,
+TemplateMatcher = _sim(fp, template) >= threshold,
+셀 출력 정규화: 상한을 넘는 출력의 스트리밍 해시 = 전체 정규화 텍스트의 해시
+"""
+import hashlib
+import json
+import random
+
+import nbformat
+import pytest
+from nbformat.v4 import new_code_cell, new_markdown_cell, new_notebook, new_output
+
+from autograder.io_utils import extract_id_and_name
+from autograder.nb_utils import (
+    LazyNotebook, TemplateMatcher, _cell_output_text, _label_map, _nb_exec_pattern, _nb_fingerprint, _sim,
+    cell_output, load_notebook_fast, scan_notebook,
+)
+
+
+def _rich_notebook():
+    return new_notebook(cells=[
+        new_markdown_cell("# 과제\n이름: 홍길동"),
+        new_code_cell("# 1.1\nprint(df)\nx = 1", execution_count=3, outputs=[
+            new_output("stream", name="stdout", text="a\nb\n"),
+            new_output("execute_result", execution_count=3,
+                       data={"text/plain": "  col\n0   1", "text/html": "<table>\n<tr></tr>\n</table>",
+                             "application/json": {"k": [1, 2]}}),
+            new_output("error", ename="E", evalue="v", traceback=["line1", "line2"]),
+        ]),
+        new_code_cell("", metadata={"tags": ["required"]}),
+    ], metadata={"student_name": "홍길동"})
+
+
+def test_fast_loader_matches_nbformat(tmp_path):
+    path = tmp_path / "nb.ipynb"
+    nbformat.write(_rich_notebook(), path)   # 저장 시 여러 줄 문자열은 줄 목록으로 나뉨
+    assert isinstance(json.loads(path.read_text("utf-8"))["cells"][1]["source"], list)
+
+    fast, full = load_notebook_fast(path), nbformat.read(path, as_version=4)
+    assert isinstance(fast, LazyNotebook)
+    assert fast.metadata == full.metadata and fast.nbformat == full.nbformat
+    assert len(fast.cells) == len(full.cells)
+    for a, b in zip(fast.cells, full.cells):
+        assert a.cell_type == b.cell_type and a.source == b.source and a.metadata == b.metadata
+        assert a.get("execution_count") == b.get("execution_count")
+        assert a.get("outputs") == b.get("outputs")
+        if b.cell_type == "code":
+            assert _cell_output_text(a) == _cell_output_text(b)
+
+
+def test_fast_loader_falls_back_for_other_versions(tmp_path):
+    v3 = tmp_path / "v3.ipynb"
+    v3.write_text(json.dumps({"nbformat": 3, "nbformat_minor": 0, "metadata": {},
+                              "worksheets": [{"cells": [{"cell_type": "code", "input": "x = 1",
+                                                         "outputs": [], "language": "python"}]}]}), "utf-8")
+    nb = load_notebook_fast(v3)
+    assert not isinstance(nb, LazyNotebook) and nb.cells[0].source == "x = 1"
+
+    broken = tmp_path / "broken.ipynb"
+    broken.write_text("{not json", "utf-8")
+    with pytest.raises(Exception):
+        load_notebook_fast(broken)
+
+
+
+def test_scan_matches_separate_parsers(tmp_path):
+    path = tmp_path / "nb.ipynb"
+    nb = _rich_notebook()
+    nb.cells.append(new_code_cell("# 2.1\ny = 2", execution_count=1))
+    nbformat.write(nb, path)
+    for loaded in (load_notebook_fast(path), nbformat.read(path, as_version=4)):
+        scan = scan_notebook(loaded)
+        assert scan.fingerprint == _nb_fingerprint(loaded)
+        assert scan.exec_pattern == _nb_exec_pattern(loaded)
+        assert {k: v["idx"] for k, v in scan.label_map.items()} == {k: v["idx"] for k, v in _label_map(loaded).items()}
+
+
+@pytest.mark.parametrize("cells, metadata, expect", [
+    ([new_code_cell("NAME = '김철수'"), new_markdown_cell("이름: 이영희")], {"name": "박"}, "김철수"),
+    ([new_markdown_cell("성명： 이영희\n")], {"name": "박"}, "이영희"),
+    ([new_code_cell("x = 1")], {"student_name": "박민수"}, "박민수"),
+    ([new_code_cell("x = 1")], {}, "이름미상"),
+])
+def test_id_and_name_from_scan_equal_reading_the_file(tmp_path, cells, metadata, expect):
+    path = tmp_path / "MR_10_20240001.ipynb"   # 파일명에 이름 없음 → 노트북 내용에서
+    nbformat.write(new_notebook(cells=cells, metadata=metadata), path)
+    scanned = extract_id_and_name(path, scan=scan_notebook(load_notebook_fast(path)))
+    assert scanned == extract_id_and_name(path) == ("20240001", expect)
+
+
+def test_name_in_file_name_wins(tmp_path):
+    path = tmp_path / "MR_10_20240002_홍길동 (1).ipynb"
+    nbformat.write(new_notebook(cells=[new_code_cell("NAME = '다른이름'")]), path)
+    assert extract_id_and_name(path, scan=scan_notebook(load_notebook_fast(path), find_name=False)) == \
+        extract_id_and_name(path) == ("20240002", "홍길동")
+
+def _stream_cell(pieces):
+    return new_code_cell("# 1.1\nprint(df)", outputs=[new_output("stream", name="stdout", text=t) for t in pieces])
+
+
+def _split(rng: random.Random, text: str):
+    """공백 위치에서 출력 여러 개로 나눔 (출력 사이는 줄바꿈으로 이어지므로 단어 중간은 자르지 않음)."""
+    cuts = sorted(rng.sample([i for i, ch in enumerate(text) if ch == " "], 4))
+    return [text[a:b] for a, b in zip([0, *cuts], [*cuts, len(text)])]
+
+
+def test_small_output_matches_full_text_path():
+    cell = _stream_cell(["  a   b\n", "c\t d  "])
+    out = cell_output(cell, max_chars=1000)
+    assert not out.truncated and out.text == _cell_output_text(cell)
+
+
+def test_streamed_digest_equals_digest_of_normalized_text():
+    rng = random.Random(11)
+    words = ["0.123", "mean", "std", "\n", "  ", "\t", "가격", "é", "é"]
+    text = " ".join(rng.choice(words) for _ in range(30_000))
+    cell = _stream_cell(_split(rng, text))
+    out = cell_output(cell, max_chars=10_000)
+    full = _cell_output_text(cell)
+    assert out.truncated and out.length == len(full)
+    assert out.digest == hashlib.blake2b(full.encode("utf-8"), digest_size=16).hexdigest()
+    assert out.text.startswith(full[:100]) and out.text.endswith(full[-100:])
+
+    # 공백/줄바꿈 배치와 출력 조각 경계만 다르면 같은 해시, 글자 하나가 다르면 다른 해시
+    spaced = text.replace(" ", "  \n", 50)
+    assert cell_output(_stream_cell(_split(rng, spaced)), max_chars=10_000).digest == out.digest
+    changed = text[:len(text) // 2] + "X" + text[len(text) // 2 + 1:]
+    assert cell_output(_stream_cell([changed]), max_chars=10_000).digest != out.digest
+
+
+def test_template_matcher_equals_sim_threshold():
+    rng = random.Random(0)
+    template = "\n".join(f"# {k}\nx_{k} = f(data, {k})" for k in range(20))
+    cases = ["", template]
+    for _ in range(300):
+        s = list(template)
+        for _ in range(rng.choice([0, 1, 3, 10, 40, 200])):
+            op = rng.random()
+            pos = rng.randrange(len(s) + 1)
+            if op < 0.4:
+                s.insert(pos, rng.choice("abxyz=()\n "))
+            elif s and op < 0.7:
+                del s[min(pos, len(s) - 1)]
+            elif s:
+                s[min(pos, len(s) - 1)] = rng.choice("0123")
+        cases.append("".join(s) + rng.choice(["", "", "\nprint(total)" * rng.randint(1, 30)]))
+    for threshold in (0.8, 0.95, 0.99, 1.0):
+        matcher = TemplateMatcher(template, threshold)
+        for fp in cases:
+            assert matcher.is_unchanged(fp) == (_sim(fp, template) >= threshold)
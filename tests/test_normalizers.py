@@ -0,0 +1,40 @@
+# tests/test_normalizers.py
+"""
+출력 정규화기: 묶음 컴파일(교대 정규식 1개) 후에도 각 정규식의 그룹/치환이 그대로 동작하는지
+"""
+import pytest
+
+from autograder.normalizers import NormalizerPlan, compile_normalizers, parse_normalizers
+
+
+def test_random_seed_backreference_survives_combination():
+    alone = compile_normalizers(["random_seed"])
+    assert alone.apply("RandomForest(random_state=42, seed = 7)") == "RandomForest(random_state=?, seed=?)"
+
+    combined = compile_normalizers(["memory_address", "timestamp", "random_seed", "file_path"])
+    s = "<Model at 0x7f3a2c1d90> random_state=42 2024-03-05 14:22:01 seed=7 read /content/drive/x.csv"
+    assert combined.apply(s) == "<Model at 0x?> random_state=? <timestamp> seed=? read <path>"
+
+
+def test_custom_patterns_with_groups_do_not_shift_builtin_groups():
+    custom = {"run_id": r"(run|job)-(\d+)", "pair": r"\((\d+), (\d+)\)"}
+    norm = compile_normalizers(["run_id", "random_seed", "pair", "memory_address"], custom)
+    s = "job-12 random_state=3 (1, 2) 0xdeadbeef seed=9 run-7"
+    assert norm.apply(s) == "random_state=?  0x? seed=?"
+
+
+def test_unknown_name_raises_value_error():
+    with pytest.raises(ValueError):
+        compile_normalizers(["datetime", "no_such_normalizer"])
+    with pytest.raises(ValueError):   # 설정을 읽을 때 바로 (채점 도중이 아니라)
+        parse_normalizers({"2.1": ["datetim"]})
+
+
+def test_parse_normalizers_per_label_and_default():
+    plan = parse_normalizers({"default": ["datetime", "memory_address"], "#2.1": ["dtype_footer"],
+                              "custom": {"run_id": r"run-\d+"}})
+    assert plan.for_label("2.1").names == ("dtype_footer",)
+    assert plan.for_label("1.1").apply("x 0x7f3a2c1d90") == "x 0x?"
+    assert plan.for_label("1.1") is plan.for_label("1.2")   # 같은 묶음은 한 번만 컴파일
+    assert parse_normalizers(None) == NormalizerPlan()
+    assert compile_normalizers([]).apply("  a  ") == "a"
@@ -0,0 +1,53 @@
+# tests/test_output_memo.py
+"""
+라벨별 출력 비교 메모: 메모를 거친 판정 = 직접 비교 판정
+"""
+import random
+
+from autograder.grading import build_answer_key, _compare_label
+from autograder.nb_utils import cell_output
+from autograder.output_memo import ComparisonMemo
+from autograder.policy import Tolerance
+
+from test_grading import _cell, _notebook
+
+
+def test_memo_verdicts_equal_direct_comparison():
+    ans = _notebook({"1.1": "mean 0.5000\n", "1.2": "count 10\nDate: Tue, 05 Mar 2024\n"})
+    key = build_answer_key(ans, ["1.1", "1.2"], [], tolerances={"1.1": Tolerance(atol=0.01)})
+    variants = {
+        "1.1": ["mean 0.5000\n", "mean 0.5031", "mean 0.52", "mean  0.5000 ", "avg 0.5"],
+        "1.2": ["count 10\nDate: Wed, 06 Mar 2024\n", "count 11", "count 10", "count  10\n"],
+    }
+    rng = random.Random(3)
+    memo = ComparisonMemo().bind("v1")
+    for _ in range(300):
+        lab = rng.choice(sorted(variants))
+        text = rng.choice(variants[lab])
+        out = cell_output(_cell(lab, text), key.max_chars)
+        dg, ok = _compare_label(key, memo, lab, out, ())
+        _dg, direct = _compare_label(key, ComparisonMemo(), lab, out, ())
+        assert ok == direct, (lab, text)
+        memo.record({lab: [dg, ok]})
+    assert memo.misses <= sum(len(v) for v in variants.values())
+    assert memo.hits >= 300 - memo.misses
+    assert memo.distinct_outputs()["1.2"] == 2   # 공백/날짜 차이는 정규화 후 같은 출력
+
+
+def test_seeded_verdict_skips_comparison_and_bind_resets():
+    memo = ComparisonMemo().bind("v1")
+    memo.seed({"1.1": ["abc", True]})
+    calls = []
+    assert memo.compare("1.1", "x", lambda s: calls.append(s) or False, digest="abc") == ("abc", True)
+    assert not calls
+    memo.bind("v2")   # 채점 버전이 바뀌면 이전 판정은 버림
+    assert memo.compare("1.1", "x", lambda s: calls.append(s) or False, digest="abc") == ("abc", False)
+    assert calls == ["x"]
+
+
+def test_label_summary_counts_clusters():
+    memo = ComparisonMemo()
+    for dg, ok in [("a", True), ("a", True), ("a", True), ("b", False)]:
+        memo.record({"1.1": [dg, ok]})
+    df = memo.label_summary_df()
+    assert df.iloc[0].tolist() == ["1.1", 4, 2, 1, 0.75, True]
@@ -0,0 +1,102 @@
+# tests/test_policy.py
+"""
+policy.outputs_equal (토큰 1회 스캔) ↔ 이전 정규식 구현 동치 검사 (seed 고정 퍼즈)
++ 라벨별 숫자 허용오차 비교 (outputs_close)
+"""
+import random
+import re
+
+from autograder.policy import (
+    Tolerance, numeric_output, outputs_close, outputs_equal, parse_tolerances, tokenize_output, tokens_match,
+    tolerance_for,
+)
+
+_NUM_PAT = r"[-+]?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?"
+
+FUZZ_SEED = 7
+FUZZ_PAIRS = 50_000
+
+# 숫자/부호/지수/공백(유니코드 포함)/유니코드 숫자가 섞인 짧은 출력 조각
+_ALPHABET = ["1", "2", "0", "-", "+", ".", "e", "E", " ", "\n", "\t", "a", "b", "x", "=", ",", "(", ")",
+             "١", "　", "ab", "3.14", "-2e5", "1.", "+.5", "NaN"]
+
+
+def outputs_equal_regex(a: str, b: str) -> bool:
+    """이전 구현 (정규식 여러 번): 숫자열이 같고, 숫자를 지운 나머지가 공백 정리 후 같으면 일치."""
+    def strip_space(s: str) -> str:
+        return re.sub(r"\s+", " ", (s or "").strip())
+    a_s, b_s = strip_space(a), strip_space(b)
+
+    a_nums, b_nums = re.findall(_NUM_PAT, a_s), re.findall(_NUM_PAT, b_s)
+    if len(a_nums) != len(b_nums):
+        return False
+    if any(x != y for x, y in zip(a_nums, b_nums)):
+        return False
+
+    def remove_nums(s):
+        return re.sub(_NUM_PAT, "", s)
+    return strip_space(remove_nums(a_s)) == strip_space(remove_nums(b_s))
+
+
+def _random_text(rng: random.Random, n: int) -> str:
+    return "".join(rng.choice(_ALPHABET) for _ in range(n))
+
+
+def _mutate(rng: random.Random, s: str) -> str:
+    t = list(s)
+    for _ in range(rng.randint(0, 3)):
+        if not t:
+            break
+        op, k = rng.random(), rng.randrange(len(t))
+        if op < .3:
+            t[k] = rng.choice(_ALPHABET)
+        elif op < .6:
+            t.insert(k, rng.choice([" ", "\n", "  "]))
+        elif op < .8:
+            del t[k]
+        else:
+            t.insert(k, rng.choice(_ALPHABET))
+    return "".join(t)
+
+
+def test_outputs_equal_matches_regex_reference():
+    rng = random.Random(FUZZ_SEED)
+    mismatches, n_equal = [], 0
+    for _ in range(FUZZ_PAIRS):
+        a = _random_text(rng, rng.randint(0, 20))
+        b = _mutate(rng, a) if rng.random() < .8 else _random_text(rng, rng.randint(0, 20))
+        ref = outputs_equal_regex(a, b)
+        n_equal += ref
+        if outputs_equal(a, b) != ref or tokens_match(tokenize_output(a), b) != ref:
+            mismatches.append((a, b, ref))
+    assert not mismatches[:5]
+    assert n_equal > FUZZ_PAIRS // 20   # 일치 쪽도 충분히 나오는지 (퍼즈가 한쪽으로 치우치지 않게)
+
+
+def test_outputs_equal_examples():
+    assert outputs_equal("mean = 3.0\n", "mean =   3.0")
+    assert not outputs_equal("mean = 3.0", "mean = 3.00")
+    assert not outputs_equal("1 2", "12")
+    assert outputs_equal("", "  \n")
+
+
+def test_outputs_close_uses_tolerance_on_numbers_only():
+    expected = numeric_output("mean 1.0001 std 2.0")
+    assert outputs_close(expected, "mean 1.0 std 2.0", Tolerance(atol=1e-3))
+    assert not outputs_close(expected, "mean 1.0 std 2.0", Tolerance())            # 허용오차 0 → 숫자 완전일치
+    assert not outputs_close(expected, "avg 1.0001 std 2.0", Tolerance(atol=1))    # 단어가 다르면 불일치
+    assert not outputs_close(expected, "mean 1.0001 std 2.0 3", Tolerance(atol=1)) # 숫자 개수가 다르면 불일치
+    assert outputs_close(expected, "mean 1.01 std 2.02", Tolerance(rtol=0.011))
+
+
+def test_numeric_output_reads_html_tables():
+    num = numeric_output("<table><tr><td>mean</td><td>0.5</td></tr></table>")
+    assert num is not None and num.values.tolist() == [0.5]
+    assert numeric_output("no numbers here") is None
+
+
+def test_parse_tolerances_default_and_labels():
+    tols = parse_tolerances({"default": {"atol": 1e-6}, "#2.1": {"atol": 0.01, "rtol": 0}})
+    assert tolerance_for(tols, "2.1") == Tolerance(0.01, 0.0)
+    assert tolerance_for(tols, "1.1") == Tolerance(1e-6, 0.0)
+    assert tolerance_for({}, "1.1") is None
@@ -0,0 +1,54 @@
+from autograder.grading import grade_submissions
+from autograder.io_utils import load_config
+from autograder.records import EP_COL, FP_COL, CompressedTexts, cache_entry, fp_digest, summary_row
+
+
+def _result(fp="x = 1\nprint(x)", ep="1,2"):
+    row = ["20240001", "학생1", "a.ipynb", 100.0, "OK", "", "", "", len(fp), fp, ep, ""]
+    return {"sid": "20240001", "name": "학생1", "row": row, "fp": fp, "ep": ep, "graded": True}
+
+
+def test_cache_entry_drops_row_copies_and_summary_row_restores():
+    res = _result()
+    entry = cache_entry(res)
+    assert entry["row"][FP_COL] is None and entry["row"][EP_COL] is None
+    assert summary_row(entry) == res["row"]
+    assert res["row"][FP_COL] == res["fp"]   # 원본 결과는 그대로
+
+
+def test_compact_row_has_digest():
+    res = _result()
+    row = summary_row(cache_entry(res), compact=True)
+    assert row[FP_COL] == fp_digest(res["fp"]) and len(row[FP_COL]) == 16
+    assert row[EP_COL] == res["ep"]
+
+
+def test_compressed_texts_round_trip():
+    texts = CompressedTexts()
+    texts["a"] = "print('hi')\n" * 200
+    texts["b"] = None
+    assert texts["a"] == "print('hi')\n" * 200 and texts["b"] == ""
+    assert sorted(texts) == ["a", "b"] and len(texts) == 2
+    assert texts.nbytes() < len(texts["a"])
+    del texts["b"]
+    assert "b" not in texts
+
+
+def test_compact_grading_keeps_similarity_inputs(grading_session):
+    plain = grade_submissions(**grading_session)
+    compact = grade_submissions(**grading_session, compact=True)
+    assert isinstance(compact[1], CompressedTexts)
+    assert dict(compact[1]) == plain[1] and dict(compact[2]) == plain[2]
+    fp_plain, fp_compact = plain[0]["finger_print"], compact[0]["finger_print"]
+    assert all(c == fp_digest(p) for p, c in zip(fp_plain, fp_compact) if p)
+    cols = [c for c in plain[0].columns if c != "finger_print"]
+    assert plain[0][cols].equals(compact[0][cols])
+
+
+def test_load_config_compact(tmp_path):
+    toml = tmp_path / "s.toml"
+    paths = 'TEMPLATE_PATH = "t"\nANSWER_PATH = "a"\nSUBMIT_DIR = "s"\nOUT_DIR = "o"\n'
+    toml.write_text(f"[session_1]\nCOMPACT = true\n[session_1.DEV]\n{paths}"
+                    f"[session_2]\n[session_2.DEV]\n{paths}", encoding="utf-8")
+    assert load_config(str(toml), 1, "dev")["compact"] is True
+    assert load_config(str(toml), 2, "DEV")["compact"] is False
@@ -0,0 +1,83 @@
+from autograder import grading
+from autograder.execution import ExecConfig
+from autograder.grading import grade_submissions
+from autograder.result_cache import ResultCache, entry_key, grading_version
+
+
+def _version(**kw):
+    return grading_version("ans", ["1.1"], [], "fp", 0.98, **kw)
+
+
+def test_hit_miss_and_save_only_touched_entries(tmp_path):
+    path = tmp_path / "grade_cache.json"
+    c = ResultCache(path, _version())
+    c.put(entry_key("a.ipynb", "d1"), {"row": [1]})
+    c.put(entry_key("b.ipynb", "d2"), {"row": [2]})
+    c.save()
+
+    c = ResultCache(path, _version())
+    assert c.get(entry_key("a.ipynb", "d1")) == {"row": [1]}
+    assert c.get(entry_key("a.ipynb", "changed")) is None
+    assert (c.hits, c.misses) == (1, 1)
+    c.save()
+    # 이번 런에서 조회하지 않은 b 는 정리됨
+    assert ResultCache(path, _version()).get(entry_key("b.ipynb", "d2")) is None
+
+
+def test_version_change_invalidates(tmp_path):
+    path = tmp_path / "grade_cache.json"
+    c = ResultCache(path, _version())
+    c.put("k", {"row": [1]})
+    c.save()
+    assert ResultCache(path, _version(mode="exec:x")).get("k") is None
+    assert ResultCache(path, _version(output_max_chars=10)).get("k") is None
+    assert ResultCache(path, _version()).get("k") == {"row": [1]}
+
+
+def test_exec_cache_tag_tracks_data_files(tmp_path):
+    (tmp_path / "data.csv").write_text("a\n1\n")
+    cfg = ExecConfig(cwd=str(tmp_path))
+    tag = cfg.cache_tag()
+    assert cfg.cache_tag() == tag
+    (tmp_path / "data.csv").write_text("a\n1\n2\n")
+    assert cfg.cache_tag() != tag
+    # 제출 노트북이 늘어나는 것은 데이터 변경이 아님
+    tag = cfg.cache_tag()
+    (tmp_path / "new.ipynb").write_text("{}")
+    assert cfg.cache_tag() == tag
+
+
+def test_exec_cache_tag_per_submission_folders(tmp_path):
+    a, b = tmp_path / "a", tmp_path / "b"
+    a.mkdir()
+    b.mkdir()
+    cfg = ExecConfig()
+    tag = cfg.cache_tag([a, b, a])
+    assert "env=" in tag
+    (b / "input.txt").write_text("x")
+    assert cfg.cache_tag([a, b]) != tag
+
+
+def test_cached_rows_equal_uncached(grading_session, tmp_path, monkeypatch):
+    cache = tmp_path / "grade_cache.json"
+    plain = grade_submissions(**grading_session)
+    first = grade_submissions(**grading_session, cache_path=cache)
+
+    graded = []
+    real = grading._grade_one
+    monkeypatch.setattr(grading, "_grade_one", lambda p, **kw: graded.append(p) or real(p, **kw))
+    second = grade_submissions(**grading_session, cache_path=cache)
+    assert graded == []   # 전부 캐시 적중
+    assert plain[0].equals(first[0]) and plain[0].equals(second[0])
+    for i in range(1, len(plain)):
+        assert plain[i] == second[i]
+
+    # 제출물 하나가 바뀌면 그 파일만 다시 채점
+    changed = grading_session["submit_paths"][0]
+    original = changed.read_bytes()
+    try:
+        changed.write_bytes(original.replace(b"999", b"998"))   # 학생0 의 1.2 오답 출력
+        grade_submissions(**grading_session, cache_path=cache)
+    finally:
+        changed.write_bytes(original)
+    assert graded == [changed]
@@ -0,0 +1,65 @@
+import nbformat
+import pytest
+
+from autograder import sim_index
+from autograder.sim_index import SimIndex, cross_cohort_check, index_submit_dir, require_index_path, winnow
+
+from conftest import TEMPLATE_NAME, make_notebook
+
+
+def _code(seed: int, n: int = 40) -> str:
+    return "\n".join(f"v{seed}_{k} = compute_{(seed * 7 + k) % 13}(data, {seed + k})" for k in range(n))
+
+
+def test_winnow_is_position_independent_and_excludes_template():
+    body = _code(1)
+    assert winnow(body) == winnow(body)
+    assert winnow(body) <= winnow("import math\n" + body + "\nprint(1)")
+    assert not winnow(body, exclude=winnow(body))
+
+
+def test_require_index_path():
+    with pytest.raises(ValueError):
+        require_index_path("")
+    assert require_index_path("/x/idx.sqlite").name == "idx.sqlite"
+
+
+def test_cross_cohort_match_and_update(tmp_path):
+    idx = tmp_path / "idx.sqlite"
+    old = {f"2023{i:04d}": _code(i) for i in range(5)}
+    cross_cohort_check(idx, "2023", old, {}, {})
+    assert SimIndex(idx).cohorts() == {"2023": 5}
+
+    new = {"20240001": _code(3), "20240002": _code(99)}
+    df = cross_cohort_check(idx, "2024", new, {"20240001": "a.ipynb"}, {"20240001": "학생1"})
+    assert df[["student_id", "match_cohort", "match_student_id"]].values.tolist() == [["20240001", "2023", "20230003"]]
+    assert df.loc[0, "containment"] == 1.0
+    # 같은 기수끼리는 비교하지 않음, 재조회해도 추가 없이 같은 결과
+    again = cross_cohort_check(idx, "2024", new, {}, {})
+    assert again["match_cohort"].tolist() == ["2023"]
+    assert SimIndex(idx).cohorts() == {"2023": 5, "2024": 2}
+    assert SimIndex(idx).add("2024", [("20240002", "", "", _code(99))]) == 0
+
+
+def test_common_hash_filter_counts_other_cohorts_only(tmp_path, monkeypatch):
+    monkeypatch.setattr(sim_index, "MIN_DF_DOCS", 2)
+    index = SimIndex(tmp_path / "idx.sqlite")
+    index.add("2023", [(f"old{i}", "", "", _code(i)) for i in range(4)])
+    # 현재 기수 안에서 많이 공유된 코드 → 그 해시가 이전 기수에서는 한 문서에만 있어도 흔한 해시로 빠지면 안 됨
+    index.add("2024", [(f"new{i}", "", "", _code(0)) for i in range(10)])
+    hits = index.query({"new0": _code(0)}, exclude_cohort="2024", threshold=0.5)
+    index.close()
+    assert [(sid, shared > 0) for sid, _, shared, _ in hits] == [("new0", True)]
+
+
+def test_index_submit_dir_skips_template_and_indexed_files(tmp_path):
+    sub = tmp_path / "2023" / "submit"
+    sub.mkdir(parents=True)
+    nbformat.write(make_notebook(solved=False), sub / TEMPLATE_NAME)
+    for i in range(3):
+        nbformat.write(make_notebook(extra=_code(i)), sub / f"MR_10_{20230000 + i}_학생{i}.ipynb")
+    idx = tmp_path / "idx.sqlite"
+
+    assert index_submit_dir(idx, "2023", sub, skip_names=(TEMPLATE_NAME,)) == 3
+    assert TEMPLATE_NAME not in SimIndex(idx).indexed_files("2023")
+    assert index_submit_dir(idx, "2023", sub, skip_names=(TEMPLATE_NAME,)) == 0
@@ -0,0 +1,101 @@
+import random
+from difflib import SequenceMatcher
+import pytest
+
+from autograder import similarity
+from autograder.nb_utils import _sim
+from autograder.similarity import (
+    bounded_ratios, cluster_exact_duplicates, compute_similarity_pairs, cosine_pairs, lsh_candidate_pairs,
+)
+
+
+def _fingerprints(seed: int = 0, families: int = 6, per_family: int = 5) -> dict:
+    """기본 코드 몇 벌 + 글자 몇 개씩 바꾼 변형 (유사도 0.9~1.0 쌍이 섞이도록)."""
+    rng = random.Random(seed)
+    words = ["data", "mean", "total", "print", "sum", "len", "df", "groupby", "value", "count", "x", "y"]
+    fps = {}
+    for f in range(families):
+        base = "\n".join(
+            f"{rng.choice(words)}_{k} = {rng.choice(words)}({rng.choice(words)}, {rng.randint(0, 99)})"
+            for k in range(rng.randint(12, 40)))
+        for v in range(per_family):
+            text = list(base)
+            for _ in range(rng.choice([0, 1, 3, 8, 20])):
+                text[rng.randrange(len(text))] = rng.choice("abcxyz019")
+            fps[f"{f:02d}{v:02d}"] = "".join(text)
+    fps["short_a"], fps["short_b"] = "print(1)", "print(2)"
+    return fps
+
+
+def _pairs(fps, **kw):
+    pairs, _ = compute_similarity_pairs(fps, {}, {}, {}, sim_func=_sim, **kw)
+    return {(p[0], p[5], p[10]) for p in pairs}
+
+
+@pytest.mark.parametrize("threshold", [0.85, 0.95, 0.99])
+def test_lsh_recall_matches_exhaustive(threshold):
+    for seed in range(2):
+        fps = _fingerprints(seed)
+        exhaustive = _pairs(fps, threshold=threshold, candidate_mode="all")
+        assert exhaustive
+        assert _pairs(fps, threshold=threshold, candidate_mode="lsh") == exhaustive
+
+
+def test_lsh_prunes_unrelated_pairs():
+    fps = _fingerprints(1)
+    texts = [t for t in fps.values() if len(t) >= similarity.SHORT_LEN]
+    n = len(texts)
+    assert len(lsh_candidate_pairs(texts, 0.99)) < n * (n - 1) // 2 // 2
+
+
+def test_custom_sim_func_compares_every_pair():
+    fps = _fingerprints(2, families=3, per_family=2)
+    seen = []
+
+    def always(a, b):
+        seen.append((a, b))
+        return 1.0
+
+    pairs, _ = compute_similarity_pairs(fps, {}, {}, {}, sim_func=always, threshold=0.5)
+    n = len(fps)
+    assert len(seen) == len(pairs) == n * (n - 1) // 2
+
+
+def test_wrapped_sim_equals_sim():
+    fps = _fingerprints(3, families=3)
+    wrapped, _ = compute_similarity_pairs(fps, {}, {}, {}, sim_func=lambda a, b: _sim(a, b), threshold=0.9)
+    assert {(p[0], p[5], p[10]) for p in wrapped} == _pairs(fps, threshold=0.9)
+
+
+def test_clusters_compare_representatives_only():
+    fps = {"a": "x = 1\n" * 50, "b": "x = 1\n" * 50, "c": "x = 1\n" * 49 + "x = 2\n"}
+    clusters = cluster_exact_duplicates(fps)
+    assert clusters == [["a", "b"]]
+    got = _pairs(fps, threshold=0.9, clusters=clusters)
+    assert {(a, b) for a, b, _ in got} == {("a", "c")}
+
+
+def test_bounded_ratios_equal_sequence_matcher():
+    texts = list(_fingerprints(4, families=3, per_family=3).values())
+    pairs = [(i, j) for i in range(len(texts)) for j in range(i + 1, len(texts))]
+    expect = {(i, j): SequenceMatcher(None, texts[i], texts[j]).ratio() for i, j in pairs}
+    got = {(i, j): r for i, j, r in bounded_ratios(texts, pairs, 0.9)}
+    assert got == {k: r for k, r in expect.items() if r >= 0.9}
+
+
+def test_parallel_exact_equals_sequential(monkeypatch):
+    fps = _fingerprints(5)
+    seq = _pairs(fps, threshold=0.9, candidate_mode="all")
+    monkeypatch.setattr(similarity, "SIM_POOL_MIN_PAIRS", 1)
+    monkeypatch.setattr(similarity, "SIM_BLOCK_PAIRS", 50)
+    assert _pairs(fps, threshold=0.9, candidate_mode="all", jobs=2) == seq
+
+
+def test_cosine_pairs():
+    texts = ["import numpy as np\nprint(np.mean(data))" * 5,
+             "import numpy as np\nprint(np.mean(data))" * 5,
+             "for k, v in counts.items():\n    total += v" * 5]
+    for analyzer in ("char", "token"):
+        got = cosine_pairs(texts, 0.9, analyzer)
+        assert [(i, j) for i, j, _ in got] == [(0, 1)]
+        assert got[0][2] == pytest.approx(1.0)